@@ -0,0 +1,32 @@
+"""
+Script para construir el snapshot binario de los datos
+Preprocesa los CSV (fechas, columnas JSON) y los guarda en Arrow IPC para un arranque rápido
+
+Uso:
+    python construir_snapshot.py                      # data/ -> data/snapshot/
+    python construir_snapshot.py --data data --salida /var/cache/aduanas
+"""
+import argparse
+
+from core.datos import construir_snapshot_binario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye el snapshot binario de los datasets")
+    parser.add_argument("--data", default="data", help="Directorio de datos CSV")
+    parser.add_argument("--salida", default=None,
+                        help="Directorio del snapshot (default: ADUANAS_SNAPSHOT_DIR o <data>/snapshot)")
+    args = parser.parse_args()
+    
+    resumen = construir_snapshot_binario(args.data, args.salida)
+    
+    print(f"[OK] {len(resumen['tablas'])} tablas escritas en {resumen['tiempo_ms']} ms")
+    for nombre, tabla in resumen["tablas"].items():
+        print(f"     {nombre}: {tabla['registros']} registros")
+    print(f"     Snapshot en {resumen['directorio']}/")
+
+
+if __name__ == "__main__":
+    main()
+
+# Made with Bob
@@ -0,0 +1,25 @@
+"""
+Infraestructura compartida del sistema de análisis de importaciones
+"""
+from .cache import CacheTTL
+from .coalescencia import VueloUnico
+from .datos import SnapshotDatos, cargar_snapshot
+from .metricas import cronometro, metricas
+from .serializacion import RespuestaJSON, TiemposPorRuta, a_json, duracion_server_timing
+from .versionado import huella_archivos
+
+__all__ = [
+    "CacheTTL",
+    "VueloUnico",
+    "SnapshotDatos",
+    "cargar_snapshot",
+    "cronometro",
+    "metricas",
+    "RespuestaJSON",
+    "TiemposPorRuta",
+    "a_json",
+    "duracion_server_timing",
+    "huella_archivos"
+]
+
+# Made with Bob
@@ -0,0 +1,113 @@
+"""
+Snapshot Binario de Datos
+Guarda los datasets ya preprocesados en archivos Arrow IPC para evitar re-procesar los CSV al iniciar
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # Sin pyarrow los datos siempre se leen de los CSV
+    pa = None
+    ipc = None
+
+FORMATO = 1
+MANIFIESTO = "manifiesto.json"
+
+# Texto respaldado por Arrow (sin convertir a objetos de Python) en modo compartido
+_TIPOS_COMPARTIDOS = {pa.string(): pd.StringDtype("pyarrow")} if pa is not None else {}
+
+
+def disponible() -> bool:
+    """Indica si pyarrow está instalado"""
+    return pa is not None
+
+
+def guardar_tabla(directorio: str, nombre: str, tabla: pd.DataFrame) -> str:
+    """Escribe una tabla como archivo Arrow IPC (escritura atómica)"""
+    archivo = f"{nombre}.arrow"
+    ruta = os.path.join(directorio, archivo)
+    temporal = ruta + ".tmp"
+    
+    tabla_arrow = pa.Table.from_pandas(tabla, preserve_index=False)
+    with pa.OSFile(temporal, "wb") as destino:
+        with ipc.new_file(destino, tabla_arrow.schema) as escritor:
+            escritor.write_table(tabla_arrow)
+    os.replace(temporal, ruta)
+    return archivo
+
+
+def guardar_manifiesto(directorio: str, tablas: Dict[str, Dict]):
+    """Escribe el manifiesto al final, cuando todas las tablas ya están en disco"""
+    manifiesto = {
+        "formato": FORMATO,
+        "creado_en": datetime.now().isoformat(),
+        "tablas": tablas
+    }
+    temporal = os.path.join(directorio, MANIFIESTO + ".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, os.path.join(directorio, MANIFIESTO))
+
+
+def leer_manifiesto(directorio: str) -> Optional[Dict]:
+    """Manifiesto del snapshot binario, o None si no existe o no es legible"""
+    if pa is None:
+        return None
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifiesto if manifiesto.get("formato") == FORMATO else None
+
+
+def leer_tabla(directorio: str, manifiesto: Dict, nombre: str, huella: str,
+               compartida: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Lee una tabla del snapshot binario mediante memory-map
+    
+    Con compartida=True las columnas numéricas, de fecha y de texto quedan
+    respaldadas por el archivo mapeado (sin copia, de sólo lectura): los
+    procesos que mapean el mismo archivo comparten esas páginas de memoria.
+    El texto usa el tipo string[pyarrow] y sus nulos son pd.NA.
+    
+    Returns:
+        DataFrame, o None si la tabla no está en el snapshot o se generó
+        con otra versión del CSV (huella distinta)
+    """
+    entrada = manifiesto["tablas"].get(nombre)
+    if entrada is None or entrada.get("huella") != huella:
+        return None
+    
+    try:
+        with pa.memory_map(os.path.join(directorio, entrada["archivo"]), "r") as fuente:
+            tabla_arrow = ipc.open_file(fuente).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    
+    if compartida:
+        tabla = tabla_arrow.to_pandas(split_blocks=True, types_mapper=_TIPOS_COMPARTIDOS.get)
+    else:
+        tabla = tabla_arrow.to_pandas()
+    
+    # Arrow devuelve las listas como arreglos de NumPy: se restauran como listas de Python
+    columnas_lista = entrada.get("columnas_lista", [])
+    for columna in columnas_lista:
+        tabla[columna] = tabla_arrow.column(columna).to_pylist()
+    
+    # Los textos nulos llegan como None; pandas.read_csv los deja como NaN
+    for columna in tabla_arrow.column_names:
+        if (not compartida and columna not in columnas_lista and tabla_arrow.column(columna).null_count
+                and tabla[columna].dtype == object):
+            tabla[columna] = tabla[columna].fillna(np.nan)
+    
+    return tabla
+
+# Made with Bob
@@ -0,0 +1,76 @@
+"""
+Cache LRU con Expiración
+Guarda resultados de análisis repetidos con límite de tamaño y tiempo de vida
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheTTL:
+    """Cache acotado LRU + TTL, seguro entre hilos, con contadores de aciertos"""
+    
+    def __init__(self, tamano_maximo: int = 1024, ttl_segundos: float = 300):
+        self.tamano_maximo = tamano_maximo
+        self.ttl_segundos = ttl_segundos
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.aciertos = 0
+        self.fallos = 0
+        self.expirados = 0
+        self.desalojos = 0
+    
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """Devuelve el valor guardado o None si no existe o ya expiró"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            
+            valor, expira = entrada
+            if expira < time.monotonic():
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+    
+    def guardar(self, clave: Hashable, valor: Any):
+        """Guarda un valor; desaloja el menos usado si se rebasa el tamaño"""
+        if self.tamano_maximo <= 0:
+            return
+        
+        with self._lock:
+            self._entradas[clave] = (valor, time.monotonic() + self.ttl_segundos)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+    
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._entradas.clear()
+    
+    def estadisticas(self) -> Dict:
+        """Contadores de uso del cache"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+                "ttl_segundos": self.ttl_segundos,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expirados": self.expirados,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": round(self.aciertos / consultas * 100, 2) if consultas else 0.0
+            }
+
+# Made with Bob
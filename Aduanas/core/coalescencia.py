@@ -0,0 +1,68 @@
+"""
+Coalescencia de Consultas Idénticas
+Las consultas concurrentes con la misma llave comparten un solo cálculo en curso
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class VueloUnico:
+    """
+    Agrupa llamadas concurrentes idénticas (single-flight)
+    
+    La primera llamada con una llave ejecuta la función; las que llegan
+    mientras sigue en curso esperan y reciben el mismo resultado (o la misma
+    excepción). Al terminar, la llave se libera y la siguiente llamada vuelve
+    a calcular, por lo que no sustituye al cache: sólo evita trabajo duplicado
+    durante ráfagas.
+    """
+    
+    def __init__(self):
+        self._en_curso: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        
+        self.ejecuciones = 0
+        self.compartidas = 0
+    
+    def ejecutar(self, clave: Hashable, funcion: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Ejecuta la función o se une a la ejecución en curso con la misma llave
+        
+        Returns:
+            Tupla (resultado, compartido); compartido es True si el resultado
+            se obtuvo de otra llamada en curso
+        """
+        with self._lock:
+            futuro = self._en_curso.get(clave)
+            lider = futuro is None
+            if lider:
+                futuro = Future()
+                self._en_curso[clave] = futuro
+                self.ejecuciones += 1
+            else:
+                self.compartidas += 1
+        
+        if not lider:
+            return futuro.result(), True
+        
+        try:
+            futuro.set_result(funcion(*args, **kwargs))
+        except BaseException as e:
+            futuro.set_exception(e)
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+        
+        return futuro.result(), False
+    
+    def estadisticas(self) -> Dict:
+        """Contadores de llamadas ejecutadas y compartidas"""
+        with self._lock:
+            return {
+                "en_curso": len(self._en_curso),
+                "ejecuciones": self.ejecuciones,
+                "compartidas": self.compartidas
+            }
+
+# Made with Bob
@@ -0,0 +1,53 @@
+"""
+Configuración del sistema
+Parámetros de operación leídos de variables de entorno
+"""
+import os
+
+
+def _entero(nombre: str, default: int) -> int:
+    """Lee una variable de entorno entera"""
+    return int(os.environ.get(nombre, default))
+
+
+def _decimal(nombre: str, default: float) -> float:
+    """Lee una variable de entorno decimal"""
+    return float(os.environ.get(nombre, default))
+
+
+def _booleano(nombre: str, default: bool) -> bool:
+    """Lee una variable de entorno booleana (1/true/si)"""
+    valor = os.environ.get(nombre)
+    if valor is None:
+        return default
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes")
+
+
+# Cache de análisis completos
+CACHE_TAMANO_MAXIMO = _entero("ADUANAS_CACHE_TAMANO", 1024)
+CACHE_TTL_SEGUNDOS = _decimal("ADUANAS_CACHE_TTL", 300)
+
+# Construir los módulos en segundo plano al arrancar (si no, al primer uso)
+PRECALENTAR = _booleano("ADUANAS_PRECALENTAR", True)
+
+# Análisis por lotes
+LOTE_PROCESOS = _entero("ADUANAS_LOTE_PROCESOS", os.cpu_count() or 1)
+LOTE_TAMANO_BLOQUE = _entero("ADUANAS_LOTE_BLOQUE", 250)
+
+# Backtest del canal recomendado contra el historial (ejecutar_backtest.py)
+BACKTEST_PROCESOS = _entero("ADUANAS_BACKTEST_PROCESOS", os.cpu_count() or 1)
+BACKTEST_TAMANO_BLOQUE = _entero("ADUANAS_BACKTEST_BLOQUE", 50000)
+
+# Snapshot binario de datos preprocesados (construir_snapshot.py)
+SNAPSHOT_BINARIO = _booleano("ADUANAS_SNAPSHOT_BINARIO", True)
+SNAPSHOT_DIRECTORIO = os.environ.get("ADUANAS_SNAPSHOT_DIR")   # Default: <data>/snapshot
+
+# Datos de sólo lectura respaldados por el snapshot mapeado y compartidos entre workers
+DATOS_COMPARTIDOS = _booleano("ADUANAS_DATOS_COMPARTIDOS", False)
+DATOS_COMPARTIDOS_MIN_REGISTROS = _entero("ADUANAS_DATOS_COMPARTIDOS_MIN", 10000)
+
+# Perfilado bajo demanda (?profile=true)
+PERFILADO_HABILITADO = _booleano("ADUANAS_PERFILADO", False)
+PERFIL_FUNCIONES = _entero("ADUANAS_PERFIL_FUNCIONES", 25)
+
+# Made with Bob
@@ -0,0 +1,242 @@
+"""
+Capa de Carga de Datos
+Lee y preprocesa los datasets en paralelo y los publica como un snapshot versionado compartido
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from . import binario, config
+from .versionado import huella_archivos
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Cómo leer y preprocesar un archivo de datos"""
+    archivo: str
+    tipos: Dict[str, type] = field(default_factory=dict)
+    fechas: Tuple[str, ...] = ()
+    fechas_opcionales: Tuple[str, ...] = ()   # Valores inválidos -> NaT
+    columnas_json: Tuple[str, ...] = ()       # Texto JSON -> lista ([] si vacío)
+
+
+# La fracción se lee como texto para no perder ceros (8471.30 -> 8471.3)
+DATASETS: Dict[str, Dataset] = {
+    "importadores": Dataset(
+        "importadores.csv",
+        fechas=("fecha_alta_sat", "ultima_operacion")
+    ),
+    "pedimentos_historicos": Dataset(
+        "pedimentos_historicos.csv",
+        tipos={"fraccion_arancelaria": str},
+        fechas=("fecha_pago",)
+    ),
+    "precios_referencia_internacionales": Dataset(
+        "precios_referencia_internacionales.csv",
+        tipos={"fraccion_arancelaria": str},
+        fechas=("fecha_actualizacion",)
+    ),
+    "tipo_cambio_historico": Dataset(
+        "tipo_cambio_historico.csv",
+        fechas=("fecha",)
+    ),
+    "alertas_inteligencia": Dataset(
+        "alertas_inteligencia.csv",
+        tipos={"fraccion_arancelaria": str},
+        fechas=("fecha_emision",),
+        fechas_opcionales=("fecha_vencimiento",),
+        columnas_json=("senales_de_alerta",)
+    ),
+    "proveedores_extranjeros": Dataset(
+        "proveedores_extranjeros.csv"
+    ),
+    "regulaciones_por_fraccion": Dataset(
+        "regulaciones_por_fraccion.csv",
+        tipos={"fraccion_arancelaria": str},
+        fechas=("fecha_ultima_actualizacion",),
+        columnas_json=("noms_aplicables", "permisos_previos", "tratados_aplicables")
+    ),
+    "tratados_comerciales": Dataset(
+        "tratados_comerciales.csv"
+    ),
+}
+
+
+class SnapshotDatos:
+    """
+    Conjunto de datasets de una misma versión
+    
+    Los módulos reciben el mismo snapshot, por lo que todos ven la misma
+    versión de los datos. Cada tabla se lee la primera vez que se pide (o
+    todas juntas con precargar()) y a partir de ahí se comparte entre
+    módulos; las tablas deben tratarse como sólo lectura y una recarga
+    produce un snapshot nuevo.
+    """
+    
+    def __init__(self, data_path: str = "data", tablas: Optional[Iterable[str]] = None):
+        self.data_path = data_path
+        self.nombres = tuple(tablas) if tablas is not None else tuple(DATASETS)
+        self._rutas = {nombre: os.path.join(data_path, DATASETS[nombre].archivo) for nombre in self.nombres}
+        
+        # La versión se calcula antes de leer: si un archivo cambia durante la
+        # carga, la siguiente recarga lo detecta
+        self.version = huella_archivos(self._rutas.values())
+        self.cargado_en = datetime.now()
+        
+        self._directorio = directorio_binario(data_path)
+        self._manifiesto = binario.leer_manifiesto(self._directorio) if config.SNAPSHOT_BINARIO else None
+        
+        self._tablas: Dict[str, pd.DataFrame] = {}
+        self.tiempos_carga_ms: Dict[str, float] = {}
+        self.origenes: Dict[str, str] = {}   # "csv", "binario" o "compartido" por tabla
+        self._locks = {nombre: threading.Lock() for nombre in self.nombres}
+    
+    @property
+    def tablas(self) -> Mapping[str, pd.DataFrame]:
+        """Tablas ya cargadas"""
+        return MappingProxyType(self._tablas)
+    
+    def __getitem__(self, nombre: str) -> pd.DataFrame:
+        tabla = self._tablas.get(nombre)
+        if tabla is None:
+            if nombre not in self._locks:
+                raise KeyError(nombre)
+            # Un lock por tabla: dos módulos que piden la misma tabla la leen una sola vez
+            with self._locks[nombre]:
+                if nombre not in self._tablas:
+                    self._cargar(nombre)
+            tabla = self._tablas[nombre]
+        return tabla
+    
+    def _cargar(self, nombre: str):
+        """Lee la tabla del snapshot binario si corresponde al CSV actual; si no, del CSV"""
+        inicio = time.perf_counter()
+        tabla = None
+        if self._manifiesto is not None:
+            compartida = _compartir(self._manifiesto, nombre)
+            origen = "compartido" if compartida else "binario"
+            tabla = binario.leer_tabla(self._directorio, self._manifiesto, nombre,
+                                      huella_archivos([self._rutas[nombre]]), compartida=compartida)
+        if tabla is None:
+            tabla, origen = cargar_tabla(self.data_path, nombre), "csv"
+        
+        self.tiempos_carga_ms[nombre] = round((time.perf_counter() - inicio) * 1000, 2)
+        self.origenes[nombre] = origen
+        self._tablas[nombre] = tabla
+    
+    def precargar(self, tablas: Optional[Iterable[str]] = None, max_hilos: Optional[int] = None):
+        """Carga en paralelo las tablas indicadas (default: todas) que falten"""
+        pendientes = [nombre for nombre in (tablas or self.nombres) if nombre not in self._tablas]
+        if not pendientes:
+            return
+        with ThreadPoolExecutor(max_workers=max_hilos or len(pendientes), thread_name_prefix="carga") as ejecutor:
+            list(ejecutor.map(self.__getitem__, pendientes))
+    
+    def resumen(self) -> Dict:
+        """Versión, fecha y tamaño de cada tabla (None si aún no se carga)"""
+        tablas = {}
+        for nombre in self.nombres:
+            tabla = self._tablas.get(nombre)
+            tablas[nombre] = {
+                "cargada": tabla is not None,
+                "registros": len(tabla) if tabla is not None else None,
+                "tiempo_carga_ms": self.tiempos_carga_ms.get(nombre),
+                "origen": self.origenes.get(nombre)
+            }
+        return {
+            "version": self.version,
+            "data_path": self.data_path,
+            "cargado_en": self.cargado_en.isoformat(),
+            "tablas": tablas
+        }
+
+
+def cargar_tabla(data_path: str, nombre: str) -> pd.DataFrame:
+    """Lee un dataset y aplica su preprocesamiento (fechas y columnas JSON)"""
+    dataset = DATASETS[nombre]
+    tabla = pd.read_csv(os.path.join(data_path, dataset.archivo), dtype=dataset.tipos or None)
+    
+    for columna in dataset.fechas:
+        tabla[columna] = pd.to_datetime(tabla[columna])
+    for columna in dataset.fechas_opcionales:
+        tabla[columna] = pd.to_datetime(tabla[columna], errors='coerce')
+    for columna in dataset.columnas_json:
+        tabla[columna] = tabla[columna].apply(lambda x: json.loads(x) if pd.notna(x) else [])
+    
+    return tabla
+
+
+def directorio_binario(data_path: str) -> str:
+    """Directorio del snapshot binario (ADUANAS_SNAPSHOT_DIR o <data_path>/snapshot)"""
+    return config.SNAPSHOT_DIRECTORIO or os.path.join(data_path, "snapshot")
+
+
+def _compartir(manifiesto: Dict, nombre: str) -> bool:
+    """
+    Indica si la tabla se deja respaldada por el archivo mapeado
+    
+    Sólo conviene en tablas grandes: en las pequeñas el ahorro de memoria es
+    mínimo y las columnas Arrow hacen más lentas las selecciones de filas.
+    """
+    entrada = manifiesto["tablas"].get(nombre, {})
+    return config.DATOS_COMPARTIDOS and entrada.get("registros", 0) >= config.DATOS_COMPARTIDOS_MIN_REGISTROS
+
+
+def cargar_snapshot(data_path: str = "data", tablas: Optional[Iterable[str]] = None,
+                    max_hilos: Optional[int] = None) -> SnapshotDatos:
+    """
+    Arma un snapshot y carga sus tablas en paralelo
+    
+    Args:
+        data_path: Directorio de los CSV
+        tablas: Datasets a cargar (default: todos)
+        max_hilos: Hilos de lectura (default: uno por dataset)
+    """
+    snapshot = SnapshotDatos(data_path, tablas)
+    snapshot.precargar(max_hilos=max_hilos)
+    return snapshot
+
+
+def construir_snapshot_binario(data_path: str = "data", directorio: Optional[str] = None) -> Dict:
+    """
+    Preprocesa todos los CSV y los escribe como snapshot binario (Arrow IPC)
+    
+    Cada tabla guarda la huella de su CSV: si el CSV cambia después, esa
+    tabla se vuelve a leer del CSV hasta que se reconstruya el snapshot.
+    """
+    if not binario.disponible():
+        raise RuntimeError("El snapshot binario requiere pyarrow (pip install pyarrow)")
+    
+    directorio = directorio or directorio_binario(data_path)
+    os.makedirs(directorio, exist_ok=True)
+    
+    inicio = time.perf_counter()
+    entradas = {}
+    for nombre, dataset in DATASETS.items():
+        ruta = os.path.join(data_path, dataset.archivo)
+        # La huella se toma antes de leer para no asociarla a un CSV más nuevo
+        huella = huella_archivos([ruta])
+        tabla = cargar_tabla(data_path, nombre)
+        entradas[nombre] = {
+            "archivo": binario.guardar_tabla(directorio, nombre, tabla),
+            "huella": huella,
+            "registros": len(tabla),
+            "columnas_lista": list(dataset.columnas_json)
+        }
+    binario.guardar_manifiesto(directorio, entradas)
+    
+    return {
+        "directorio": directorio,
+        "tablas": entradas,
+        "tiempo_ms": round((time.perf_counter() - inicio) * 1000, 2)
+    }
+
+# Made with Bob
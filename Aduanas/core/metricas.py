@@ -0,0 +1,147 @@
+"""
+Métricas de Latencia
+Histogramas por módulo y etapa expuestos en formato de texto de Prometheus
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Límites de los buckets en segundos (de 0.5 ms a 5 s)
+LIMITES_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escapar(valor: str) -> str:
+    """Escapa el valor de una etiqueta según el formato de Prometheus"""
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Histograma:
+    """Histograma con etiquetas, seguro entre hilos"""
+    
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str],
+                 limites: Sequence[float] = LIMITES_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.limites = tuple(sorted(limites))
+        
+        # Por combinación de etiquetas: [conteos por bucket (+Inf al final), suma]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+    
+    def observar(self, valor: float, *valores_etiquetas: str):
+        """Registra una observación para la combinación de etiquetas"""
+        bucket = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(valores_etiquetas)
+            if serie is None:
+                serie = self._series[valores_etiquetas] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][bucket] += 1
+            serie[1] += valor
+    
+    def exponer(self) -> List[str]:
+        """Líneas del histograma en formato de texto de Prometheus"""
+        lineas = [
+            f"# HELP {self.nombre} {self.ayuda}",
+            f"# TYPE {self.nombre} histogram"
+        ]
+        
+        with self._lock:
+            series = sorted((etiquetas, list(serie[0]), serie[1]) for etiquetas, serie in self._series.items())
+        
+        for valores, conteos, suma in series:
+            base = ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(self.etiquetas, valores))
+            separador = "," if base else ""
+            
+            acumulado = 0
+            for limite, conteo in zip(self.limites + (float("inf"),), conteos):
+                acumulado += conteo
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                lineas.append(f'{self.nombre}_bucket{{{base}{separador}le="{le}"}} {acumulado}')
+            
+            etiquetas = f"{{{base}}}" if base else ""
+            lineas.append(f"{self.nombre}_sum{etiquetas} {suma!r}")
+            lineas.append(f"{self.nombre}_count{etiquetas} {acumulado}")
+        
+        return lineas
+
+
+class RegistroMetricas:
+    """Conjunto de histogramas que se exponen juntos en /metrics"""
+    
+    def __init__(self):
+        self._histogramas: Dict[str, Histograma] = {}
+        self._lock = threading.Lock()
+    
+    def histograma(self, nombre: str, ayuda: str, etiquetas: Sequence[str],
+                   limites: Sequence[float] = LIMITES_SEGUNDOS) -> Histograma:
+        """Obtiene (o registra) un histograma por nombre"""
+        with self._lock:
+            if nombre not in self._histogramas:
+                self._histogramas[nombre] = Histograma(nombre, ayuda, etiquetas, limites)
+            return self._histogramas[nombre]
+    
+    def exponer(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus"""
+        with self._lock:
+            histogramas = list(self._histogramas.values())
+        
+        lineas = []
+        for histograma in histogramas:
+            lineas.extend(histograma.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+class Cronometro:
+    """
+    Mide etapas consecutivas de un módulo
+    
+    Cada llamada a marcar() registra el tiempo transcurrido desde la marca
+    anterior (o desde la creación) como la duración de esa etapa.
+    """
+    
+    __slots__ = ('_histograma', '_modulo', '_ultimo')
+    
+    def __init__(self, histograma: Histograma, modulo: str):
+        self._histograma = histograma
+        self._modulo = modulo
+        self._ultimo = time.perf_counter()
+    
+    def marcar(self, etapa: str):
+        """Cierra la etapa en curso y comienza la siguiente"""
+        ahora = time.perf_counter()
+        self._histograma.observar(ahora - self._ultimo, self._modulo, etapa)
+        self._ultimo = ahora
+
+
+# Registro compartido por la aplicación
+metricas = RegistroMetricas()
+
+DURACION_ETAPA = metricas.histograma(
+    "aduanas_etapa_duracion_segundos",
+    "Duración de cada etapa interna de los módulos de análisis",
+    ("modulo", "etapa")
+)
+DURACION_MODULO = metricas.histograma(
+    "aduanas_modulo_duracion_segundos",
+    "Duración total de cada módulo dentro del análisis completo",
+    ("modulo",)
+)
+DURACION_SOLICITUD = metricas.histograma(
+    "aduanas_solicitud_duracion_segundos",
+    "Duración de las solicitudes HTTP por ruta",
+    ("metodo", "ruta")
+)
+DURACION_SERIALIZACION = metricas.histograma(
+    "aduanas_serializacion_duracion_segundos",
+    "Duración de la serialización JSON de la respuesta por ruta",
+    ("metodo", "ruta")
+)
+
+
+def cronometro(modulo: str) -> Cronometro:
+    """Cronómetro de etapas para un módulo"""
+    return Cronometro(DURACION_ETAPA, modulo)
+
+# Made with Bob
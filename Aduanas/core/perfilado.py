@@ -0,0 +1,123 @@
+"""
+Perfilado Bajo Demanda
+Ejecuta una solicitud bajo cProfile cuando se pide ?profile=true y la configuración lo permite
+"""
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import orjson
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+
+from . import config
+from .cache import CacheTTL
+from .serializacion import RespuestaJSON
+
+_DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Perfiles recientes, consultables por id después de la solicitud
+perfiles = CacheTTL(tamano_maximo=100, ttl_segundos=3600)
+
+
+def _ubicacion(archivo: str, linea: int) -> str:
+    """Ruta corta de la función perfilada"""
+    if archivo.startswith(_DIRECTORIO_APP):
+        archivo = os.path.relpath(archivo, _DIRECTORIO_APP)
+    else:
+        for marcador in ("site-packages/", "lib/python"):
+            if marcador in archivo:
+                archivo = archivo.split(marcador, 1)[1]
+                break
+    return f"{archivo}:{linea}"
+
+
+def top_funciones(perfil: cProfile.Profile, limite: int) -> List[Dict]:
+    """Funciones con mayor tiempo acumulado"""
+    filas = []
+    for (archivo, linea, nombre), (_, llamadas, propio, acumulado, _) in pstats.Stats(perfil).stats.items():
+        filas.append({
+            "funcion": nombre,
+            "ubicacion": _ubicacion(archivo, linea),
+            "llamadas": llamadas,
+            "tiempo_propio_ms": round(propio * 1000, 3),
+            "tiempo_acumulado_ms": round(acumulado * 1000, 3)
+        })
+    
+    filas.sort(key=lambda fila: fila["tiempo_acumulado_ms"], reverse=True)
+    return filas[:limite]
+
+
+def perfilable(endpoint: Callable) -> Callable:
+    """
+    Agrega el parámetro ?profile=true a un endpoint síncrono
+    
+    Con el perfilado habilitado (ADUANAS_PERFILADO=1) la solicitud se ejecuta
+    bajo cProfile y la respuesta JSON se envuelve como {"respuesta", "perfil"}
+    con las funciones de mayor tiempo acumulado. El perfil también queda
+    disponible por su id (encabezado X-Perfil-Id). Sólo se perfila el hilo
+    que atiende la solicitud.
+    """
+    firma = inspect.signature(endpoint)
+    parametro = inspect.Parameter(
+        "profile", inspect.Parameter.KEYWORD_ONLY, annotation=bool,
+        default=Query(False, description="Perfilar la solicitud (requiere ADUANAS_PERFILADO)")
+    )
+    
+    @functools.wraps(endpoint)
+    def envoltura(*args, profile: bool = False, **kwargs):
+        if not profile:
+            return endpoint(*args, **kwargs)
+        
+        if not config.PERFILADO_HABILITADO:
+            raise HTTPException(status_code=403, detail="El perfilado no está habilitado (ADUANAS_PERFILADO)")
+        
+        id_perfil = uuid.uuid4().hex[:12]
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        try:
+            resultado = perfil.runcall(endpoint, *args, **kwargs)
+        except HTTPException as e:
+            _guardar_perfil(id_perfil, endpoint.__name__, perfil, inicio)
+            raise HTTPException(status_code=e.status_code, detail=e.detail,
+                                headers={**(e.headers or {}), "X-Perfil-Id": id_perfil})
+        
+        informe = _guardar_perfil(id_perfil, endpoint.__name__, perfil, inicio)
+        
+        if isinstance(resultado, RespuestaJSON):
+            contenido = orjson.loads(resultado.body)
+        elif isinstance(resultado, Response):
+            # Respuestas transmitidas: el perfil sólo se consulta por id
+            resultado.headers["X-Perfil-Id"] = id_perfil
+            return resultado
+        else:
+            contenido = resultado
+        
+        return RespuestaJSON(
+            {"respuesta": contenido, "perfil": informe},
+            headers={"X-Perfil-Id": id_perfil}
+        )
+    
+    envoltura.__signature__ = firma.replace(parameters=[*firma.parameters.values(), parametro])
+    return envoltura
+
+
+def _guardar_perfil(id_perfil: str, endpoint: str, perfil: cProfile.Profile, inicio: float) -> Dict:
+    """Arma el informe del perfil y lo guarda para consulta posterior"""
+    informe = {
+        "id_perfil": id_perfil,
+        "endpoint": endpoint,
+        "fecha": datetime.now().isoformat(),
+        "tiempo_total_ms": round((time.perf_counter() - inicio) * 1000, 2),
+        "funciones": top_funciones(perfil, config.PERFIL_FUNCIONES)
+    }
+    perfiles.guardar(id_perfil, informe)
+    return informe
+
+# Made with Bob
@@ -0,0 +1,111 @@
+"""
+Serialización JSON Rápida
+Codifica las respuestas con orjson, con soporte nativo de NumPy, pandas y fechas
+"""
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+
+OPCIONES_JSON = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _valor_por_defecto(valor: Any) -> Any:
+    """Convierte los tipos que orjson no serializa por sí mismo"""
+    if isinstance(valor, Mapping):
+        return dict(valor)
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    if hasattr(valor, "item"):
+        # Escalares de NumPy/pandas que no cubre OPT_SERIALIZE_NUMPY
+        return valor.item()
+    return str(valor)
+
+
+def a_json(contenido: Any) -> bytes:
+    """Serializa un valor a JSON (UTF-8)"""
+    return orjson.dumps(contenido, default=_valor_por_defecto, option=OPCIONES_JSON)
+
+
+class RespuestaJSON(JSONResponse):
+    """
+    Respuesta JSON serializada con orjson
+    
+    Devolverla directamente desde un endpoint evita el paso de
+    jsonable_encoder de FastAPI. El tiempo de serialización se reporta en el
+    encabezado Server-Timing.
+    """
+    
+    def __init__(self, content: Any, status_code: int = 200,
+                 headers: Optional[Dict[str, str]] = None, **kwargs):
+        self.tiempo_serializacion_ms = 0.0
+        super().__init__(content, status_code, headers, **kwargs)
+        self.headers.append("Server-Timing", f"serializacion;dur={self.tiempo_serializacion_ms:.3f}")
+    
+    def render(self, content: Any) -> bytes:
+        inicio = time.perf_counter()
+        cuerpo = a_json(content)
+        self.tiempo_serializacion_ms = (time.perf_counter() - inicio) * 1000
+        return cuerpo
+
+
+def duracion_server_timing(encabezado: Optional[str], metrica: str) -> Optional[float]:
+    """Extrae la duración (ms) de una métrica de un encabezado Server-Timing"""
+    if not encabezado:
+        return None
+    
+    for entrada in encabezado.split(","):
+        partes = [parte.strip() for parte in entrada.split(";")]
+        if partes[0] != metrica:
+            continue
+        for parte in partes[1:]:
+            if parte.startswith("dur="):
+                return float(parte[4:])
+    return None
+
+
+class TiemposPorRuta:
+    """Acumula tiempo total y de serialización por ruta, seguro entre hilos"""
+    
+    def __init__(self):
+        self._rutas: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def registrar(self, ruta: str, total_ms: float, serializacion_ms: Optional[float] = None):
+        """Registra una solicitud atendida por la ruta"""
+        with self._lock:
+            datos = self._rutas.setdefault(ruta, {
+                "solicitudes": 0,
+                "total_ms": 0.0,
+                "total_max_ms": 0.0,
+                "serializacion_ms": 0.0,
+                "serializacion_max_ms": 0.0
+            })
+            datos["solicitudes"] += 1
+            datos["total_ms"] += total_ms
+            datos["total_max_ms"] = max(datos["total_max_ms"], total_ms)
+            if serializacion_ms is not None:
+                datos["serializacion_ms"] += serializacion_ms
+                datos["serializacion_max_ms"] = max(datos["serializacion_max_ms"], serializacion_ms)
+    
+    def estadisticas(self) -> Dict[str, Dict]:
+        """Promedios y máximos por ruta"""
+        with self._lock:
+            return {
+                ruta: {
+                    "solicitudes": datos["solicitudes"],
+                    "promedio_total_ms": round(datos["total_ms"] / datos["solicitudes"], 3),
+                    "max_total_ms": round(datos["total_max_ms"], 3),
+                    "promedio_serializacion_ms": round(datos["serializacion_ms"] / datos["solicitudes"], 3),
+                    "max_serializacion_ms": round(datos["serializacion_max_ms"], 3),
+                    "porcentaje_serializacion": (
+                        round(datos["serializacion_ms"] / datos["total_ms"] * 100, 1) if datos["total_ms"] else 0.0
+                    )
+                }
+                for ruta, datos in sorted(self._rutas.items())
+            }
+
+# Made with Bob
@@ -0,0 +1,23 @@
+"""
+Versionado de Datos
+Huella de los archivos fuente para detectar cambios de datos entre cargas
+"""
+import hashlib
+import os
+from typing import Iterable
+
+
+def huella_archivos(rutas: Iterable[str]) -> str:
+    """
+    Calcula una huella corta de un conjunto de archivos
+    
+    Usa nombre, tamaño y fecha de modificación: recargar los mismos archivos
+    produce la misma versión y cualquier cambio en ellos produce otra.
+    """
+    h = hashlib.sha1()
+    for ruta in sorted(rutas):
+        estado = os.stat(ruta)
+        h.update(f"{os.path.basename(ruta)}:{estado.st_size}:{estado.st_mtime_ns};".encode())
+    return h.hexdigest()[:12]
+
+# Made with Bob
@@ -0,0 +1,41 @@
+"""
+Script para cruzar alertas de inteligencia contra el historial de pedimentos
+Escribe los RFCs y pedimentos afectados retroactivamente por cada alerta
+(los que coinciden con su fracción o una más específica, su país o su proveedor)
+
+Uso:
+    python cruzar_alertas.py                          # Todas las alertas vigentes
+    python cruzar_alertas.py A-2024-0001 A-2024-0002  # Alertas específicas
+    python cruzar_alertas.py --salida data/cruce_retroactivo
+"""
+import argparse
+
+from modules.cruce_retroactivo import CruceRetroactivo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cruce retroactivo de alertas vs. pedimentos históricos")
+    parser.add_argument("alertas", nargs="*", help="IDs de alerta (default: todas las vigentes)")
+    parser.add_argument("--data", default="data", help="Directorio de datos CSV")
+    parser.add_argument("--salida", default="data/cruce_retroactivo", help="Directorio de salida")
+    parser.add_argument("--incluir-vencidas", action="store_true",
+                        help="Cruzar también alertas vencidas cuando no se indican IDs")
+    args = parser.parse_args()
+    
+    cruce = CruceRetroactivo(args.data)
+    resumen = cruce.exportar(
+        args.salida,
+        ids_alerta=args.alertas or None,
+        solo_vigentes=not args.incluir_vencidas
+    )
+    
+    print(f"[OK] {resumen['alertas_cruzadas']} alertas cruzadas en {resumen['tiempo_ms']} ms")
+    print(f"     {resumen['pedimentos_afectados']} pedimentos afectados")
+    print(f"     {resumen['rfcs_afectados']} RFCs afectados")
+    print(f"     Resultados en {resumen['directorio']}/")
+
+
+if __name__ == "__main__":
+    main()
+
+# Made with Bob
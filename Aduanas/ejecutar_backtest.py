@@ -0,0 +1,87 @@
+"""
+Script para evaluar el canal recomendado contra el historial de pedimentos
+Reproduce el análisis completo sobre cada pedimento y lo compara contra el canal
+asignado y el resultado del reconocimiento
+
+Uso:
+    python ejecutar_backtest.py                                     # Reglas vigentes
+    python ejecutar_backtest.py --umbral valor.subfacturacion_severa_pct=-30
+    python ejecutar_backtest.py --procesos 4 --bloque 100000 --salida backtest.json
+"""
+import argparse
+import json
+
+from core import SnapshotDatos, config
+from modules import (
+    AnalizadorHistorial,
+    AnalizadorValor,
+    BacktestCanal,
+    GestorAlertas,
+    GeneradorChecklist
+)
+from modules import reglas
+
+
+def _leer_umbrales(parser: argparse.ArgumentParser, valores) -> dict:
+    """Convierte los --umbral nombre=valor en parámetros de las reglas"""
+    declarados = reglas.umbrales()
+    parametros = {}
+    for texto in valores or []:
+        nombre, _, valor = texto.partition("=")
+        if nombre not in declarados:
+            parser.error(f"Umbral desconocido: {nombre} (disponibles: {', '.join(declarados)})")
+        try:
+            parametros[nombre] = float(valor)
+        except ValueError:
+            parser.error(f"Valor inválido para {nombre}: {valor!r}")
+    return parametros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest del canal recomendado vs. resultados históricos")
+    parser.add_argument("--data", default="data", help="Directorio de datos CSV")
+    parser.add_argument("--umbral", action="append", metavar="NOMBRE=VALOR",
+                        help="Umbral alterno de las reglas (se puede repetir)")
+    parser.add_argument("--procesos", type=int, default=config.BACKTEST_PROCESOS,
+                        help="Procesos de evaluación (default: ADUANAS_BACKTEST_PROCESOS)")
+    parser.add_argument("--bloque", type=int, default=config.BACKTEST_TAMANO_BLOQUE,
+                        help="Pedimentos por bloque (default: ADUANAS_BACKTEST_BLOQUE)")
+    parser.add_argument("--salida", default=None, help="Archivo JSON para el reporte completo")
+    args = parser.parse_args()
+    parametros = _leer_umbrales(parser, args.umbral)
+    
+    snapshot = SnapshotDatos(args.data)
+    backtest = BacktestCanal(
+        AnalizadorHistorial(snapshot=snapshot),
+        AnalizadorValor(snapshot=snapshot),
+        GestorAlertas(snapshot=snapshot),
+        GeneradorChecklist(snapshot=snapshot)
+    )
+    reporte = backtest.ejecutar(parametros, procesos=args.procesos, tamano_bloque=args.bloque)
+    
+    rendimiento = reporte["rendimiento"]
+    embargos = reporte["embargos"]
+    print(f"[OK] {reporte['analizados']} pedimentos evaluados en {rendimiento['tiempo_ms']} ms "
+          f"({rendimiento['pedimentos_por_segundo']} pedimentos/s, {rendimiento['procesos']} procesos)")
+    if parametros:
+        print(f"     Umbrales alternos: {parametros}")
+    print(f"     Canal recomendado: {reporte['canal_recomendado']}")
+    print(f"     Embargos: {embargos['total']} | ROJO {embargos['recomendados_rojo']} | "
+          f"AMARILLO {embargos['recomendados_amarillo']} | VERDE {embargos['recomendados_verde']}")
+    print(f"     Irregularidades enviadas a revisión: {reporte['irregularidades']['tasa_cobertura_pct']}%")
+    print()
+    print("     Canal recomendado (filas) vs. resultado del reconocimiento:")
+    print(f"     {'':10}" + "".join(f"{resultado:>20}" for resultado in reporte["matriz_resultado"]["VERDE"]))
+    for canal, fila in reporte["matriz_resultado"].items():
+        print(f"     {canal:10}" + "".join(f"{n:>20}" for n in fila.values()))
+    
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        print(f"     Reporte en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
+
+# Made with Bob
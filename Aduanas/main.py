@@ -1,432 +1,1320 @@
-"""
-API FastAPI para el Sistema de Análisis de Importaciones
-Agente de Inteligencia Aduanera
-"""
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
-import time
-from datetime import datetime
-
-from modules import (
-    AnalizadorHistorial,
-    AnalizadorValor,
-    GestorAlertas,
-    GeneradorChecklist
-)
-
-# Inicializar FastAPI
-app = FastAPI(
-    title="Sistema de Análisis de Importaciones",
-    description="Agente de inteligencia aduanera para análisis de operaciones de importación",
-    version="1.0.0"
-)
-
-# Configurar CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Inicializar módulos
-analizador_historial = AnalizadorHistorial()
-analizador_valor = AnalizadorValor()
-gestor_alertas = GestorAlertas()
-generador_checklist = GeneradorChecklist()
-
-
-# ============================================================================
-# ENDPOINTS PRINCIPALES
-# ============================================================================
-
-@app.get("/")
-def root():
-    """Endpoint raíz con información del sistema"""
-    return {
-        "sistema": "Agente de Análisis de Importaciones",
-        "version": "1.0.0",
-        "modulos": [
-            "Módulo 1: Historial del Importador",
-            "Módulo 2: Valor de Referencia Internacional",
-            "Módulo 3: Alertas Activas de Inteligencia",
-            "Módulo 4: Checklist Regulatorio Personalizado"
-        ],
-        "endpoints": {
-            "analisis_completo": "/api/analisis/completo",
-            "historial": "/api/importador/{rfc}",
-            "valor": "/api/valor/analizar",
-            "alertas": "/api/alertas/buscar",
-            "checklist": "/api/checklist/generar"
-        }
-    }
-
-
-@app.get("/api/analisis/completo")
-def analisis_completo(
-    rfc: str = Query(..., description="RFC del importador"),
-    fraccion: str = Query(..., description="Fracción arancelaria"),
-    pais_origen: str = Query(..., description="País de origen"),
-    valor_unitario: float = Query(..., gt=0, description="Valor unitario en USD"),
-    cantidad: int = Query(1, gt=0, description="Cantidad de unidades"),
-    proveedor_id: Optional[str] = Query(None, description="ID del proveedor")
-):
-    """
-    ANÁLISIS COMPLETO - Ejecuta los 4 módulos en secuencia
-    
-    Este es el endpoint principal que un oficial aduanero usaría para
-    obtener un análisis completo de una operación de importación.
-    """
-    inicio = time.time()
-    
-    try:
-        # MÓDULO 1: Historial del Importador
-        historial = analizador_historial.analizar_importador(rfc)
-        
-        if not historial.get("encontrado"):
-            raise HTTPException(status_code=404, detail=f"RFC {rfc} no encontrado")
-        
-        # MÓDULO 2: Análisis de Valor
-        analisis_valor = analizador_valor.analizar_valor(
-            fraccion, pais_origen, valor_unitario, cantidad
-        )
-        
-        # MÓDULO 3: Alertas Activas
-        alertas = gestor_alertas.buscar_alertas_para_operacion(
-            fraccion, pais_origen, proveedor_id
-        )
-        
-        # MÓDULO 4: Checklist Regulatorio
-        tipo_importador = "nuevo" if historial.get("anios_activo", 0) < 1 else "regular"
-        primera_importacion = fraccion not in [f["fraccion"] for f in historial.get("fracciones_mas_usadas", [])]
-        
-        checklist = generador_checklist.generar_checklist(
-            fraccion, pais_origen, tipo_importador, primera_importacion
-        )
-        
-        # Determinar nivel de riesgo global
-        nivel_riesgo_global = _determinar_riesgo_global(
-            historial, analisis_valor, alertas
-        )
-        
-        # Recomendar canal
-        canal_recomendado = _recomendar_canal(
-            nivel_riesgo_global, historial, analisis_valor, alertas, checklist
-        )
-        
-        # Generar acciones inmediatas
-        acciones = _generar_acciones_inmediatas(
-            historial, analisis_valor, alertas, checklist
-        )
-        
-        tiempo_procesamiento = (time.time() - inicio) * 1000
-        
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "tiempo_procesamiento_ms": round(tiempo_procesamiento, 2),
-            "rfc_importador": rfc,
-            "fraccion_arancelaria": fraccion,
-            "pais_origen": pais_origen,
-            
-            # Resultados de los 4 módulos
-            "modulo1_historial": historial,
-            "modulo2_valor": analisis_valor,
-            "modulo3_alertas": alertas,
-            "modulo4_checklist": checklist,
-            
-            # Resumen ejecutivo
-            "resumen_ejecutivo": {
-                "nivel_riesgo_global": nivel_riesgo_global,
-                "canal_recomendado": canal_recomendado,
-                "perfil_importador": historial.get("perfil_riesgo"),
-                "riesgo_valor": analisis_valor.get("nivel_riesgo"),
-                "alertas_criticas": sum(1 for a in alertas.get("alertas", []) if a.get("nivel_criticidad") == "CRITICO"),
-                "documentos_faltantes": checklist.get("documentos_faltantes", 0),
-                "acciones_inmediatas": acciones
-            }
-        }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error en análisis: {str(e)}")
-
-
-# ============================================================================
-# MÓDULO 1: HISTORIAL DEL IMPORTADOR
-# ============================================================================
-
-@app.get("/api/importador/{rfc}")
-def consultar_importador(
-    rfc: str,
-    meses_historial: int = Query(24, ge=1, le=60)
-):
-    """Consulta el historial completo de un importador"""
-    resultado = analizador_historial.analizar_importador(rfc, meses_historial)
-    
-    if not resultado.get("encontrado"):
-        raise HTTPException(status_code=404, detail=f"RFC {rfc} no encontrado")
-    
-    return resultado
-
-
-@app.get("/api/importador/{rfc}/operaciones")
-def historial_operaciones(
-    rfc: str,
-    limite: int = Query(10, ge=1, le=100)
-):
-    """Obtiene las últimas operaciones del importador"""
-    operaciones = analizador_historial.obtener_historial_operaciones(rfc, limite)
-    
-    if not operaciones:
-        raise HTTPException(status_code=404, detail=f"No se encontraron operaciones para RFC {rfc}")
-    
-    return {
-        "rfc": rfc,
-        "total_operaciones": len(operaciones),
-        "operaciones": operaciones
-    }
-
-
-@app.get("/api/importador/{rfc}/comparacion-sector")
-def comparar_sector(rfc: str):
-    """Compara las métricas del importador con su sector"""
-    resultado = analizador_historial.comparar_con_promedio_sector(rfc)
-    
-    if "error" in resultado:
-        raise HTTPException(status_code=404, detail=resultado["error"])
-    
-    return resultado
-
-
-# ============================================================================
-# MÓDULO 2: VALOR DE REFERENCIA
-# ============================================================================
-
-@app.get("/api/valor/analizar")
-def analizar_valor(
-    fraccion: str = Query(..., description="Fracción arancelaria"),
-    pais_origen: str = Query(..., description="País de origen"),
-    valor_unitario: float = Query(..., gt=0, description="Valor unitario en USD"),
-    cantidad: int = Query(1, gt=0, description="Cantidad")
-):
-    """Analiza el valor declarado contra referencias de mercado"""
-    resultado = analizador_valor.analizar_valor(fraccion, pais_origen, valor_unitario, cantidad)
-    return resultado
-
-
-@app.get("/api/valor/estadisticas/{fraccion}")
-def estadisticas_fraccion(fraccion: str):
-    """Obtiene estadísticas de precios para una fracción"""
-    resultado = analizador_valor.obtener_estadisticas_fraccion(fraccion)
-    
-    if not resultado.get("encontrado"):
-        raise HTTPException(status_code=404, detail=f"No hay datos para fracción {fraccion}")
-    
-    return resultado
-
-
-# ============================================================================
-# MÓDULO 3: ALERTAS DE INTELIGENCIA
-# ============================================================================
-
-@app.get("/api/alertas/vigentes")
-def alertas_vigentes(
-    tipo: Optional[str] = Query(None, description="Tipo de alerta (TRI, SUB, etc.)"),
-    criticidad: Optional[str] = Query(None, description="Nivel de criticidad")
-):
-    """Obtiene todas las alertas vigentes"""
-    filtro = {}
-    if tipo:
-        filtro["tipo"] = tipo
-    if criticidad:
-        filtro["criticidad"] = criticidad
-    
-    alertas = gestor_alertas.obtener_alertas_vigentes(filtro)
-    
-    return {
-        "total": len(alertas),
-        "alertas": alertas
-    }
-
-
-@app.get("/api/alertas/buscar")
-def buscar_alertas(
-    fraccion: str = Query(..., description="Fracción arancelaria"),
-    pais_origen: str = Query(..., description="País de origen"),
-    proveedor_id: Optional[str] = Query(None, description="ID del proveedor")
-):
-    """Busca alertas relevantes para una operación específica"""
-    resultado = gestor_alertas.buscar_alertas_para_operacion(
-        fraccion, pais_origen, proveedor_id
-    )
-    return resultado
-
-
-@app.get("/api/alertas/estadisticas")
-def estadisticas_alertas():
-    """Obtiene estadísticas generales de alertas"""
-    return gestor_alertas.obtener_estadisticas_alertas()
-
-
-@app.get("/api/alertas/modus-operandi")
-def modus_operandi(
-    tipo: Optional[str] = Query(None, description="Tipo de alerta")
-):
-    """Obtiene los modus operandi más frecuentes"""
-    return {
-        "modus_operandi": gestor_alertas.obtener_modus_operandi_frecuentes(tipo)
-    }
-
-
-# ============================================================================
-# MÓDULO 4: CHECKLIST REGULATORIO
-# ============================================================================
-
-@app.get("/api/checklist/generar")
-def generar_checklist(
-    fraccion: str = Query(..., description="Fracción arancelaria"),
-    pais_origen: str = Query(..., description="País de origen"),
-    tipo_importador: str = Query("regular", description="Tipo de importador"),
-    primera_importacion: bool = Query(False, description="¿Primera importación de esta fracción?")
-):
-    """Genera checklist regulatorio personalizado"""
-    resultado = generador_checklist.generar_checklist(
-        fraccion, pais_origen, tipo_importador, primera_importacion
-    )
-    return resultado
-
-
-@app.get("/api/checklist/noms/{fraccion}")
-def verificar_noms(fraccion: str):
-    """Verifica las NOMs aplicables a una fracción"""
-    resultado = generador_checklist.verificar_cumplimiento_noms(fraccion)
-    
-    if not resultado.get("encontrado"):
-        raise HTTPException(status_code=404, detail=f"No hay información para fracción {fraccion}")
-    
-    return resultado
-
-
-@app.get("/api/checklist/tratados/{pais}")
-def consultar_tratados(pais: str):
-    """Consulta tratados comerciales aplicables con un país"""
-    return generador_checklist.obtener_tratados_comerciales(pais)
-
-
-# ============================================================================
-# FUNCIONES AUXILIARES
-# ============================================================================
-
-def _determinar_riesgo_global(historial: dict, valor: dict, alertas: dict) -> str:
-    """Determina el nivel de riesgo global de la operación"""
-    riesgos = []
-    
-    # Riesgo del importador
-    if historial.get("perfil_riesgo") == "ROJO":
-        riesgos.append("ROJO")
-    elif historial.get("perfil_riesgo") == "AMARILLO":
-        riesgos.append("AMARILLO")
-    
-    # Riesgo del valor
-    if valor.get("nivel_riesgo") == "ROJO":
-        riesgos.append("ROJO")
-    elif valor.get("nivel_riesgo") == "AMARILLO":
-        riesgos.append("AMARILLO")
-    
-    # Riesgo de alertas
-    if alertas.get("nivel_riesgo_global") == "ROJO":
-        riesgos.append("ROJO")
-    elif alertas.get("nivel_riesgo_global") == "AMARILLO":
-        riesgos.append("AMARILLO")
-    
-    # Determinar riesgo final
-    if "ROJO" in riesgos:
-        return "ROJO"
-    elif "AMARILLO" in riesgos:
-        return "AMARILLO"
-    else:
-        return "VERDE"
-
-
-def _recomendar_canal(riesgo_global: str, historial: dict, valor: dict, 
-                     alertas: dict, checklist: dict) -> str:
-    """Recomienda el canal de desaduanamiento"""
-    if riesgo_global == "ROJO":
-        return "ROJO"
-    
-    # Verificar alertas críticas
-    if alertas.get("total_alertas", 0) > 0:
-        alertas_criticas = sum(1 for a in alertas.get("alertas", []) 
-                              if a.get("nivel_criticidad") == "CRITICO")
-        if alertas_criticas > 0:
-            return "ROJO"
-    
-    # Verificar documentos faltantes críticos
-    if checklist.get("documentos_faltantes", 0) > 2:
-        return "AMARILLO"
-    
-    if riesgo_global == "AMARILLO":
-        return "AMARILLO"
-    
-    # Canal verde solo si todo está en orden
-    if (historial.get("perfil_riesgo") == "VERDE" and 
-        valor.get("nivel_riesgo") == "VERDE" and
-        alertas.get("total_alertas", 0) == 0):
-        return "VERDE"
-    
-    return "AMARILLO"
-
-
-def _generar_acciones_inmediatas(historial: dict, valor: dict, 
-                                alertas: dict, checklist: dict) -> list:
-    """Genera lista de acciones inmediatas requeridas"""
-    acciones = []
-    
-    # Acciones por historial
-    if historial.get("perfil_riesgo") == "ROJO":
-        acciones.append("Verificar antecedentes del importador")
-    
-    if historial.get("opinion_sat") == "NEGATIVA":
-        acciones.append("CRÍTICO: Opinión SAT negativa - Verificar situación fiscal")
-    
-    # Acciones por valor
-    if valor.get("nivel_riesgo") == "ROJO":
-        acciones.append("Solicitar documentación adicional de valor (contratos, pagos)")
-    
-    # Acciones por alertas
-    for alerta in alertas.get("alertas", [])[:3]:  # Top 3 alertas
-        if alerta.get("nivel_criticidad") in ["CRITICO", "ALTO"]:
-            acciones.append(f"Alerta {alerta.get('tipo')}: {alerta.get('accion_recomendada')}")
-    
-    # Acciones por checklist
-    if checklist.get("documentos_faltantes", 0) > 0:
-        acciones.append(f"Solicitar {checklist.get('documentos_faltantes')} documentos faltantes")
-    
-    return acciones[:5]  # Máximo 5 acciones
-
-
-# ============================================================================
-# HEALTH CHECK
-# ============================================================================
-
-@app.get("/health")
-def health_check():
-    """Verifica el estado del sistema"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "modulos": {
-            "historial": "OK",
-            "valor": "OK",
-            "alertas": "OK",
-            "checklist": "OK"
-        }
-    }
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
-
-# Made with Bob
+"""
+API FastAPI para el Sistema de Análisis de Importaciones
+Agente de Inteligencia Aduanera
+"""
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
+import csv
+import io
+import itertools
+import multiprocessing
+import orjson
+import pandas as pd
+import threading
+import time
+from datetime import datetime
+
+from core import CacheTTL, RespuestaJSON, SnapshotDatos, TiemposPorRuta, VueloUnico, a_json, cronometro, duracion_server_timing
+from core.perfilado import perfilable, perfiles
+from core.metricas import (
+    DURACION_MODULO,
+    DURACION_SERIALIZACION,
+    DURACION_SOLICITUD,
+    metricas
+)
+from core import config
+from models import ConsultaFactura, OperacionLote, Pedimento, SimulacionUmbrales
+from modules import (
+    AnalizadorHistorial,
+    AnalizadorValor,
+    GestorAlertas,
+    GeneradorChecklist,
+    CruceRetroactivo,
+    BacktestCanal
+)
+from modules import reglas
+from modules.peso_unitario import EstadisticasPeso
+from modules.red_proveedores import RedProveedores
+from modules.reglas import CANAL_RECOMENDADO, RIESGO_GLOBAL
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    """Construye los módulos en segundo plano mientras el servidor ya atiende solicitudes"""
+    if config.PRECALENTAR:
+        threading.Thread(target=componentes.calentar, name="precalentamiento", daemon=True).start()
+    yield
+
+
+# Inicializar FastAPI
+app = FastAPI(
+    title="Sistema de Análisis de Importaciones",
+    description="Agente de inteligencia aduanera para análisis de operaciones de importación",
+    version="1.0.0",
+    default_response_class=RespuestaJSON,
+    lifespan=ciclo_de_vida
+)
+
+# Configurar CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Tiempo total y de serialización por ruta
+tiempos_rutas = TiemposPorRuta()
+
+
+@app.middleware("http")
+async def medir_ruta(request: Request, call_next):
+    """Registra el tiempo de cada solicitud y su serialización por ruta"""
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    
+    ruta = request.scope.get("route")
+    if ruta is not None:
+        total_ms = (time.perf_counter() - inicio) * 1000
+        serializacion_ms = duracion_server_timing(response.headers.get("server-timing"), "serializacion")
+        
+        tiempos_rutas.registrar(f"{request.method} {ruta.path}", total_ms, serializacion_ms)
+        DURACION_SOLICITUD.observar(total_ms / 1000, request.method, ruta.path)
+        if serializacion_ms is not None:
+            DURACION_SERIALIZACION.observar(serializacion_ms / 1000, request.method, ruta.path)
+    return response
+
+
+class Componentes:
+    """
+    Módulos construidos sobre un mismo snapshot de datos
+    
+    Cada módulo se construye la primera vez que se usa (y lee sólo las
+    tablas que necesita), de modo que el servidor responde /health antes de
+    tener todos los datos cargados. calentar() construye los que falten.
+    """
+    
+    MODULOS = {
+        "red_proveedores": RedProveedores.desde_snapshot,
+        "peso_unitario": EstadisticasPeso.desde_snapshot,
+        "historial": AnalizadorHistorial,
+        "valor": AnalizadorValor,
+        "alertas": GestorAlertas,
+        "checklist": GeneradorChecklist,
+        "cruce": CruceRetroactivo,
+        "backtest": BacktestCanal
+    }
+    
+    # Módulos que se construyen a partir de otros en lugar del snapshot
+    DEPENDENCIAS = {
+        "backtest": ("historial", "valor", "alertas", "checklist")
+    }
+    
+    # Componentes compartidos que reciben, además del snapshot, los módulos indicados
+    COMPARTIDOS = {
+        "historial": ("red_proveedores", "peso_unitario"),
+        "valor": ("peso_unitario",),
+        "alertas": ("red_proveedores",)
+    }
+    
+    def __init__(self, snapshot: SnapshotDatos):
+        self.snapshot = snapshot
+        self._instancias: Dict[str, object] = {}
+        self._locks = {nombre: threading.Lock() for nombre in self.MODULOS}
+        self._errores: Dict[str, str] = {}
+        self.tiempos_inicio_ms: Dict[str, float] = {}
+    
+    def obtener(self, nombre: str):
+        """Instancia del módulo, construyéndola si es la primera vez"""
+        instancia = self._instancias.get(nombre)
+        if instancia is None:
+            with self._locks[nombre]:
+                if nombre not in self._instancias:
+                    inicio = time.perf_counter()
+                    try:
+                        if nombre in self.DEPENDENCIAS:
+                            instancia = self.MODULOS[nombre](*(self.obtener(d) for d in self.DEPENDENCIAS[nombre]))
+                        else:
+                            compartidos = {c: self.obtener(c) for c in self.COMPARTIDOS.get(nombre, ())}
+                            instancia = self.MODULOS[nombre](snapshot=self.snapshot, **compartidos)
+                        self._instancias[nombre] = instancia
+                    except Exception as e:
+                        # No se guarda el fallo: la siguiente solicitud lo reintenta
+                        self._errores[nombre] = f"{type(e).__name__}: {e}"
+                        raise
+                    self._errores.pop(nombre, None)
+                    self.tiempos_inicio_ms[nombre] = round((time.perf_counter() - inicio) * 1000, 2)
+            instancia = self._instancias[nombre]
+        return instancia
+    
+    @property
+    def red_proveedores(self) -> RedProveedores:
+        return self.obtener("red_proveedores")
+    
+    @property
+    def peso_unitario(self) -> EstadisticasPeso:
+        return self.obtener("peso_unitario")
+    
+    @property
+    def historial(self) -> AnalizadorHistorial:
+        return self.obtener("historial")
+    
+    @property
+    def valor(self) -> AnalizadorValor:
+        return self.obtener("valor")
+    
+    @property
+    def alertas(self) -> GestorAlertas:
+        return self.obtener("alertas")
+    
+    @property
+    def checklist(self) -> GeneradorChecklist:
+        return self.obtener("checklist")
+    
+    @property
+    def cruce(self) -> CruceRetroactivo:
+        return self.obtener("cruce")
+    
+    @property
+    def backtest(self) -> BacktestCanal:
+        return self.obtener("backtest")
+    
+    def calentar(self):
+        """Carga todas las tablas y construye los módulos pendientes"""
+        self.snapshot.precargar()
+        for nombre in self.MODULOS:
+            try:
+                self.obtener(nombre)
+            except Exception:
+                pass  # Queda reportado como ERROR en /health
+    
+    def estados(self) -> Dict[str, str]:
+        """Estado de cada módulo: OK, CARGANDO, PENDIENTE o ERROR"""
+        estados = {}
+        for nombre, lock in self._locks.items():
+            if nombre in self._instancias:
+                estados[nombre] = "OK"
+            elif lock.locked():
+                estados[nombre] = "CARGANDO"
+            elif nombre in self._errores:
+                estados[nombre] = "ERROR"
+            else:
+                estados[nombre] = "PENDIENTE"
+        return estados
+    
+    def errores(self) -> Dict[str, str]:
+        """Último error de construcción de los módulos que fallaron"""
+        return dict(self._errores)
+
+
+# Inicializar módulos: los datos se cargan al primer uso de cada módulo (o
+# por el precalentamiento al arrancar) y se comparten entre ellos.
+# Una recarga reemplaza la referencia completa, por lo que cada solicitud
+# que la toma al inicio ve una versión consistente de todos los módulos.
+componentes = Componentes(SnapshotDatos())
+_lock_recarga = threading.Lock()
+
+# Pool de hilos para ejecutar módulos independientes de forma concurrente
+ejecutor_modulos = ThreadPoolExecutor(max_workers=8, thread_name_prefix="modulo")
+
+# Cache de análisis completos (se invalida al cambiar la versión del snapshot de datos)
+cache_analisis = CacheTTL(config.CACHE_TAMANO_MAXIMO, config.CACHE_TTL_SEGUNDOS)
+# Campos del análisis que describen su cálculo (se reemplazan al reutilizarlo)
+CAMPOS_CALCULO = ("timestamp", "tiempo_procesamiento_ms", "modo_ejecucion", "tiempos_modulos_ms")
+
+# Consultas idénticas simultáneas comparten un solo cálculo en curso
+vuelos_analisis = VueloUnico()
+vuelos_importador = VueloUnico()
+
+# Pool de procesos para análisis por lotes (se crea en la primera solicitud)
+_pool_lote: Optional[ProcessPoolExecutor] = None
+_lock_pool_lote = threading.Lock()
+
+
+# ============================================================================
+# ENDPOINTS PRINCIPALES
+# ============================================================================
+
+@app.get("/")
+def root():
+    """Endpoint raíz con información del sistema"""
+    return {
+        "sistema": "Agente de Análisis de Importaciones",
+        "version": "1.0.0",
+        "modulos": [
+            "Módulo 1: Historial del Importador",
+            "Módulo 2: Valor de Referencia Internacional",
+            "Módulo 3: Alertas Activas de Inteligencia",
+            "Módulo 4: Checklist Regulatorio Personalizado"
+        ],
+        "endpoints": {
+            "analisis_completo": "/api/analisis/completo",
+            "analisis_lote": "/api/analisis/lote",
+            "historial": "/api/importador/{rfc}",
+            "valor": "/api/valor/analizar",
+            "alertas": "/api/alertas/buscar",
+            "cruce_retroactivo": "/api/alertas/{id_alerta}/pedimentos-afectados",
+            "checklist": "/api/checklist/generar"
+        }
+    }
+
+
+@app.get("/api/analisis/completo")
+@perfilable
+def analisis_completo(
+    rfc: str = Query(..., description="RFC del importador"),
+    fraccion: str = Query(..., description="Fracción arancelaria"),
+    pais_origen: str = Query(..., description="País de origen"),
+    valor_unitario: float = Query(..., gt=0, description="Valor unitario en USD"),
+    cantidad: int = Query(1, gt=0, description="Cantidad de unidades"),
+    peso_bruto_kg: Optional[float] = Query(None, gt=0, description="Peso bruto en kg (compara el peso por unidad)"),
+    proveedor_id: Optional[str] = Query(None, description="ID del proveedor"),
+    modo: str = Query("secuencial", pattern="^(secuencial|concurrente)$",
+                      description="secuencial o concurrente (Módulos 1-3 en paralelo)"),
+    usar_cache: bool = Query(True, description="Reutilizar un análisis idéntico reciente")
+):
+    """
+    ANÁLISIS COMPLETO - Ejecuta los 4 módulos
+    
+    Este es el endpoint principal que un oficial aduanero usaría para
+    obtener un análisis completo de una operación de importación.
+    En modo concurrente los Módulos 1, 2 y 3 se ejecutan en paralelo y el
+    Módulo 4 espera únicamente al historial del importador.
+    """
+    inicio = time.time()
+    # El modo sólo cambia cómo se calcula, no el resultado: no forma parte de la llave
+    clave_cache = (
+        rfc, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg, proveedor_id,
+        componentes.snapshot.version
+    )
+    if usar_cache:
+        resultado = cache_analisis.obtener(clave_cache)
+        if resultado is not None:
+            return RespuestaJSON({
+                **_resultado_reutilizado(resultado, modo, inicio), "desde_cache": True, "resultado_compartido": False
+            })
+    
+    # Quien se suma a un cálculo en curso no lo repite en su modo: recibe el de la primera consulta
+    resultado, compartido = vuelos_analisis.ejecutar(
+        clave_cache, _analizar_operacion, clave_cache, modo
+    )
+    if compartido:
+        resultado = _resultado_reutilizado(resultado, modo, inicio)
+    return RespuestaJSON({**resultado, "desde_cache": False, "resultado_compartido": compartido})
+
+
+@app.post("/api/analisis/lote")
+async def analisis_lote(
+    request: Request,
+    formato: Optional[str] = Query(None, pattern="^(ndjson|csv)$",
+                                   description="ndjson o csv (por defecto según el Content-Type)")
+):
+    """
+    ANÁLISIS POR LOTES - Ejecuta los 4 módulos sobre un lote de operaciones
+    
+    Recibe NDJSON (un objeto por línea) o CSV con las columnas rfc, fraccion,
+    pais_origen, valor_unitario y, opcionalmente, cantidad, peso_bruto_kg,
+    proveedor_id y referencia. El lote se reparte en bloques entre un pool de procesos y los
+    resultados se devuelven en NDJSON conforme terminan cada bloque; cada
+    línea trae su "indice" en el lote y la última línea es el resumen.
+    """
+    if formato is None:
+        formato = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    cuerpo = await request.body()
+    renglones = await run_in_threadpool(_leer_lote, cuerpo, formato)
+    
+    if not renglones:
+        raise HTTPException(status_code=400, detail="El lote no contiene operaciones")
+    
+    return StreamingResponse(_transmitir_lote(renglones), media_type="application/x-ndjson")
+
+
+# ============================================================================
+# MÓDULO 1: HISTORIAL DEL IMPORTADOR
+# ============================================================================
+
+@app.get("/api/importador/{rfc}")
+@perfilable
+def consultar_importador(
+    rfc: str,
+    meses_historial: int = Query(24, ge=1, le=60)
+):
+    """Consulta el historial completo de un importador"""
+    resultado, _ = vuelos_importador.ejecutar(
+        (rfc, meses_historial, componentes.historial.version_datos),
+        componentes.historial.analizar_importador, rfc, meses_historial
+    )
+    
+    if not resultado.get("encontrado"):
+        raise HTTPException(status_code=404, detail=f"RFC {rfc} no encontrado")
+    
+    return RespuestaJSON(resultado)
+
+
+@app.get("/api/importador/{rfc}/operaciones")
+@perfilable
+def historial_operaciones(
+    rfc: str,
+    limite: int = Query(10, ge=1, description="Máximo 100 en JSON; sin tope en NDJSON"),
+    formato: str = Query("json", pattern="^(json|ndjson)$",
+                         description="json o ndjson (una operación por línea, transmitida)")
+):
+    """Obtiene las últimas operaciones del importador"""
+    if formato == "ndjson":
+        operaciones = componentes.historial.iterar_historial_operaciones(rfc, limite)
+        primera = next(operaciones, None)
+        if primera is None:
+            raise HTTPException(status_code=404, detail=f"No se encontraron operaciones para RFC {rfc}")
+        return _respuesta_ndjson(itertools.chain([primera], operaciones))
+    
+    if limite > 100:
+        raise HTTPException(status_code=422, detail="El límite máximo en JSON es 100; use formato=ndjson")
+    
+    operaciones = componentes.historial.obtener_historial_operaciones(rfc, limite)
+    
+    if not operaciones:
+        raise HTTPException(status_code=404, detail=f"No se encontraron operaciones para RFC {rfc}")
+    
+    return RespuestaJSON({
+        "rfc": rfc,
+        "total_operaciones": len(operaciones),
+        "operaciones": operaciones
+    })
+
+
+@app.get("/api/importador/{rfc}/comparacion-sector")
+@perfilable
+def comparar_sector(rfc: str):
+    """Compara las métricas del importador con su sector"""
+    resultado = componentes.historial.comparar_con_promedio_sector(rfc)
+    
+    if "error" in resultado:
+        raise HTTPException(status_code=404, detail=resultado["error"])
+    
+    return RespuestaJSON(resultado)
+
+
+@app.get("/api/importadores/riesgo")
+@perfilable
+def importadores_por_perfil(
+    perfil: str = Query(..., pattern="^(VERDE|AMARILLO|ROJO)$", description="Perfil de riesgo"),
+    limite: int = Query(100, ge=1, le=1000)
+):
+    """Lista los importadores con un perfil de riesgo (de la tabla materializada, sin recorrer el padrón)"""
+    return RespuestaJSON(componentes.historial.listar_por_perfil(perfil, limite))
+
+
+@app.get("/api/importadores/riesgo/resumen")
+def resumen_riesgo_importadores():
+    """Importadores por perfil de riesgo y fecha de cálculo de la tabla"""
+    return componentes.historial.tabla_riesgo().resumen()
+
+
+@app.get("/api/pedimentos/fraccionamiento")
+def rafagas_fraccionamiento(
+    limite: int = Query(100, ge=1, le=1000, description="Máximo de ráfagas a devolver")
+):
+    """Ráfagas de pedimentos del mismo RFC, fracción y proveedor (posible fraccionamiento)"""
+    detector = componentes.historial.detector_fraccionamiento
+    return RespuestaJSON({
+        "resumen": detector.resumen(),
+        "rafagas": detector.listar(limite)
+    })
+
+
+@app.post("/api/pedimentos/ingesta")
+async def ingesta_pedimentos(
+    request: Request,
+    formato: Optional[str] = Query(None, pattern="^(ndjson|csv)$",
+                                   description="ndjson o csv (por defecto según el Content-Type)")
+):
+    """
+    Registra pedimentos nuevos en los análisis incrementales
+    
+    Recibe NDJSON o CSV con las columnas de pedimentos_historicos. Los
+    pedimentos válidos actualizan la detección de fraccionamiento sólo en
+    los grupos (RFC, fracción, proveedor) que tocan; los renglones inválidos
+    se reportan con su índice. Los pedimentos ingeridos se conservan en
+    memoria hasta la siguiente recarga de datos.
+    """
+    if formato is None:
+        formato = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    cuerpo = await request.body()
+    renglones = await run_in_threadpool(_leer_lote, cuerpo, formato)
+    
+    if not renglones:
+        raise HTTPException(status_code=400, detail="La ingesta no contiene pedimentos")
+    
+    return RespuestaJSON(await run_in_threadpool(_ingerir_pedimentos, renglones))
+
+
+# ============================================================================
+# MÓDULO 2: VALOR DE REFERENCIA
+# ============================================================================
+
+@app.get("/api/valor/analizar")
+@perfilable
+def analizar_valor(
+    fraccion: str = Query(..., description="Fracción arancelaria"),
+    pais_origen: str = Query(..., description="País de origen"),
+    valor_unitario: float = Query(..., gt=0, description="Valor unitario en USD"),
+    cantidad: int = Query(1, gt=0, description="Cantidad"),
+    peso_bruto_kg: Optional[float] = Query(None, gt=0, description="Peso bruto en kg (compara el peso por unidad)")
+):
+    """Analiza el valor declarado contra referencias de mercado"""
+    resultado = componentes.valor.analizar_valor(
+        fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg
+    )
+    return RespuestaJSON(resultado)
+
+
+@app.get("/api/valor/peso-unitario")
+def peso_unitario():
+    """Mediana y MAD del peso bruto por unidad de cada fracción (incluye pedimentos ingeridos)"""
+    return RespuestaJSON(componentes.peso_unitario.resumen())
+
+
+@app.get("/api/valor/estadisticas/{fraccion}")
+@perfilable
+def estadisticas_fraccion(fraccion: str):
+    """Obtiene estadísticas de precios para una fracción"""
+    resultado = componentes.valor.obtener_estadisticas_fraccion(fraccion)
+    
+    if not resultado.get("encontrado"):
+        raise HTTPException(status_code=404, detail=f"No hay datos para fracción {fraccion}")
+    
+    return RespuestaJSON(resultado)
+
+
+# ============================================================================
+# MÓDULO 3: ALERTAS DE INTELIGENCIA
+# ============================================================================
+
+@app.get("/api/alertas/vigentes")
+@perfilable
+def alertas_vigentes(
+    tipo: Optional[str] = Query(None, description="Tipo de alerta (TRI, SUB, etc.)"),
+    criticidad: Optional[str] = Query(None, description="Nivel de criticidad"),
+    formato: str = Query("json", pattern="^(json|ndjson)$",
+                         description="json o ndjson (una alerta por línea, transmitida)")
+):
+    """Obtiene todas las alertas vigentes"""
+    filtro = {}
+    if tipo:
+        filtro["tipo"] = tipo
+    if criticidad:
+        filtro["criticidad"] = criticidad
+    
+    if formato == "ndjson":
+        return _respuesta_ndjson(componentes.alertas.iterar_alertas_vigentes(filtro))
+    
+    alertas = componentes.alertas.obtener_alertas_vigentes(filtro)
+    
+    return RespuestaJSON({
+        "total": len(alertas),
+        "alertas": alertas
+    })
+
+
+@app.get("/api/alertas/buscar")
+@perfilable
+def buscar_alertas(
+    fraccion: str = Query(..., description="Fracción arancelaria"),
+    pais_origen: str = Query(..., description="País de origen"),
+    proveedor_id: Optional[str] = Query(None, description="ID del proveedor")
+):
+    """Busca alertas relevantes para una operación específica"""
+    resultado = componentes.alertas.buscar_alertas_para_operacion(
+        fraccion, pais_origen, proveedor_id
+    )
+    return RespuestaJSON(resultado)
+
+
+@app.get("/api/alertas/estadisticas")
+def estadisticas_alertas():
+    """Obtiene estadísticas generales de alertas"""
+    return componentes.alertas.obtener_estadisticas_alertas()
+
+
+@app.get("/api/alertas/modus-operandi")
+def modus_operandi(
+    tipo: Optional[str] = Query(None, description="Tipo de alerta")
+):
+    """Obtiene los modus operandi más frecuentes"""
+    return {
+        "modus_operandi": componentes.alertas.obtener_modus_operandi_frecuentes(tipo)
+    }
+
+
+@app.get("/api/alertas/cruce")
+def cruce_alertas_vigentes(
+    solo_vigentes: bool = Query(True, description="Cruzar sólo alertas vigentes")
+):
+    """
+    Cruza todas las alertas contra el historial
+    
+    Responde en NDJSON, una alerta por línea, conforme termina cada cruce.
+    """
+    return _respuesta_ndjson(componentes.cruce.iterar_cruce(solo_vigentes=solo_vigentes))
+
+
+@app.get("/api/alertas/{id_alerta}/pedimentos-afectados")
+@perfilable
+def pedimentos_afectados(id_alerta: str):
+    """
+    Cruza una alerta contra el historial y devuelve los RFCs y pedimentos afectados
+    
+    Un pedimento está afectado si coincide con la fracción de la alerta (o
+    es más específico), su país de origen o su proveedor, igual que en
+    /api/alertas/buscar.
+    """
+    resultado = componentes.cruce.cruzar_alertas([id_alerta])
+    
+    if not resultado:
+        raise HTTPException(status_code=404, detail=f"Alerta {id_alerta} no encontrada")
+    
+    return RespuestaJSON(resultado[0])
+
+
+@app.get("/api/triangulacion/resumen")
+def resumen_triangulacion(
+    limite: int = Query(10, ge=1, le=100, description="Rutas trianguladas a mostrar")
+):
+    """Tamaño del grafo de flujos y rutas trianguladas con más pedimentos"""
+    return RespuestaJSON(componentes.alertas.grafo_triangulacion.resumen(limite))
+
+
+@app.get("/api/triangulacion/rutas")
+@perfilable
+def rutas_triangulacion(
+    pais_origen: str = Query(..., description="País de origen declarado")
+):
+    """Países de procedencia de la mercancía de un origen en el historial"""
+    rutas = componentes.alertas.grafo_triangulacion.rutas(pais_origen)
+    return RespuestaJSON({
+        "pais_origen": pais_origen,
+        "total_pedimentos": sum(r["pedimentos"] for r in rutas),
+        "rutas": rutas
+    })
+
+
+@app.get("/api/triangulacion/importadores")
+@perfilable
+def importadores_triangulacion(
+    pais_origen: str = Query(..., description="País de origen declarado"),
+    pais_procedencia: Optional[str] = Query(None, description="Sólo esta procedencia (default: cualquier tercer país)"),
+    limite: int = Query(100, ge=1, le=1000, description="Máximo de importadores")
+):
+    """Importadores que reciben mercancía de un origen a través de terceros países"""
+    resultado = componentes.alertas.grafo_triangulacion.importadores(
+        pais_origen, pais_procedencia, limite
+    )
+    return RespuestaJSON({
+        "pais_origen": pais_origen,
+        "pais_procedencia": pais_procedencia,
+        "total": resultado["total"],
+        "mostrados": len(resultado["importadores"]),
+        "importadores": resultado["importadores"]
+    })
+
+
+@app.get("/api/importador/{rfc}/triangulacion")
+@perfilable
+def triangulacion_importador(
+    rfc: str,
+    pais_origen: Optional[str] = Query(None, description="Sólo este país de origen")
+):
+    """Rutas del importador en las que la procedencia es distinta del origen"""
+    grafo = componentes.alertas.grafo_triangulacion
+    if rfc not in grafo.rfcs:
+        raise HTTPException(status_code=404, detail=f"No se encontraron operaciones para RFC {rfc}")
+    rutas = grafo.por_rfc(rfc, pais_origen)
+    return RespuestaJSON({
+        "rfc": rfc,
+        "total_pedimentos": sum(r["pedimentos"] for r in rutas),
+        "rutas": rutas
+    })
+
+
+@app.get("/api/proveedores/contagio")
+@perfilable
+def contagio_proveedores(
+    proveedor: Optional[List[str]] = Query(None, description="ID de proveedor (se puede repetir; default: lista negra y relacionados con sancionados)"),
+    saltos: int = Query(1, ge=1, le=5, description="Distancia máxima en la red (1 = clientes directos)")
+):
+    """Importadores conectados a proveedores de riesgo en la red importador–proveedor"""
+    return RespuestaJSON(componentes.red_proveedores.contagio(proveedor, saltos))
+
+
+@app.get("/api/proveedores/red/resumen")
+def resumen_red_proveedores():
+    """Tamaño de la red importador–proveedor e importadores por distancia a proveedores de riesgo"""
+    return RespuestaJSON(componentes.red_proveedores.resumen())
+
+
+# ============================================================================
+# MÓDULO 4: CHECKLIST REGULATORIO
+# ============================================================================
+
+@app.get("/api/checklist/generar")
+@perfilable
+def generar_checklist(
+    fraccion: str = Query(..., description="Fracción arancelaria"),
+    pais_origen: str = Query(..., description="País de origen"),
+    tipo_importador: str = Query("regular", description="Tipo de importador"),
+    primera_importacion: bool = Query(False, description="¿Primera importación de esta fracción?")
+):
+    """Genera checklist regulatorio personalizado"""
+    resultado = componentes.checklist.generar_checklist(
+        fraccion, pais_origen, tipo_importador, primera_importacion
+    )
+    return RespuestaJSON(resultado)
+
+
+@app.get("/api/checklist/noms/{fraccion}")
+@perfilable
+def verificar_noms(fraccion: str):
+    """Verifica las NOMs aplicables a una fracción"""
+    resultado = componentes.checklist.verificar_cumplimiento_noms(fraccion)
+    
+    if not resultado.get("encontrado"):
+        raise HTTPException(status_code=404, detail=f"No hay información para fracción {fraccion}")
+    
+    return resultado
+
+
+@app.get("/api/checklist/consulta")
+@perfilable
+def consultar_regulaciones(
+    expresion: str = Query(..., description="Expresión AND/OR/NOT sobre banderas, ej. COFEPRIS AND SENASICA AND NOT SEDENA")
+):
+    """Filtra fracciones por combinación de banderas regulatorias (COFEPRIS, SEDENA, NOMs, etc.)"""
+    resultado = componentes.checklist.consultar_regulaciones(expresion)
+    
+    if "error" in resultado:
+        raise HTTPException(status_code=400, detail=resultado)
+    
+    return resultado
+
+
+@app.get("/api/checklist/tratados/{pais}")
+def consultar_tratados(pais: str):
+    """Consulta tratados comerciales aplicables con un país"""
+    return componentes.checklist.obtener_tratados_comerciales(pais)
+
+
+@app.post("/api/checklist/tratados/factura")
+def evaluar_tratados_factura(consulta: ConsultaFactura):
+    """Evalúa la elegibilidad a trato preferencial de todas las partidas de una factura"""
+    partidas = [
+        {
+            "fraccion": p.fraccion_arancelaria,
+            "pais_origen": p.pais_origen,
+            "valor_usd": p.valor_usd
+        }
+        for p in consulta.partidas
+    ]
+    return componentes.checklist.evaluar_tratados_factura(partidas)
+
+
+# ============================================================================
+# SIMULACIÓN DE REGLAS
+# ============================================================================
+
+@app.post("/api/simulacion/umbrales")
+def simular_umbrales(simulacion: SimulacionUmbrales):
+    """
+    Simula umbrales alternos de las reglas de riesgo sobre todo el historial
+    
+    Reevalúa el perfil del importador, el riesgo del valor, el riesgo por
+    alertas, el riesgo global y el canal recomendado de cada pedimento
+    histórico con los umbrales indicados (ver /api/sistema/reglas) y devuelve
+    el cambio en la distribución de canales respecto a las reglas vigentes.
+    """
+    declarados = reglas.umbrales()
+    desconocidos = sorted(set(simulacion.umbrales) - set(declarados))
+    if desconocidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Umbrales desconocidos: {', '.join(desconocidos)}. Disponibles: {', '.join(declarados)}"
+        )
+    return RespuestaJSON(componentes.backtest.simular(simulacion.umbrales))
+
+
+# ============================================================================
+# FUNCIONES AUXILIARES
+# ============================================================================
+
+def _analizar_operacion(clave: Tuple, modo: str) -> Dict:
+    """
+    Ejecuta el análisis completo de una operación y lo guarda en cache
+    
+    Args:
+        clave: (rfc, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg,
+                proveedor_id, versiones)
+        modo: secuencial o concurrente
+    """
+    rfc, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg, proveedor_id, _ = clave
+    resultado = _componer_analisis(
+        rfc, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg, proveedor_id, modo
+    )
+    cache_analisis.guardar(clave, resultado)
+    return resultado
+
+
+def _resultado_reutilizado(resultado: Dict, modo: str, inicio: float) -> Dict:
+    """
+    Análisis ya calculado con los campos de la consulta actual
+    
+    timestamp, tiempo_procesamiento_ms y modo_ejecucion corresponden a esta
+    consulta y tiempos_modulos_ms queda vacío (no se ejecutó ningún módulo);
+    los valores del cálculo original se conservan en "calculo_original".
+    """
+    return {
+        **resultado,
+        "timestamp": datetime.now().isoformat(),
+        "tiempo_procesamiento_ms": round((time.time() - inicio) * 1000, 2),
+        "modo_ejecucion": modo,
+        "tiempos_modulos_ms": {},
+        "calculo_original": {campo: resultado[campo] for campo in CAMPOS_CALCULO}
+    }
+
+
+def _componer_analisis(rfc: str, fraccion: str, pais_origen: str, valor_unitario: float,
+                       cantidad: int, peso_bruto_kg: Optional[float], proveedor_id: Optional[str],
+                       modo: str) -> Dict:
+    """
+    Ejecuta los 4 módulos y arma la respuesta del análisis completo
+    
+    Raises:
+        HTTPException: 404 si el RFC no existe, 500 ante cualquier otro error
+    """
+    inicio = time.time()
+    etapas = cronometro("analisis_completo")
+    
+    try:
+        modulos = _ejecutar_modulos(
+            rfc, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg,
+            proveedor_id, concurrente=(modo == "concurrente")
+        )
+        etapas.marcar("modulos")
+        
+        if modulos is None:
+            raise HTTPException(status_code=404, detail=f"RFC {rfc} no encontrado")
+        
+        historial, analisis_valor, alertas, checklist, tiempos = modulos
+        
+        # Determinar nivel de riesgo global
+        nivel_riesgo_global = _determinar_riesgo_global(
+            historial, analisis_valor, alertas
+        )
+        
+        # Recomendar canal
+        canal_recomendado = _recomendar_canal(
+            nivel_riesgo_global, historial, analisis_valor, alertas, checklist
+        )
+        
+        # Generar acciones inmediatas
+        acciones = _generar_acciones_inmediatas(
+            historial, analisis_valor, alertas, checklist
+        )
+        etapas.marcar("resumen")
+        
+        tiempo_procesamiento = (time.time() - inicio) * 1000
+        
+        resultado = {
+            "timestamp": datetime.now().isoformat(),
+            "tiempo_procesamiento_ms": round(tiempo_procesamiento, 2),
+            "modo_ejecucion": modo,
+            "tiempos_modulos_ms": tiempos,
+            "rfc_importador": rfc,
+            "fraccion_arancelaria": fraccion,
+            "pais_origen": pais_origen,
+            
+            # Resultados de los 4 módulos
+            "modulo1_historial": historial,
+            "modulo2_valor": analisis_valor,
+            "modulo3_alertas": alertas,
+            "modulo4_checklist": checklist,
+            
+            # Resumen ejecutivo
+            "resumen_ejecutivo": {
+                "nivel_riesgo_global": nivel_riesgo_global,
+                "canal_recomendado": canal_recomendado,
+                "perfil_importador": historial.get("perfil_riesgo"),
+                "riesgo_valor": analisis_valor.get("nivel_riesgo"),
+                "alertas_criticas": sum(1 for a in alertas.get("alertas", []) if a.get("nivel_criticidad") == "CRITICO"),
+                "documentos_faltantes": checklist.get("documentos_faltantes", 0),
+                "acciones_inmediatas": acciones
+            }
+        }
+        etapas.marcar("formateo")
+        
+        return resultado
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en análisis: {str(e)}")
+
+
+def _obtener_pool_lote() -> ProcessPoolExecutor:
+    """
+    Pool de procesos para análisis por lotes
+    
+    Se crea en la primera solicitud, tras cargar todos los datos: con fork los
+    procesos heredan los analizadores construidos (copy-on-write) sin volver a
+    leer los CSV. Donde no hay fork (Windows) cada proceso importa la
+    aplicación y carga su propia copia.
+    """
+    global _pool_lote
+    with _lock_pool_lote:
+        if _pool_lote is None:
+            # Los procesos deben heredar los módulos ya construidos (y ningún lock de carga tomado)
+            componentes.calentar()
+            metodo = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            _pool_lote = ProcessPoolExecutor(
+                max_workers=config.LOTE_PROCESOS,
+                mp_context=multiprocessing.get_context(metodo)
+            )
+        return _pool_lote
+
+
+def _descartar_pool_lote():
+    """
+    Cierra el pool de lotes para que el siguiente lote lo cree de nuevo
+    
+    Los procesos heredaron los datos del momento en que se crearon; los lotes
+    en curso terminan con ellos.
+    """
+    global _pool_lote
+    with _lock_pool_lote:
+        if _pool_lote is not None:
+            _pool_lote.shutdown(wait=False)
+            _pool_lote = None
+
+
+def _leer_lote(cuerpo: bytes, formato: str) -> List:
+    """
+    Convierte el cuerpo de un lote en renglones
+    
+    Returns:
+        Lista de diccionarios; un renglón NDJSON ilegible se conserva como
+        el texto del error para reportarlo en su posición
+    """
+    texto = cuerpo.decode("utf-8-sig")
+    
+    if formato == "csv":
+        return [
+            {columna: valor for columna, valor in fila.items() if columna is not None and valor not in (None, "")}
+            for fila in csv.DictReader(io.StringIO(texto))
+        ]
+    
+    renglones = []
+    for linea in texto.splitlines():
+        if not linea.strip():
+            continue
+        try:
+            renglones.append(orjson.loads(linea))
+        except orjson.JSONDecodeError as e:
+            renglones.append(f"JSON inválido: {e.msg}")
+    return renglones
+
+
+def _transmitir_lote(renglones: List) -> Iterator[bytes]:
+    """Reparte el lote en bloques entre el pool y emite cada bloque al terminar"""
+    inicio = time.time()
+    pool = _obtener_pool_lote()
+    tamano = config.LOTE_TAMANO_BLOQUE
+    
+    futuros = [
+        pool.submit(_analizar_bloque, desde, renglones[desde:desde + tamano])
+        for desde in range(0, len(renglones), tamano)
+    ]
+    
+    correctos = 0
+    errores = 0
+    try:
+        for futuro in as_completed(futuros):
+            lineas, ok, fallidos = futuro.result()
+            correctos += ok
+            errores += fallidos
+            yield lineas
+    finally:
+        # Si el cliente se desconecta, no seguir procesando bloques pendientes
+        for futuro in futuros:
+            futuro.cancel()
+    
+    yield a_json({
+        "resumen": {
+            "total_operaciones": len(renglones),
+            "correctas": correctos,
+            "con_error": errores,
+            "bloques": len(futuros),
+            "procesos": config.LOTE_PROCESOS,
+            "tiempo_procesamiento_ms": round((time.time() - inicio) * 1000, 2)
+        }
+    }) + b"\n"
+
+
+def _analizar_bloque(desde: int, renglones: List) -> Tuple[bytes, int, int]:
+    """
+    Analiza un bloque de renglones dentro de un proceso del pool
+    
+    El análisis es secuencial: el pool de hilos del proceso padre no existe
+    en los procesos hijos.
+    
+    Returns:
+        (líneas NDJSON del bloque, renglones correctos, renglones con error)
+    """
+    lineas = []
+    correctos = 0
+    
+    for indice, registro in enumerate(renglones, start=desde):
+        referencia = registro.get("referencia") if isinstance(registro, dict) else None
+        try:
+            if isinstance(registro, str):
+                raise HTTPException(status_code=400, detail=registro)
+            
+            operacion = OperacionLote.model_validate(registro)
+            resultado = _componer_analisis(
+                operacion.rfc, operacion.fraccion, operacion.pais_origen,
+                operacion.valor_unitario, operacion.cantidad, operacion.peso_bruto_kg,
+                operacion.proveedor_id, "secuencial"
+            )
+            linea = {"indice": indice, "referencia": referencia, "estado": "ok", "resultado": resultado}
+            correctos += 1
+        except ValidationError as e:
+            linea = {"indice": indice, "referencia": referencia, "estado": "error", "codigo": 422,
+                     "error": _detalle_validacion(e)}
+        except HTTPException as e:
+            linea = {"indice": indice, "referencia": referencia, "estado": "error", "codigo": e.status_code, "error": e.detail}
+        
+        lineas.append(a_json(linea))
+    
+    return b"\n".join(lineas) + b"\n", correctos, len(renglones) - correctos
+
+
+def _detalle_validacion(error: ValidationError) -> str:
+    """Errores de validación de un renglón en una sola línea (campo: mensaje)"""
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _ingerir_pedimentos(renglones: List) -> Dict:
+    """Valida los renglones y registra los válidos en el historial"""
+    inicio = time.time()
+    validos = []
+    errores = []
+    
+    for indice, registro in enumerate(renglones):
+        if isinstance(registro, str):
+            errores.append({"indice": indice, "error": registro})
+            continue
+        try:
+            validos.append(Pedimento.model_validate(registro).model_dump(mode="json"))
+        except ValidationError as e:
+            errores.append({"indice": indice, "error": _detalle_validacion(e)})
+    
+    resultado = {"agregados": 0, "duplicados": 0, "grupos_actualizados": 0, "rafagas": [],
+                 "peso_por_unidad": {"fracciones_actualizadas": [], "pesos_atipicos": []}}
+    if validos:
+        pedimentos = pd.DataFrame(validos)
+        resultado = componentes.historial.ingerir_pedimentos(pedimentos)
+        # Los análisis en cache y los procesos de lote no incluyen los pedimentos nuevos
+        cache_analisis.limpiar()
+        _descartar_pool_lote()
+    
+    return {
+        "recibidos": len(renglones),
+        "validos": len(validos),
+        "con_error": len(errores),
+        "errores": errores,
+        **resultado,
+        "tiempo_procesamiento_ms": round((time.time() - inicio) * 1000, 2)
+    }
+
+
+def _respuesta_ndjson(registros: Iterable[Dict]) -> StreamingResponse:
+    """Respuesta NDJSON que serializa cada registro conforme se genera"""
+    def lineas():
+        for registro in registros:
+            yield a_json(registro) + b"\n"
+    
+    return StreamingResponse(lineas(), media_type="application/x-ndjson")
+
+
+
+def _medir(funcion, *args) -> Tuple[Dict, float]:
+    """Ejecuta un módulo y devuelve su resultado junto con el tiempo en ms"""
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def _ejecutar_modulos(rfc: str, fraccion: str, pais_origen: str, valor_unitario: float,
+                      cantidad: int, peso_bruto_kg: Optional[float], proveedor_id: Optional[str],
+                      concurrente: bool = False) -> Optional[Tuple[Dict, Dict, Dict, Dict, Dict]]:
+    """
+    Ejecuta los 4 módulos para una operación
+    
+    Returns:
+        (historial, valor, alertas, checklist, tiempos_ms) o None si el RFC no existe
+    """
+    modulos = componentes
+    
+    if concurrente:
+        # Módulos 2 y 3 no dependen del historial: se lanzan junto con el Módulo 1
+        futuro_historial = ejecutor_modulos.submit(
+            _medir, modulos.historial.analizar_importador, rfc
+        )
+        futuro_valor = ejecutor_modulos.submit(
+            _medir, modulos.valor.analizar_valor,
+            fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg
+        )
+        futuro_alertas = ejecutor_modulos.submit(
+            _medir, modulos.alertas.buscar_alertas_para_operacion, fraccion, pais_origen, proveedor_id
+        )
+        historial, tiempo_historial = futuro_historial.result()
+    else:
+        historial, tiempo_historial = _medir(modulos.historial.analizar_importador, rfc)
+    
+    if not historial.get("encontrado"):
+        return None
+    
+    if concurrente:
+        analisis_valor, tiempo_valor = futuro_valor.result()
+        alertas, tiempo_alertas = futuro_alertas.result()
+    else:
+        analisis_valor, tiempo_valor = _medir(
+            modulos.valor.analizar_valor, fraccion, pais_origen, valor_unitario, cantidad, peso_bruto_kg
+        )
+        alertas, tiempo_alertas = _medir(
+            modulos.alertas.buscar_alertas_para_operacion, fraccion, pais_origen, proveedor_id
+        )
+    
+    # MÓDULO 4: depende del tipo de importador calculado en el Módulo 1
+    tipo_importador = "nuevo" if historial.get("anios_activo", 0) < 1 else "regular"
+    primera_importacion = not modulos.historial.importo_fraccion(rfc, fraccion)
+    
+    checklist, tiempo_checklist = _medir(
+        modulos.checklist.generar_checklist,
+        fraccion, pais_origen, tipo_importador, primera_importacion
+    )
+    
+    tiempos = {
+        "modulo1_historial": tiempo_historial,
+        "modulo2_valor": tiempo_valor,
+        "modulo3_alertas": tiempo_alertas,
+        "modulo4_checklist": tiempo_checklist
+    }
+    for modulo, tiempo_ms in tiempos.items():
+        DURACION_MODULO.observar(tiempo_ms / 1000, modulo)
+    
+    return historial, analisis_valor, alertas, checklist, tiempos
+
+
+def _determinar_riesgo_global(historial: dict, valor: dict, alertas: dict) -> str:
+    """Determina el nivel de riesgo global de la operación (reglas.RIESGO_GLOBAL)"""
+    return RIESGO_GLOBAL.evaluar({
+        "perfil_riesgo": historial.get("perfil_riesgo"),
+        "nivel_riesgo_valor": valor.get("nivel_riesgo"),
+        "nivel_riesgo_alertas": alertas.get("nivel_riesgo_global")
+    })
+
+
+def _recomendar_canal(riesgo_global: str, historial: dict, valor: dict, 
+                     alertas: dict, checklist: dict) -> str:
+    """Recomienda el canal de desaduanamiento (reglas.CANAL_RECOMENDADO)"""
+    return CANAL_RECOMENDADO.evaluar({
+        "riesgo_global": riesgo_global,
+        "alertas_criticas": sum(1 for a in alertas.get("alertas", [])
+                                if a.get("nivel_criticidad") == "CRITICO"),
+        "documentos_faltantes": checklist.get("documentos_faltantes", 0),
+        "perfil_riesgo": historial.get("perfil_riesgo"),
+        "nivel_riesgo_valor": valor.get("nivel_riesgo"),
+        "total_alertas": alertas.get("total_alertas", 0)
+    })
+
+
+def _generar_acciones_inmediatas(historial: dict, valor: dict, 
+                                alertas: dict, checklist: dict) -> list:
+    """Genera lista de acciones inmediatas requeridas"""
+    acciones = []
+    
+    # Acciones por historial
+    if historial.get("perfil_riesgo") == "ROJO":
+        acciones.append("Verificar antecedentes del importador")
+    
+    if historial.get("opinion_sat") == "NEGATIVA":
+        acciones.append("CRÍTICO: Opinión SAT negativa - Verificar situación fiscal")
+    
+    # Acciones por valor
+    if valor.get("nivel_riesgo") == "ROJO":
+        acciones.append("Solicitar documentación adicional de valor (contratos, pagos)")
+    
+    # Acciones por alertas
+    for alerta in alertas.get("alertas", [])[:3]:  # Top 3 alertas
+        if alerta.get("nivel_criticidad") in ["CRITICO", "ALTO"]:
+            acciones.append(f"Alerta {alerta.get('tipo')}: {alerta.get('accion_recomendada')}")
+    
+    # Acciones por checklist
+    if checklist.get("documentos_faltantes", 0) > 0:
+        acciones.append(f"Solicitar {checklist.get('documentos_faltantes')} documentos faltantes")
+    
+    return acciones[:5]  # Máximo 5 acciones
+
+
+# ============================================================================
+# SISTEMA
+# ============================================================================
+
+@app.get("/api/sistema/cache")
+def estadisticas_cache():
+    """Estadísticas del cache de análisis completos"""
+    return {
+        **cache_analisis.estadisticas(),
+        "version_datos": componentes.snapshot.version
+    }
+
+
+@app.get("/api/sistema/datos")
+def resumen_datos():
+    """Versión, fecha de carga y tamaño de las tablas del snapshot vigente"""
+    return componentes.snapshot.resumen()
+
+
+@app.post("/api/sistema/recargar")
+def recargar_datos():
+    """
+    Vuelve a cargar los datos y reemplaza los módulos de forma atómica
+    
+    Las solicitudes en curso terminan con el snapshot anterior. El cache no
+    se limpia: sus llaves incluyen la versión, así que las entradas viejas
+    dejan de usarse y expiran solas.
+    """
+    global componentes
+    
+    with _lock_recarga:
+        anterior = componentes.snapshot
+        inicio = time.perf_counter()
+        # Se construye completo antes del cambio para no pagar la carga en las solicitudes
+        nuevo = Componentes(SnapshotDatos(anterior.data_path))
+        nuevo.calentar()
+        if nuevo.errores():
+            raise HTTPException(status_code=500, detail={
+                "mensaje": "La recarga falló; se conservan los datos anteriores",
+                "errores": nuevo.errores()
+            })
+        componentes = nuevo
+        tiempo_ms = round((time.perf_counter() - inicio) * 1000, 2)
+        
+        # Los procesos de lote heredaron los datos anteriores: se recrean en la siguiente solicitud
+        _descartar_pool_lote()
+    
+    return {
+        "version_anterior": anterior.version,
+        "version_actual": nuevo.snapshot.version,
+        "cambio": anterior.version != nuevo.snapshot.version,
+        "tiempo_recarga_ms": tiempo_ms,
+        "tiempos_carga_ms": dict(nuevo.snapshot.tiempos_carga_ms)
+    }
+
+
+@app.get("/api/sistema/reglas")
+def consultar_reglas():
+    """Tablas de decisión de riesgo y canal, con los umbrales vigentes"""
+    return {
+        "tablas": {nombre: tabla.describir() for nombre, tabla in reglas.TABLAS_DECISION.items()},
+        "indicadores_importador": {nombre: str(expresion) for nombre, expresion in reglas.INDICADORES_IMPORTADOR.items()},
+        "umbrales": reglas.umbrales()
+    }
+
+
+@app.get("/api/sistema/rutas")
+def estadisticas_rutas():
+    """Tiempo promedio y máximo por ruta, incluyendo la serialización de la respuesta"""
+    return tiempos_rutas.estadisticas()
+
+
+@app.get("/api/sistema/perfiles/{id_perfil}")
+def consultar_perfil(id_perfil: str):
+    """Perfil de una solicitud ejecutada con ?profile=true"""
+    informe = perfiles.obtener(id_perfil)
+    
+    if informe is None:
+        raise HTTPException(status_code=404, detail=f"Perfil {id_perfil} no encontrado o expirado")
+    
+    return informe
+
+
+@app.get("/api/sistema/coalescencia")
+def estadisticas_coalescencia():
+    """Consultas idénticas que compartieron un cálculo en curso"""
+    return {
+        "analisis_completo": vuelos_analisis.estadisticas(),
+        "importador": vuelos_importador.estadisticas()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metricas_prometheus():
+    """Histogramas de latencia por módulo, etapa y ruta en formato de Prometheus"""
+    return PlainTextResponse(metricas.exponer(), media_type="text/plain; version=0.0.4")
+
+
+# ============================================================================
+# HEALTH CHECK
+# ============================================================================
+
+@app.get("/health")
+def health_check():
+    """Verifica el estado del sistema y la disponibilidad de cada módulo"""
+    estados = componentes.estados()
+    return {
+        "status": "healthy",
+        "listo": all(estado == "OK" for estado in estados.values()),
+        "timestamp": datetime.now().isoformat(),
+        "modulos": estados,
+        "errores": componentes.errores()
+    }
+
+
+@app.get("/health/listo")
+def readiness_check(
+    modulo: Optional[List[str]] = Query(None, description="Módulos requeridos (default: todos)")
+):
+    """
+    Disponibilidad para recibir tráfico (200) o no (503)
+    
+    Con ?modulo=historial&modulo=valor sólo se exigen esos módulos, para
+    enrutar tráfico a un módulo antes de que terminen de cargar los demás.
+    """
+    estados = componentes.estados()
+    requeridos = modulo or list(estados)
+    desconocidos = [nombre for nombre in requeridos if nombre not in estados]
+    if desconocidos:
+        raise HTTPException(status_code=404, detail=f"Módulos desconocidos: {', '.join(desconocidos)}")
+    
+    listo = all(estados[nombre] == "OK" for nombre in requeridos)
+    return RespuestaJSON(
+        {"listo": listo, "modulos": {nombre: estados[nombre] for nombre in requeridos}},
+        status_code=200 if listo else 503
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+# Made with Bob
@@ -1,36 +1,44 @@
-"""
-Módulo de modelos de datos
-"""
-from .schemas import (
-    Importador,
-    Pedimento,
-    PrecioReferencia,
-    AlertaInteligencia,
-    ProveedorExtranjero,
-    RegulacionFraccion,
-    TipoCambio,
-    AnalisisCompleto,
-    ConsultaPedimento,
-    ConsultaImportador,
-    ConsultaPrecio,
-    PerfilRiesgo,
-    CanalDesaduanamiento
-)
-
-__all__ = [
-    "Importador",
-    "Pedimento",
-    "PrecioReferencia",
-    "AlertaInteligencia",
-    "ProveedorExtranjero",
-    "RegulacionFraccion",
-    "TipoCambio",
-    "AnalisisCompleto",
-    "ConsultaPedimento",
-    "ConsultaImportador",
-    "ConsultaPrecio",
-    "PerfilRiesgo",
-    "CanalDesaduanamiento"
-]
-
-# Made with Bob
+"""
+Módulo de modelos de datos
+"""
+from .schemas import (
+    Importador,
+    Pedimento,
+    PrecioReferencia,
+    AlertaInteligencia,
+    ProveedorExtranjero,
+    RegulacionFraccion,
+    TipoCambio,
+    AnalisisCompleto,
+    ConsultaPedimento,
+    ConsultaImportador,
+    ConsultaPrecio,
+    PartidaFactura,
+    ConsultaFactura,
+    OperacionLote,
+    SimulacionUmbrales,
+    PerfilRiesgo,
+    CanalDesaduanamiento
+)
+
+__all__ = [
+    "Importador",
+    "Pedimento",
+    "PrecioReferencia",
+    "AlertaInteligencia",
+    "ProveedorExtranjero",
+    "RegulacionFraccion",
+    "TipoCambio",
+    "AnalisisCompleto",
+    "ConsultaPedimento",
+    "ConsultaImportador",
+    "ConsultaPrecio",
+    "PartidaFactura",
+    "ConsultaFactura",
+    "OperacionLote",
+    "SimulacionUmbrales",
+    "PerfilRiesgo",
+    "CanalDesaduanamiento"
+]
+
+# Made with Bob
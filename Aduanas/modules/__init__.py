@@ -1,16 +1,20 @@
-"""
-Módulos de análisis del sistema de importaciones
-"""
-from .modulo1_historial import AnalizadorHistorial
-from .modulo2_valor import AnalizadorValor
-from .modulo3_alertas import GestorAlertas
-from .modulo4_checklist import GeneradorChecklist
-
-__all__ = [
-    "AnalizadorHistorial",
-    "AnalizadorValor",
-    "GestorAlertas",
-    "GeneradorChecklist"
-]
-
-# Made with Bob
+"""
+Módulos de análisis del sistema de importaciones
+"""
+from .modulo1_historial import AnalizadorHistorial
+from .modulo2_valor import AnalizadorValor
+from .modulo3_alertas import GestorAlertas
+from .modulo4_checklist import GeneradorChecklist
+from .cruce_retroactivo import CruceRetroactivo
+from .backtest_canal import BacktestCanal
+
+__all__ = [
+    "AnalizadorHistorial",
+    "AnalizadorValor",
+    "GestorAlertas",
+    "GeneradorChecklist",
+    "CruceRetroactivo",
+    "BacktestCanal"
+]
+
+# Made with Bob
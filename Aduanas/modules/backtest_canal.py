@@ -0,0 +1,451 @@
+"""
+BACKTEST — Canal Recomendado vs. Resultados Históricos
+Reproduce el análisis completo sobre todo el historial de pedimentos y lo compara
+contra el canal asignado y el resultado del reconocimiento
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .modulo1_historial import AnalizadorHistorial
+from .modulo2_valor import AnalizadorValor
+from .modulo3_alertas import GestorAlertas
+from .modulo4_checklist import GeneradorChecklist
+from .riesgo_importadores import TablaRiesgoImportadores
+from .reglas import (
+    CANAL_RECOMENDADO, RIESGO_ALERTAS, RIESGO_GLOBAL, RIESGO_VALOR, Parametros
+)
+from . import reglas
+
+CANALES = ("VERDE", "AMARILLO", "ROJO")
+RESULTADOS = ("SIN_OBSERVACIONES", "CON_OBSERVACIONES", "EMBARGO")
+
+# Llave de la operación: lo que el análisis completo recibe además del RFC y el valor
+LLAVE = ["fraccion_arancelaria", "pais_origen", "proveedor_extranjero"]
+
+COLUMNAS_PEDIMENTO = ["rfc_importador", *LLAVE, "valor_declarado_usd", "cantidad",
+                      "canal_asignado", "resultado_reconocimiento"]
+
+
+class BacktestCanal:
+    """
+    Evalúa el canal que el análisis completo recomendaría para cada pedimento histórico
+    
+    Cada pedimento se trata como una consulta a /api/analisis/completo (RFC,
+    fracción, país de origen, valor unitario = valor declarado / cantidad y
+    proveedor) evaluada con los datos y las reglas vigentes. En lugar de
+    llamar a los módulos por pedimento, lo que cada módulo aporta a la
+    decisión se precalcula por llave distinta (fracción, país, proveedor) y se
+    une por columnas; el perfil, los niveles de riesgo y el canal se deciden
+    con las mismas tablas de modules.reglas que usa el análisis en línea.
+    
+    El historial se procesa en bloques repartidos entre procesos; cada bloque
+    devuelve sólo conteos, que se suman al final.
+    """
+    
+    def __init__(self, historial: AnalizadorHistorial, valor: AnalizadorValor,
+                 alertas: GestorAlertas, checklist: GeneradorChecklist):
+        self.pedimentos_df = historial.pedimentos_df[COLUMNAS_PEDIMENTO]
+        self._historial = historial
+        self.tabla_importadores = historial.tabla_riesgo()
+        self.version_datos = historial.version_datos
+        
+        llaves = self.pedimentos_df[LLAVE].drop_duplicates()
+        self.variables_por_llave = self._variables_por_llave(llaves, valor, alertas, checklist)
+        
+        # Tabla de riesgo con la que se calcularon las variables y la decisión vigente de
+        # todo el historial, para las simulaciones (se recalculan cuando cambia la tabla;
+        # dos simulaciones simultáneas pueden calcularlas ambas)
+        self._simulacion_base: Optional[Tuple[TablaRiesgoImportadores, pd.DataFrame, pd.DataFrame]] = None
+    
+    def __getstate__(self) -> Dict:
+        # Los procesos sin fork reciben la tabla de riesgo ya tomada, sin el historial
+        estado = self.__dict__.copy()
+        estado['_historial'] = None
+        estado['_simulacion_base'] = None
+        return estado
+    
+    def _actualizar_tabla_riesgo(self) -> TablaRiesgoImportadores:
+        """Toma la tabla de riesgo del día del historial (la recalcula al cambiar de día)"""
+        self.tabla_importadores = self._historial.tabla_riesgo()
+        return self.tabla_importadores
+    
+    @staticmethod
+    def _variables_por_llave(llaves: pd.DataFrame, valor: AnalizadorValor, alertas: GestorAlertas,
+                             checklist: GeneradorChecklist) -> pd.DataFrame:
+        """
+        Lo que los Módulos 2, 3 y 4 aportan a la decisión, por llave distinta
+        
+        Mismos criterios que analizar_valor (precio de referencia),
+        buscar_alertas_para_operacion (alertas vigentes por fracción o
+        ancestro, país y proveedor; estatus del proveedor) y generar_checklist
+        (documentos faltantes).
+        """
+        vigentes = alertas.alertas_df[alertas.alertas_df['vigente'] == True]
+        criticidad = dict(zip(vigentes['id_alerta'], vigentes['nivel_criticidad']))
+        por_fraccion = vigentes.groupby('fraccion_arancelaria')['id_alerta'].agg(set).to_dict()
+        por_pais = vigentes.groupby('pais_origen_afectado')['id_alerta'].agg(set).to_dict()
+        por_proveedor = vigentes.groupby('proveedor_extranjero_afectado')['id_alerta'].agg(set).to_dict()
+        
+        proveedores = alertas.proveedores_df.drop_duplicates('id_proveedor').set_index('id_proveedor')
+        proveedor_riesgo = (
+            (proveedores['nivel_confianza'] == 'LISTA_NEGRA') |
+            proveedores['relacionado_con_empresa_sancionada'].astype(bool)
+        ).to_dict()
+        
+        precios = valor.precios_df
+        filas = []
+        for fraccion, pais, proveedor in llaves.itertuples(index=False):
+            # Módulo 2: precio de referencia
+            resolucion = valor.indice_fracciones.resolver(fraccion)
+            if resolucion is not None:
+                posicion, _ = valor.posicion_referencia(resolucion.fraccion, pais)
+                precio = (
+                    precios['precio_unitario_promedio_usd'].iat[posicion],
+                    precios['precio_min_usd'].iat[posicion],
+                    precios['precio_max_usd'].iat[posicion]
+                )
+            else:
+                precio = (np.nan, np.nan, np.nan)
+            
+            # Módulo 3: alertas vigentes que aplican a la operación
+            ids = set()
+            for ancestro in alertas.indice_fracciones.ancestros(fraccion):
+                ids |= por_fraccion.get(ancestro, set())
+            ids |= por_pais.get(pais, set())
+            ids |= por_proveedor.get(proveedor, set())
+            niveles = [criticidad[i] for i in ids]
+            
+            # Módulo 4: documentos faltantes de la plantilla de la fracción
+            resolucion_checklist = checklist.indice_fracciones.resolver(fraccion)
+            documentos = (
+                checklist.plantillas[resolucion_checklist.fraccion].documentos_faltantes
+                if resolucion_checklist is not None else 0
+            )
+            
+            filas.append((
+                fraccion, pais, proveedor, *precio,
+                niveles.count('CRITICO'), niveles.count('ALTO'), len(niveles),
+                bool(proveedor_riesgo.get(proveedor, False)), documentos
+            ))
+        
+        return pd.DataFrame(filas, columns=[
+            *LLAVE, "precio_mercado", "precio_min", "precio_max",
+            "alertas_criticas", "alertas_altas", "total_alertas",
+            "proveedor_riesgo", "documentos_faltantes"
+        ]).set_index(LLAVE)
+    
+    def variables(self, desde: int = 0, hasta: Optional[int] = None) -> pd.DataFrame:
+        """
+        Variables de decisión de los pedimentos [desde, hasta)
+        
+        Returns:
+            Una fila por pedimento: posición del importador en la tabla de
+            riesgo (-1 si no existe), desviación y percentil del valor, conteos
+            de alertas, estatus del proveedor, documentos faltantes y los
+            resultados históricos
+        """
+        bloque = self.pedimentos_df.iloc[desde:hasta]
+        variables = bloque.join(self.variables_por_llave, on=LLAVE)
+        
+        valor_unitario = (bloque['valor_declarado_usd'] / bloque['cantidad']).to_numpy()
+        desviacion, percentil = calcular_desviacion_percentil(
+            valor_unitario,
+            variables['precio_mercado'].to_numpy(),
+            variables['precio_min'].to_numpy(),
+            variables['precio_max'].to_numpy()
+        )
+        
+        return pd.DataFrame({
+            "importador": self.tabla_importadores.tabla.index.get_indexer(bloque['rfc_importador']),
+            "valor_encontrado": variables['precio_mercado'].notna().to_numpy(),
+            "desviacion_pct": desviacion,
+            "percentil": percentil,
+            "alertas_criticas": variables['alertas_criticas'].to_numpy(),
+            "alertas_altas": variables['alertas_altas'].to_numpy(),
+            "total_alertas": variables['total_alertas'].to_numpy(),
+            "proveedor_riesgo": variables['proveedor_riesgo'].to_numpy(),
+            "documentos_faltantes": variables['documentos_faltantes'].to_numpy(),
+            "canal_asignado": bloque['canal_asignado'].to_numpy(),
+            "resultado_reconocimiento": bloque['resultado_reconocimiento'].to_numpy()
+        })
+    
+    def decidir(self, variables: pd.DataFrame, parametros: Parametros = None) -> pd.DataFrame:
+        """
+        Niveles de riesgo y canal recomendado de cada pedimento
+        
+        Args:
+            variables: Resultado de variables()
+            parametros: Umbrales alternos {nombre: valor} (ver reglas.umbrales())
+        
+        Returns:
+            perfil_riesgo, nivel_riesgo_valor, nivel_riesgo_alertas,
+            riesgo_global y canal_recomendado por pedimento; los pedimentos de
+            importadores inexistentes quedan en None (el análisis responde 404)
+        """
+        importador = variables['importador'].to_numpy()
+        encontrado = importador >= 0
+        perfiles = self.tabla_importadores.perfiles(parametros).to_numpy(dtype=object)
+        perfil = np.where(encontrado, perfiles[np.where(encontrado, importador, 0)], None)
+        
+        nivel_valor = RIESGO_VALOR.evaluar_columnas({
+            "desviacion_pct": variables['desviacion_pct'].to_numpy(),
+            "percentil": variables['percentil'].to_numpy()
+        }, parametros)
+        # Sin precio de referencia el Módulo 2 no reporta nivel de riesgo
+        nivel_valor[~variables['valor_encontrado'].to_numpy()] = None
+        
+        alertas_criticas = variables['alertas_criticas'].to_numpy()
+        total_alertas = variables['total_alertas'].to_numpy()
+        nivel_alertas = RIESGO_ALERTAS.evaluar_columnas({
+            "alertas_criticas": alertas_criticas,
+            "alertas_altas": variables['alertas_altas'].to_numpy(),
+            "total_alertas": total_alertas,
+            "proveedor_riesgo": variables['proveedor_riesgo'].to_numpy()
+        }, parametros)
+        
+        riesgo_global = RIESGO_GLOBAL.evaluar_columnas({
+            "perfil_riesgo": perfil,
+            "nivel_riesgo_valor": nivel_valor,
+            "nivel_riesgo_alertas": nivel_alertas
+        }, parametros)
+        
+        canal = CANAL_RECOMENDADO.evaluar_columnas({
+            "riesgo_global": riesgo_global,
+            "alertas_criticas": alertas_criticas,
+            "documentos_faltantes": variables['documentos_faltantes'].to_numpy(),
+            "perfil_riesgo": perfil,
+            "nivel_riesgo_valor": nivel_valor,
+            "total_alertas": total_alertas
+        }, parametros)
+        
+        decision = pd.DataFrame({
+            "perfil_riesgo": perfil,
+            "nivel_riesgo_valor": nivel_valor,
+            "nivel_riesgo_alertas": nivel_alertas,
+            "riesgo_global": riesgo_global,
+            "canal_recomendado": canal
+        })
+        decision.loc[~encontrado, ["riesgo_global", "canal_recomendado"]] = None
+        return decision
+    
+    def evaluar_bloque(self, desde: int, hasta: int, parametros: Parametros = None) -> pd.Series:
+        """Conteo de pedimentos del bloque por (canal recomendado, canal asignado, resultado)"""
+        variables = self.variables(desde, hasta)
+        decision = self.decidir(variables, parametros)
+        return pd.DataFrame({
+            "canal_recomendado": decision['canal_recomendado'].fillna("SIN_ANALISIS"),
+            "canal_asignado": variables['canal_asignado'],
+            "resultado_reconocimiento": variables['resultado_reconocimiento']
+        }).value_counts()
+    
+    def ejecutar(self, parametros: Parametros = None, procesos: int = 1,
+                 tamano_bloque: int = 50000) -> Dict:
+        """
+        Reproduce todo el historial y arma el reporte
+        
+        Args:
+            parametros: Umbrales alternos {nombre: valor}
+            procesos: Procesos entre los que se reparten los bloques
+            tamano_bloque: Pedimentos por bloque
+        """
+        inicio = time.perf_counter()
+        tabla = self._actualizar_tabla_riesgo()
+        total = len(self.pedimentos_df)
+        bloques = [(desde, min(desde + tamano_bloque, total)) for desde in range(0, total, tamano_bloque)]
+        
+        if procesos > 1 and len(bloques) > 1:
+            # Con fork los procesos heredan el backtest ya construido; sin fork se copia una vez por proceso
+            metodo = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context(metodo),
+                                     initializer=_iniciar_proceso, initargs=(self,)) as pool:
+                conteos = list(pool.map(_evaluar_bloque, [(desde, hasta, parametros) for desde, hasta in bloques]))
+        else:
+            procesos = 1
+            conteos = [self.evaluar_bloque(desde, hasta, parametros) for desde, hasta in bloques]
+        
+        conteo = pd.concat(conteos).groupby(level=[0, 1, 2]).sum() if conteos else pd.Series(dtype=int)
+        tiempo = time.perf_counter() - inicio
+        
+        reporte = reporte_backtest(conteo)
+        reporte["parametros"] = dict(parametros or {})
+        reporte["version_datos"] = self.version_datos
+        reporte["fecha_tabla_riesgo"] = tabla.fecha.isoformat()
+        reporte["rendimiento"] = {
+            "tiempo_ms": round(tiempo * 1000, 2),
+            "pedimentos_por_segundo": round(total / tiempo) if tiempo > 0 else None,
+            "procesos": procesos,
+            "bloques": len(bloques),
+            "tamano_bloque": tamano_bloque
+        }
+        return reporte
+    
+    def simular(self, parametros: Parametros) -> Dict:
+        """
+        Cambio en la distribución de canales si se usan umbrales alternos
+        
+        Reevalúa las reglas sobre todo el historial con los umbrales indicados
+        y las compara contra las reglas vigentes, por columnas y en un solo
+        proceso (las variables del historial se calculan una sola vez por cada
+        tabla de riesgo del día).
+        
+        Args:
+            parametros: Umbrales alternos {nombre: valor} (ver reglas.umbrales())
+        """
+        inicio = time.perf_counter()
+        tabla = self._actualizar_tabla_riesgo()
+        base = self._simulacion_base
+        if base is None or base[0] is not tabla:
+            variables = self.variables()
+            base = self._simulacion_base = (tabla, variables, self.decidir(variables))
+        _, variables, vigente = base
+        simulada = self.decidir(variables, parametros)
+        
+        analizados = vigente['canal_recomendado'].notna().to_numpy()
+        canal_vigente = vigente['canal_recomendado'][analizados]
+        canal_simulado = simulada['canal_recomendado'][analizados]
+        total = int(analizados.sum())
+        
+        distribucion = {}
+        conteo_vigente = _distribucion(canal_vigente)
+        conteo_simulado = _distribucion(canal_simulado)
+        for canal in CANALES:
+            distribucion[canal] = {
+                "vigente": conteo_vigente[canal],
+                "simulado": conteo_simulado[canal],
+                "cambio": conteo_simulado[canal] - conteo_vigente[canal],
+                "vigente_pct": round(conteo_vigente[canal] / total * 100, 2) if total else None,
+                "simulado_pct": round(conteo_simulado[canal] / total * 100, 2) if total else None
+            }
+        
+        transiciones = pd.crosstab(canal_vigente, canal_simulado).reindex(
+            index=CANALES, columns=CANALES, fill_value=0
+        )
+        resultados = variables['resultado_reconocimiento'][analizados]
+        
+        declarados = reglas.umbrales()
+        return {
+            "umbrales": {
+                nombre: {"vigente": declarados.get(nombre), "simulado": valor}
+                for nombre, valor in parametros.items()
+            },
+            "total_pedimentos": total,
+            "pedimentos_con_cambio": int((canal_vigente != canal_simulado).sum()),
+            "distribucion_canal": distribucion,
+            # Filas: canal vigente; columnas: canal simulado
+            "transiciones": {
+                canal: {destino: int(n) for destino, n in fila.items()} for canal, fila in transiciones.iterrows()
+            },
+            "por_resultado": {
+                resultado: {
+                    "vigente": _distribucion(canal_vigente[(resultados == resultado).to_numpy()]),
+                    "simulado": _distribucion(canal_simulado[(resultados == resultado).to_numpy()])
+                }
+                for resultado in RESULTADOS
+            },
+            "niveles_riesgo": {
+                nivel: {
+                    "vigente": _distribucion(vigente[nivel][analizados]),
+                    "simulado": _distribucion(simulada[nivel][analizados])
+                }
+                for nivel in ("perfil_riesgo", "nivel_riesgo_valor", "nivel_riesgo_alertas", "riesgo_global")
+            },
+            "version_datos": self.version_datos,
+            "fecha_tabla_riesgo": tabla.fecha.isoformat(),
+            "tiempo_ms": round((time.perf_counter() - inicio) * 1000, 2)
+        }
+
+
+def _distribucion(niveles: pd.Series) -> Dict[str, int]:
+    """Conteo por nivel (VERDE, AMARILLO, ROJO)"""
+    conteo = niveles.value_counts()
+    return {nivel: int(conteo.get(nivel, 0)) for nivel in CANALES}
+
+
+def calcular_desviacion_percentil(valor: np.ndarray, promedio: np.ndarray, minimo: np.ndarray,
+                                  maximo: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Desviación porcentual y percentil aproximado de cada valor contra su rango de mercado
+    
+    Mismos cálculos que AnalizadorValor.analizar_valor y _calcular_percentil,
+    por columnas. Sin precio de referencia ambos quedan en NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        desviacion = ((valor - promedio) / promedio) * 100
+        bajo = 5 + ((valor - minimo) / (promedio - minimo)) * 45
+        alto = 50 + ((valor - promedio) / (maximo - promedio)) * 45
+        percentil = np.select(
+            [valor <= minimo, valor >= maximo, valor < promedio, valor >= promedio],
+            [5, 95, np.trunc(bajo), np.trunc(alto)],
+            default=np.nan
+        )
+    return desviacion, percentil
+
+
+def reporte_backtest(conteo: pd.Series) -> Dict:
+    """
+    Matrices de confusión y tasas a partir del conteo por
+    (canal recomendado, canal asignado, resultado del reconocimiento)
+    """
+    analizados = conteo.drop("SIN_ANALISIS", level=0, errors='ignore')
+    
+    por_resultado = analizados.groupby(level=[0, 2]).sum().unstack(fill_value=0)
+    por_resultado = por_resultado.reindex(index=CANALES, columns=RESULTADOS, fill_value=0)
+    por_canal = analizados.groupby(level=[0, 1]).sum().unstack(fill_value=0)
+    por_canal = por_canal.reindex(index=CANALES, columns=CANALES, fill_value=0)
+    
+    def pct(parte, total):
+        return round(parte / total * 100, 2) if total else None
+    
+    embargos = por_resultado['EMBARGO']
+    irregulares = por_resultado['CON_OBSERVACIONES'] + por_resultado['EMBARGO']
+    revision = ["AMARILLO", "ROJO"]
+    
+    return {
+        "total_pedimentos": int(conteo.sum()),
+        "analizados": int(analizados.sum()),
+        "sin_analisis": int(conteo.sum() - analizados.sum()),
+        "canal_recomendado": {canal: int(n) for canal, n in por_resultado.sum(axis=1).items()},
+        # Filas: canal recomendado; columnas: resultado del reconocimiento / canal asignado
+        "matriz_resultado": {
+            canal: {resultado: int(n) for resultado, n in fila.items()} for canal, fila in por_resultado.iterrows()
+        },
+        "matriz_canal_asignado": {
+            canal: {asignado: int(n) for asignado, n in fila.items()} for canal, fila in por_canal.iterrows()
+        },
+        "embargos": {
+            "total": int(embargos.sum()),
+            "recomendados_rojo": int(embargos['ROJO']),
+            "recomendados_amarillo": int(embargos['AMARILLO']),
+            "recomendados_verde": int(embargos['VERDE']),
+            "tasa_deteccion_pct": pct(embargos['ROJO'], embargos.sum()),
+            "tasa_omision_pct": pct(embargos['VERDE'], embargos.sum())
+        },
+        "irregularidades": {
+            "total": int(irregulares.sum()),
+            "enviadas_a_revision": int(irregulares[revision].sum()),
+            "tasa_cobertura_pct": pct(irregulares[revision].sum(), irregulares.sum()),
+            "precision_rojo_pct": pct(irregulares['ROJO'], por_resultado.loc['ROJO'].sum())
+        },
+        "coincidencia_canal_asignado_pct": pct(np.trace(por_canal.to_numpy()), por_canal.to_numpy().sum())
+    }
+
+
+# Backtest del proceso hijo (se asigna al iniciar cada proceso del pool)
+_backtest_proceso: Optional[BacktestCanal] = None
+
+
+def _iniciar_proceso(backtest: BacktestCanal):
+    global _backtest_proceso
+    _backtest_proceso = backtest
+
+
+def _evaluar_bloque(argumentos: Tuple[int, int, Parametros]) -> pd.Series:
+    desde, hasta, parametros = argumentos
+    return _backtest_proceso.evaluar_bloque(desde, hasta, parametros)
+
+# Made with Bob
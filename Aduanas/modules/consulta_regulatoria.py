@@ -0,0 +1,138 @@
+"""
+Consulta Regulatoria por Bitsets
+Codifica las banderas regulatorias de cada fracción como bitsets para filtrar con AND/OR/NOT
+"""
+import re
+from typing import Dict, Iterable, List, Mapping
+
+
+class IndiceRegulatorio:
+    """
+    Bitsets de banderas regulatorias sobre todas las fracciones
+    
+    Cada bandera (COFEPRIS, SENASICA, SEMARNAT, SEDENA, CERTIFICADO_ORIGEN o
+    una NOM) es un entero cuyo bit i indica si la fracción i la requiere, de
+    modo que una expresión como "COFEPRIS AND SENASICA AND NOT SEDENA" se
+    evalúa con operaciones bit a bit sobre la tabla completa.
+    """
+    
+    _TOKEN = re.compile(r"\s*(\(|\)|[^\s()]+)")
+    _OPERADORES = {"AND", "OR", "NOT"}
+    
+    # NOT y paréntesis anidados que acepta una expresión (el parser es recursivo)
+    MAX_ANIDAMIENTO = 100
+    
+    def __init__(self, banderas_por_fraccion: Mapping[str, frozenset],
+                 vocabulario: Iterable[str] = ()):
+        self.fracciones: List[str] = list(banderas_por_fraccion)
+        self.universo = (1 << len(self.fracciones)) - 1
+        
+        # Bitset por bandera (columna) y por fracción (renglón); el vocabulario
+        # fijo es válido aunque ninguna fracción lo requiera
+        self.banderas: Dict[str, int] = {bandera: 0 for bandera in vocabulario}
+        self.bits_por_fraccion: Dict[str, int] = {}
+        for posicion, (fraccion, banderas) in enumerate(banderas_por_fraccion.items()):
+            for bandera in banderas:
+                self.banderas[bandera] = self.banderas.get(bandera, 0) | (1 << posicion)
+        
+        self.orden_banderas: List[str] = sorted(self.banderas)
+        orden = {bandera: i for i, bandera in enumerate(self.orden_banderas)}
+        for fraccion, banderas in banderas_por_fraccion.items():
+            bits = 0
+            for bandera in banderas:
+                bits |= 1 << orden[bandera]
+            self.bits_por_fraccion[fraccion] = bits
+    
+    def banderas_disponibles(self) -> List[str]:
+        """Lista de banderas que pueden usarse en una expresión"""
+        return list(self.orden_banderas)
+    
+    def banderas_de(self, fraccion: str) -> List[str]:
+        """Decodifica el bitset de una fracción en sus banderas"""
+        bits = self.bits_por_fraccion.get(fraccion, 0)
+        return [bandera for i, bandera in enumerate(self.orden_banderas) if bits >> i & 1]
+    
+    def evaluar(self, expresion: str) -> int:
+        """
+        Evalúa una expresión booleana y devuelve el bitset de fracciones que la cumplen
+        
+        Gramática (sin distinguir mayúsculas):
+            expr   := termino (OR termino)*
+            termino := factor (AND factor)*
+            factor := NOT factor | "(" expr ")" | BANDERA
+        
+        Raises:
+            ValueError: Si la expresión está mal formada, usa una bandera
+                        desconocida o anida más de MAX_ANIDAMIENTO NOT o paréntesis
+        """
+        tokens = [t.upper() for t in self._TOKEN.findall(expresion)]
+        if not tokens:
+            raise ValueError("Expresión vacía")
+        
+        posicion = 0
+        anidamiento = 0
+        
+        def siguiente():
+            return tokens[posicion] if posicion < len(tokens) else None
+        
+        def expr() -> int:
+            nonlocal posicion
+            resultado = termino()
+            while siguiente() == "OR":
+                posicion += 1
+                resultado |= termino()
+            return resultado
+        
+        def termino() -> int:
+            nonlocal posicion
+            resultado = factor()
+            while siguiente() == "AND":
+                posicion += 1
+                resultado &= factor()
+            return resultado
+        
+        def factor() -> int:
+            nonlocal posicion, anidamiento
+            token = siguiente()
+            if token is None:
+                raise ValueError("Expresión incompleta")
+            
+            posicion += 1
+            if token in ("NOT", "("):
+                if anidamiento >= self.MAX_ANIDAMIENTO:
+                    raise ValueError(f"La expresión anida más de {self.MAX_ANIDAMIENTO} NOT o paréntesis")
+                anidamiento += 1
+                if token == "NOT":
+                    resultado = self.universo ^ factor()
+                else:
+                    resultado = expr()
+                    if siguiente() != ")":
+                        raise ValueError("Falta cerrar paréntesis")
+                    posicion += 1
+                anidamiento -= 1
+                return resultado
+            
+            if token == ")" or token in self._OPERADORES:
+                raise ValueError(f"Token inesperado: {token}")
+            
+            if token not in self.banderas:
+                raise ValueError(f"Bandera desconocida: {token}")
+            
+            return self.banderas[token]
+        
+        resultado = expr()
+        if posicion != len(tokens):
+            raise ValueError(f"Token inesperado: {tokens[posicion]}")
+        
+        return resultado
+    
+    def fracciones_de(self, bits: int) -> List[str]:
+        """Convierte un bitset en la lista de fracciones correspondientes"""
+        fracciones = []
+        while bits:
+            bajo = bits & -bits
+            fracciones.append(self.fracciones[bajo.bit_length() - 1])
+            bits ^= bajo
+        return fracciones
+
+# Made with Bob
@@ -0,0 +1,190 @@
+"""
+CRUCE RETROACTIVO — Alertas vs. Pedimentos Históricos
+Identifica los pedimentos pasados y RFCs afectados cuando se emite una alerta nueva
+"""
+import pandas as pd
+import numpy as np
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .indice_fracciones import IndiceFracciones
+from core import SnapshotDatos, cargar_snapshot
+
+
+class CruceRetroactivo:
+    """
+    Cruza alertas de inteligencia contra el historial de pedimentos mediante índices por llave
+    
+    Un pedimento queda afectado con el mismo criterio que el análisis en
+    línea (GestorAlertas.buscar_alertas_para_operacion): basta que coincida
+    la fracción (la de la alerta o una más específica), el país de origen o
+    el proveedor de la alerta.
+    """
+    
+    # Columna del pedimento -> columna de la alerta que la restringe
+    LLAVES = {
+        "fraccion_arancelaria": "fraccion_arancelaria",
+        "pais_origen": "pais_origen_afectado",
+        "proveedor_extranjero": "proveedor_extranjero_afectado"
+    }
+    
+    TABLAS = ("pedimentos_historicos", "alertas_inteligencia")
+    
+    def __init__(self, data_path: str = "data", snapshot: Optional[SnapshotDatos] = None):
+        snapshot = snapshot or cargar_snapshot(data_path, self.TABLAS)
+        self.data_path = snapshot.data_path
+        self.pedimentos_df = snapshot['pedimentos_historicos']
+        self.alertas_df = snapshot['alertas_inteligencia']
+        
+        # Índices valor -> posiciones de pedimentos (una pasada por llave)
+        self.indices = {
+            columna: self._construir_indice(self.pedimentos_df[columna])
+            for columna in self.LLAVES
+        }
+        
+        # Una alerta sobre una fracción alcanza a sus códigos más específicos
+        self.indice_fracciones = IndiceFracciones(self.indices['fraccion_arancelaria'])
+        
+        # Versión del snapshot de datos
+        self.version_datos = snapshot.version
+    
+    def _construir_indice(self, columna: pd.Series) -> Dict[str, np.ndarray]:
+        """Agrupa las posiciones de los pedimentos por valor de la columna"""
+        codigos, valores = pd.factorize(columna)
+        
+        # Orden estable: las posiciones de cada grupo quedan ascendentes
+        orden = np.argsort(codigos, kind='stable')
+        limites = np.searchsorted(codigos[orden], np.arange(len(valores) + 1))
+        
+        return {
+            valor: orden[limites[i]:limites[i + 1]]
+            for i, valor in enumerate(valores)
+        }
+    
+    def _posiciones_para_alerta(self, alerta) -> np.ndarray:
+        """
+        Obtiene las posiciones (ascendentes) de pedimentos que coinciden con alguna llave de la alerta
+        
+        Una alerta sin fracción, país ni proveedor no coincide con ningún pedimento.
+        """
+        grupos = []
+        for columna_pedimento, columna_alerta in self.LLAVES.items():
+            valor = alerta[columna_alerta]
+            if pd.isna(valor):
+                continue
+            if columna_pedimento == 'fraccion_arancelaria':
+                valores = self.indice_fracciones.descendientes(valor)
+            else:
+                valores = [valor]
+            indice = self.indices[columna_pedimento]
+            grupos.extend(indice[v] for v in valores if v in indice)
+        
+        if not grupos:
+            return np.empty(0, dtype=np.intp)
+        
+        return np.unique(np.concatenate(grupos))
+    
+    def _seleccionar_alertas(self, ids_alerta: Optional[List[str]] = None,
+                             solo_vigentes: bool = True) -> pd.DataFrame:
+        """Selecciona las alertas a cruzar"""
+        if ids_alerta:
+            return self.alertas_df[self.alertas_df['id_alerta'].isin(ids_alerta)]
+        
+        if solo_vigentes:
+            return self.alertas_df[self.alertas_df['vigente'] == True]
+        
+        return self.alertas_df
+    
+    def cruzar_alertas(self, ids_alerta: Optional[List[str]] = None,
+                       solo_vigentes: bool = True) -> List[Dict]:
+        """
+        Cruza una o más alertas contra los pedimentos históricos
+        
+        Args:
+            ids_alerta: IDs de alerta a cruzar (default: todas las vigentes)
+            solo_vigentes: Si no se indican IDs, limitar a alertas vigentes
+        
+        Returns:
+            Lista con RFCs y pedimentos afectados por cada alerta
+        """
+        return list(self.iterar_cruce(ids_alerta, solo_vigentes))
+    
+    def iterar_cruce(self, ids_alerta: Optional[List[str]] = None,
+                     solo_vigentes: bool = True) -> Iterator[Dict]:
+        """Genera el resultado del cruce alerta por alerta, conforme se calcula"""
+        for _, alerta in self._seleccionar_alertas(ids_alerta, solo_vigentes).iterrows():
+            inicio = time.time()
+            posiciones = self._posiciones_para_alerta(alerta)
+            afectados = self.pedimentos_df.iloc[posiciones]
+            
+            yield {
+                "id_alerta": alerta['id_alerta'],
+                "tipo": alerta['codigo_tipo'],
+                "titulo": alerta['titulo_corto'],
+                "llaves": {
+                    columna_pedimento: alerta[columna_alerta]
+                    for columna_pedimento, columna_alerta in self.LLAVES.items()
+                    if pd.notna(alerta[columna_alerta])
+                },
+                "total_pedimentos": len(afectados),
+                "total_rfcs": int(afectados['rfc_importador'].nunique()),
+                "rfcs_afectados": sorted(afectados['rfc_importador'].unique().tolist()),
+                "pedimentos": afectados['num_pedimento'].tolist(),
+                "tiempo_ms": round((time.time() - inicio) * 1000, 2)
+            }
+    
+    def exportar(self, directorio: str, ids_alerta: Optional[List[str]] = None,
+                 solo_vigentes: bool = True) -> Dict:
+        """
+        Escribe los pedimentos y RFCs afectados en CSV
+        
+        Genera dos archivos en el directorio indicado:
+            - pedimentos_afectados.csv: un renglón por (alerta, pedimento)
+            - rfcs_afectados.csv: un renglón por (alerta, RFC) con totales
+        """
+        inicio = time.time()
+        columnas = [
+            'num_pedimento', 'rfc_importador', 'fecha_pago', 'fraccion_arancelaria',
+            'pais_origen', 'proveedor_extranjero', 'valor_declarado_usd'
+        ]
+        
+        partes = []
+        alertas = self._seleccionar_alertas(ids_alerta, solo_vigentes)
+        for _, alerta in alertas.iterrows():
+            posiciones = self._posiciones_para_alerta(alerta)
+            if len(posiciones) == 0:
+                continue
+            
+            parte = self.pedimentos_df.iloc[posiciones][columnas].copy()
+            parte.insert(0, 'id_alerta', alerta['id_alerta'])
+            partes.append(parte)
+        
+        if partes:
+            pedimentos = pd.concat(partes, ignore_index=True)
+        else:
+            pedimentos = pd.DataFrame(columns=['id_alerta'] + columnas)
+        
+        rfcs = (
+            pedimentos.groupby(['id_alerta', 'rfc_importador'])
+            .agg(
+                num_pedimentos=('num_pedimento', 'size'),
+                valor_total_usd=('valor_declarado_usd', 'sum')
+            )
+            .round({'valor_total_usd': 2})
+            .reset_index()
+        )
+        
+        os.makedirs(directorio, exist_ok=True)
+        pedimentos.to_csv(f"{directorio}/pedimentos_afectados.csv", index=False, date_format='%Y-%m-%d')
+        rfcs.to_csv(f"{directorio}/rfcs_afectados.csv", index=False)
+        
+        return {
+            "alertas_cruzadas": len(alertas),
+            "pedimentos_afectados": len(pedimentos),
+            "rfcs_afectados": int(pedimentos['rfc_importador'].nunique()),
+            "directorio": directorio,
+            "tiempo_ms": round((time.time() - inicio) * 1000, 2)
+        }
+
+# Made with Bob
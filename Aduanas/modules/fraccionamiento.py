@@ -0,0 +1,233 @@
+"""
+Detección de Fraccionamiento de Embarques
+Encuentra ráfagas de pedimentos del mismo RFC, fracción y proveedor en pocos días
+"""
+import threading
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Un embarque fraccionado comparte importador, fracción y proveedor
+LLAVE = ["rfc_importador", "fraccion_arancelaria", "proveedor_extranjero"]
+
+COLUMNAS = [*LLAVE, "fecha_pago", "num_pedimento", "valor_declarado_usd"]
+
+Clave = Tuple[str, str, str]
+
+
+def barrer(pedimentos: pd.DataFrame, ventana_dias: int, minimo_pedimentos: int) -> List[Dict]:
+    """
+    Ráfagas de pedimentos en una tabla ordenada por LLAVE y fecha_pago
+    
+    Para cada pedimento se busca (searchsorted sobre la llave combinada
+    grupo + día) el último pedimento del mismo grupo dentro de la ventana (su
+    día y los ventana_dias - 1 siguientes); si la ventana reúne al menos
+    minimo_pedimentos, todos sus pedimentos quedan marcados. Las ventanas que se traslapan forman una sola ráfaga.
+    
+    Returns:
+        Una ráfaga por elemento, con su llave, fechas, número de pedimentos
+        y valor total
+    """
+    total = len(pedimentos)
+    if total < minimo_pedimentos:
+        return []
+    
+    nuevo_grupo = np.zeros(total, dtype=bool)
+    nuevo_grupo[0] = True
+    for columna in LLAVE:
+        valores = pedimentos[columna].to_numpy()
+        nuevo_grupo[1:] |= valores[1:] != valores[:-1]
+    grupo = np.cumsum(nuevo_grupo) - 1
+    
+    dias = pedimentos['fecha_pago'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    dias = dias - dias.min()
+    # Llave combinada: los grupos quedan separados por más de una ventana
+    llave = grupo * (int(dias.max()) + ventana_dias + 1) + dias
+    
+    posiciones = np.arange(total)
+    fin = np.searchsorted(llave, llave + ventana_dias - 1, side='right')
+    densa = (fin - posiciones) >= minimo_pedimentos
+    if not densa.any():
+        return []
+    
+    # Cobertura de las ventanas densas: +1 al inicio, -1 al final
+    cambios = np.zeros(total + 1, dtype=np.int64)
+    np.add.at(cambios, posiciones[densa], 1)
+    np.add.at(cambios, fin[densa], -1)
+    cobertura = np.cumsum(cambios)[:total]
+    en_rafaga = cobertura > 0
+    
+    # Una ráfaga empieza donde ninguna ventana anterior cubre al pedimento
+    previa = cobertura - densa
+    inicio = en_rafaga & ((previa == 0) | nuevo_grupo)
+    rafaga = np.cumsum(inicio) - 1
+    
+    marcados = pedimentos[en_rafaga].assign(rafaga=rafaga[en_rafaga])
+    agrupado = marcados.groupby('rafaga', sort=False)
+    resumen = agrupado.agg(
+        rfc=('rfc_importador', 'first'),
+        fraccion=('fraccion_arancelaria', 'first'),
+        proveedor=('proveedor_extranjero', 'first'),
+        pedimentos=('num_pedimento', 'size'),
+        fecha_inicio=('fecha_pago', 'min'),
+        fecha_fin=('fecha_pago', 'max'),
+        valor_total_usd=('valor_declarado_usd', 'sum')
+    )
+    numeros = agrupado['num_pedimento'].agg(list)
+    
+    return [
+        {
+            "rfc": fila.rfc,
+            "fraccion": fila.fraccion,
+            "proveedor": fila.proveedor,
+            "pedimentos": int(fila.pedimentos),
+            "fecha_inicio": fila.fecha_inicio.strftime('%Y-%m-%d'),
+            "fecha_fin": fila.fecha_fin.strftime('%Y-%m-%d'),
+            "dias": int((fila.fecha_fin - fila.fecha_inicio).days),
+            "valor_total_usd": round(float(fila.valor_total_usd), 2),
+            "num_pedimentos": numeros[indice]
+        }
+        for indice, fila in zip(resumen.index, resumen.itertuples(index=False))
+    ]
+
+
+class DetectorFraccionamiento:
+    """
+    Ráfagas de pedimentos (posible fraccionamiento) por RFC, fracción y proveedor
+    
+    El historial se ordena una vez y se barre completo al construir. Los
+    pedimentos que llegan después (ingerir) sólo vuelven a barrer los grupos
+    que tocan; se conservan en memoria hasta la siguiente recarga de datos.
+    """
+    
+    VENTANA_DIAS = 7
+    MINIMO_PEDIMENTOS = 3
+    
+    def __init__(self, pedimentos_df: pd.DataFrame, ventana_dias: int = VENTANA_DIAS,
+                 minimo_pedimentos: int = MINIMO_PEDIMENTOS):
+        self.ventana_dias = ventana_dias
+        self.minimo_pedimentos = minimo_pedimentos
+        
+        self._base = pedimentos_df[COLUMNAS].sort_values(
+            [*LLAVE, 'fecha_pago'], kind='stable'
+        ).reset_index(drop=True)
+        
+        # Posiciones [inicio, fin) de cada grupo en la tabla ordenada
+        cambios = np.flatnonzero(
+            (self._base[LLAVE] != self._base[LLAVE].shift()).any(axis=1).to_numpy()
+        )
+        limites = np.append(cambios, len(self._base))
+        claves = self._base[LLAVE].iloc[cambios].itertuples(index=False, name=None)
+        self._rangos: Dict[Clave, Tuple[int, int]] = {
+            clave: (int(limites[i]), int(limites[i + 1])) for i, clave in enumerate(claves)
+        }
+        
+        self._ingestados: Dict[Clave, pd.DataFrame] = {}
+        self._numeros: Set[str] = set(self._base['num_pedimento'])
+        self._rafagas: Dict[Clave, List[Dict]] = {}
+        self._claves_por_rfc: Dict[str, FrozenSet[Clave]] = {}
+        self._lock = threading.Lock()
+        
+        self._actualizar(self._rangos.keys(), barrer(self._base, ventana_dias, minimo_pedimentos))
+    
+    def _actualizar(self, claves: Iterable[Clave], rafagas: List[Dict]):
+        """Reemplaza las ráfagas de los grupos indicados"""
+        por_clave: Dict[Clave, List[Dict]] = {}
+        for rafaga in rafagas:
+            por_clave.setdefault((rafaga["rfc"], rafaga["fraccion"], rafaga["proveedor"]), []).append(rafaga)
+        
+        tocadas: Dict[str, List[Clave]] = {}
+        for clave in claves:
+            encontradas = por_clave.get(clave)
+            if encontradas:
+                self._rafagas[clave] = encontradas
+            else:
+                self._rafagas.pop(clave, None)
+            tocadas.setdefault(clave[0], []).append(clave)
+        
+        # Los conjuntos por RFC se reemplazan, no se modifican: por_rfc los lee sin el lock
+        for rfc, claves_rfc in tocadas.items():
+            vigentes = self._claves_por_rfc.get(rfc, frozenset()).difference(claves_rfc)
+            vigentes |= {clave for clave in claves_rfc if clave in self._rafagas}
+            if vigentes:
+                self._claves_por_rfc[rfc] = vigentes
+            else:
+                self._claves_por_rfc.pop(rfc, None)
+    
+    def ingerir(self, pedimentos: pd.DataFrame) -> Dict:
+        """
+        Agrega pedimentos nuevos y vuelve a barrer sólo sus grupos
+        
+        Args:
+            pedimentos: Al menos las columnas de COLUMNAS; los números de
+                       pedimento ya registrados se ignoran
+        
+        Returns:
+            Pedimentos agregados, duplicados y ráfagas vigentes de los grupos tocados
+        """
+        with self._lock:
+            nuevos = pedimentos[COLUMNAS].drop_duplicates('num_pedimento')
+            nuevos = nuevos.assign(fecha_pago=pd.to_datetime(nuevos['fecha_pago']))
+            nuevos = nuevos[~nuevos['num_pedimento'].isin(self._numeros)]
+            duplicados = len(pedimentos) - len(nuevos)
+            
+            claves = []
+            for clave, filas in nuevos.groupby(LLAVE, sort=False):
+                previos = self._ingestados.get(clave)
+                self._ingestados[clave] = filas if previos is None else pd.concat([previos, filas])
+                claves.append(clave)
+            self._numeros.update(nuevos['num_pedimento'])
+            
+            # Historial + ingestados de los grupos tocados, barridos juntos
+            posiciones = [np.arange(*self._rangos[clave]) for clave in claves if clave in self._rangos]
+            partes = [self._base.take(np.concatenate(posiciones))] if posiciones else []
+            partes.extend(self._ingestados[clave] for clave in claves)
+            rafagas = []
+            if partes:
+                grupos = pd.concat(partes).sort_values([*LLAVE, 'fecha_pago'], kind='stable')
+                rafagas = barrer(grupos, self.ventana_dias, self.minimo_pedimentos)
+            self._actualizar(claves, rafagas)
+        
+        return {
+            "agregados": len(nuevos),
+            "duplicados": duplicados,
+            "grupos_actualizados": len(claves),
+            "rafagas": rafagas
+        }
+    
+    def por_rfc(self, rfc: str, desde: Optional[date] = None) -> List[Dict]:
+        """Ráfagas del RFC (las más recientes primero), opcionalmente terminadas desde una fecha"""
+        rafagas = [
+            rafaga
+            for clave in self._claves_por_rfc.get(rfc, ())
+            for rafaga in self._rafagas.get(clave, ())
+        ]
+        if desde is not None:
+            desde_texto = desde.strftime('%Y-%m-%d')
+            rafagas = [r for r in rafagas if r["fecha_fin"] >= desde_texto]
+        return sorted(rafagas, key=lambda r: r["fecha_inicio"], reverse=True)
+    
+    def listar(self, limite: Optional[int] = None) -> List[Dict]:
+        """Todas las ráfagas, de mayor a menor número de pedimentos"""
+        rafagas = sorted(
+            (rafaga for lista in list(self._rafagas.values()) for rafaga in lista),
+            key=lambda r: (-r["pedimentos"], r["rfc"], r["fecha_inicio"])
+        )
+        return rafagas[:limite] if limite is not None else rafagas
+    
+    def resumen(self) -> Dict:
+        """Parámetros del detector y totales"""
+        rafagas = [rafaga for lista in list(self._rafagas.values()) for rafaga in lista]
+        return {
+            "ventana_dias": self.ventana_dias,
+            "minimo_pedimentos": self.minimo_pedimentos,
+            "pedimentos_historicos": len(self._base),
+            "pedimentos_ingestados": sum(len(filas) for filas in list(self._ingestados.values())),
+            "total_rafagas": len(rafagas),
+            "rfcs_con_rafagas": len({r["rfc"] for r in rafagas}),
+            "pedimentos_en_rafagas": sum(r["pedimentos"] for r in rafagas)
+        }
+
+# Made with Bob
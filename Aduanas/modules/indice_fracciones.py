@@ -0,0 +1,130 @@
+"""
+Índice Jerárquico de Fracciones Arancelarias
+Trie de códigos (capítulo -> partida -> subpartida -> fracción) compartido por los módulos
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+class ResolucionFraccion(NamedTuple):
+    """Resultado de resolver un código contra el índice"""
+    fraccion: str       # Fracción registrada que se usará para la consulta
+    coincidencia: str   # exacta | prefijo
+    nivel: str          # Nivel arancelario de la coincidencia
+
+
+class _Nodo:
+    """Nodo del trie: un dígito del código arancelario"""
+    __slots__ = ('hijos', 'fraccion')
+    
+    def __init__(self):
+        self.hijos: Dict[str, "_Nodo"] = {}
+        self.fraccion: Optional[str] = None
+
+
+class IndiceFracciones:
+    """
+    Índice de fracciones arancelarias por prefijo más largo
+    
+    Los códigos se normalizan a sus dígitos ("8471.30.01" -> "84713001"), de
+    modo que una declaración más específica que la registrada se resuelve en
+    O(longitud del código) hacia su ancestro registrado más cercano.
+    """
+    
+    NIVELES = {2: "capitulo", 4: "partida", 6: "subpartida", 8: "fraccion", 10: "nico"}
+    
+    def __init__(self, fracciones: Iterable[str] = ()):
+        self._raiz = _Nodo()
+        for fraccion in fracciones:
+            self.agregar(fraccion)
+    
+    @staticmethod
+    def normalizar(codigo) -> str:
+        """Reduce un código arancelario a sus dígitos"""
+        return "".join(c for c in str(codigo) if c.isdigit())
+    
+    @classmethod
+    def nivel(cls, digitos: int) -> str:
+        """Nombre del nivel arancelario para un código de n dígitos"""
+        for longitud in sorted(cls.NIVELES, reverse=True):
+            if digitos >= longitud:
+                return cls.NIVELES[longitud]
+        return "seccion"
+    
+    def agregar(self, fraccion: str):
+        """Registra una fracción; si ya existe conserva la primera"""
+        digitos = self.normalizar(fraccion)
+        if not digitos:
+            return
+        
+        nodo = self._raiz
+        for digito in digitos:
+            nodo = nodo.hijos.setdefault(digito, _Nodo())
+        
+        if nodo.fraccion is None:
+            nodo.fraccion = fraccion
+    
+    def resolver(self, codigo: str) -> Optional[ResolucionFraccion]:
+        """
+        Resuelve un código contra las fracciones registradas
+        
+        Args:
+            codigo: Código declarado (puede ser más específico que el registrado)
+        
+        Returns:
+            ResolucionFraccion del ancestro registrado más cercano (o del
+            propio código), o None si ninguno está registrado
+        """
+        digitos = self.normalizar(codigo)
+        nodo = self._raiz
+        profundidad = 0
+        mejor = None
+        
+        for digito in digitos:
+            siguiente = nodo.hijos.get(digito)
+            if siguiente is None:
+                break
+            nodo = siguiente
+            profundidad += 1
+            if nodo.fraccion is not None:
+                mejor = (nodo.fraccion, profundidad)
+        
+        if mejor is not None:
+            fraccion, longitud = mejor
+            coincidencia = "exacta" if longitud == len(digitos) else "prefijo"
+            return ResolucionFraccion(fraccion, coincidencia, self.nivel(longitud))
+        
+        return None
+    
+    def ancestros(self, codigo: str) -> List[str]:
+        """Fracciones registradas que son el código o uno de sus prefijos"""
+        nodo = self._raiz
+        encontradas = []
+        
+        for digito in self.normalizar(codigo):
+            nodo = nodo.hijos.get(digito)
+            if nodo is None:
+                break
+            if nodo.fraccion is not None:
+                encontradas.append(nodo.fraccion)
+        
+        return encontradas
+    
+    def descendientes(self, codigo: str) -> List[str]:
+        """Fracciones registradas que son el código o uno de sus códigos más específicos"""
+        nodo = self._raiz
+        for digito in self.normalizar(codigo):
+            nodo = nodo.hijos.get(digito)
+            if nodo is None:
+                return []
+        
+        encontradas = []
+        pendientes = [nodo]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.fraccion is not None:
+                encontradas.append(nodo.fraccion)
+            pendientes.extend(nodo.hijos.values())
+        
+        return encontradas
+
+# Made with Bob
@@ -0,0 +1,91 @@
+"""
+Matriz de Elegibilidad de Tratados Comerciales
+Precalcula país × fracción -> tratado preferencial aplicable
+"""
+import numpy as np
+from typing import List, Mapping, Optional, Sequence
+
+
+class MatrizTratados:
+    """
+    Elegibilidad a trato preferencial por país de origen y fracción
+    
+    Un par (país, fracción) es elegible si el país es miembro de alguno de los
+    tratados registrados para la fracción. Los ejes se codifican como enteros
+    y la matriz guarda el índice del tratado aplicable (-1 si no hay), de modo
+    que un par o una factura completa se resuelven con indexado de arreglos.
+    """
+    
+    SIN_TRATADO = -1
+    
+    def __init__(self, miembros_por_tratado: Mapping[str, Sequence[str]],
+                 tratados_por_fraccion: Mapping[str, Sequence[str]]):
+        # Ejes codificados
+        self.tratados: List[str] = list(dict.fromkeys(
+            list(miembros_por_tratado) +
+            [t for tratados in tratados_por_fraccion.values() for t in tratados]
+        ))
+        self.paises: List[str] = sorted({p for paises in miembros_por_tratado.values() for p in paises})
+        self.fracciones: List[str] = list(tratados_por_fraccion)
+        
+        self.indice_tratado = {t: i for i, t in enumerate(self.tratados)}
+        self.indice_pais = {p: i for i, p in enumerate(self.paises)}
+        self.indice_fraccion = {f: i for i, f in enumerate(self.fracciones)}
+        
+        # Membresía país × tratado
+        self.membresia = np.zeros((len(self.paises), len(self.tratados)), dtype=bool)
+        for tratado, paises in miembros_por_tratado.items():
+            for pais in paises:
+                self.membresia[self.indice_pais[pais], self.indice_tratado[tratado]] = True
+        
+        # Tratado aplicable por país × fracción, respetando el orden de la regulación
+        self.tratado_aplicable = np.full(
+            (len(self.paises), len(self.fracciones)), self.SIN_TRATADO, dtype=np.int16
+        )
+        for j, tratados in enumerate(tratados_por_fraccion.values()):
+            for tratado in reversed(list(tratados)):
+                miembros = self.membresia[:, self.indice_tratado[tratado]]
+                self.tratado_aplicable[miembros, j] = self.indice_tratado[tratado]
+        
+        self.elegible = self.tratado_aplicable != self.SIN_TRATADO
+    
+    def tratados_de_pais(self, pais: str) -> List[str]:
+        """Tratados comerciales de los que el país es miembro"""
+        i = self.indice_pais.get(pais)
+        if i is None:
+            return []
+        return [self.tratados[t] for t in np.flatnonzero(self.membresia[i])]
+    
+    def fracciones_elegibles(self, pais: str) -> List[str]:
+        """Fracciones con trato preferencial disponible para el país"""
+        i = self.indice_pais.get(pais)
+        if i is None:
+            return []
+        return [self.fracciones[j] for j in np.flatnonzero(self.elegible[i])]
+    
+    def consultar(self, pais: str, fraccion: str) -> Optional[str]:
+        """Tratado aplicable a un par (país, fracción), o None"""
+        i = self.indice_pais.get(pais)
+        j = self.indice_fraccion.get(fraccion)
+        if i is None or j is None:
+            return None
+        
+        tratado = self.tratado_aplicable[i, j]
+        return None if tratado == self.SIN_TRATADO else self.tratados[tratado]
+    
+    def consultar_lote(self, paises: Sequence[str], fracciones: Sequence[str]) -> np.ndarray:
+        """
+        Índices de tratado aplicable para pares (país, fracción) en bloque
+        
+        Returns:
+            Arreglo de índices sobre self.tratados (-1 si no hay tratado)
+        """
+        i = np.fromiter((self.indice_pais.get(p, -1) for p in paises), dtype=np.intp, count=len(paises))
+        j = np.fromiter((self.indice_fraccion.get(f, -1) for f in fracciones), dtype=np.intp, count=len(fracciones))
+        
+        resultado = np.full(len(i), self.SIN_TRATADO, dtype=np.int16)
+        validos = (i >= 0) & (j >= 0)
+        resultado[validos] = self.tratado_aplicable[i[validos], j[validos]]
+        return resultado
+
+# Made with Bob
@@ -1,244 +1,296 @@
-"""
-MÓDULO 3 — Alertas Activas de Inteligencia
-Gestiona y consulta alertas de inteligencia aduanera
-"""
-import pandas as pd
-import json
-from typing import Dict, List, Optional
-from datetime import datetime
-
-
-class GestorAlertas:
-    """Gestiona alertas de inteligencia aduanera"""
-    
-    def __init__(self, data_path: str = "data"):
-        self.data_path = data_path
-        self.alertas_df = pd.read_csv(f"{data_path}/alertas_inteligencia.csv")
-        self.proveedores_df = pd.read_csv(f"{data_path}/proveedores_extranjeros.csv")
-        
-        # Convertir fechas
-        self.alertas_df['fecha_emision'] = pd.to_datetime(self.alertas_df['fecha_emision'])
-        self.alertas_df['fecha_vencimiento'] = pd.to_datetime(
-            self.alertas_df['fecha_vencimiento'], 
-            errors='coerce'
-        )
-        
-        # Parsear JSON
-        self.alertas_df['senales_de_alerta'] = self.alertas_df['senales_de_alerta'].apply(
-            lambda x: json.loads(x) if pd.notna(x) else []
-        )
-    
-    def obtener_alertas_vigentes(self, filtro: Optional[Dict] = None) -> List[Dict]:
-        """
-        Obtiene todas las alertas vigentes, opcionalmente filtradas
-        
-        Args:
-            filtro: Diccionario con criterios de filtrado
-                   - fraccion: Fracción arancelaria
-                   - pais_origen: País de origen
-                   - tipo: Tipo de alerta (TRI, SUB, etc.)
-                   - criticidad: Nivel de criticidad
-        
-        Returns:
-            Lista de alertas vigentes
-        """
-        alertas = self.alertas_df[self.alertas_df['vigente'] == True].copy()
-        
-        # Aplicar filtros si existen
-        if filtro:
-            if 'fraccion' in filtro and filtro['fraccion']:
-                alertas = alertas[alertas['fraccion_arancelaria'] == filtro['fraccion']]
-            
-            if 'pais_origen' in filtro and filtro['pais_origen']:
-                alertas = alertas[alertas['pais_origen_afectado'] == filtro['pais_origen']]
-            
-            if 'tipo' in filtro and filtro['tipo']:
-                alertas = alertas[alertas['codigo_tipo'] == filtro['tipo']]
-            
-            if 'criticidad' in filtro and filtro['criticidad']:
-                alertas = alertas[alertas['nivel_criticidad'] == filtro['criticidad']]
-        
-        # Convertir a lista de diccionarios
-        resultado = []
-        for _, alerta in alertas.iterrows():
-            resultado.append(self._formatear_alerta(alerta))
-        
-        return resultado
-    
-    def buscar_alertas_para_operacion(self, fraccion: str, pais_origen: str,
-                                     proveedor_id: Optional[str] = None) -> Dict:
-        """
-        Busca alertas relevantes para una operación específica
-        
-        Args:
-            fraccion: Fracción arancelaria
-            pais_origen: País de origen
-            proveedor_id: ID del proveedor (opcional)
-        
-        Returns:
-            Diccionario con alertas encontradas y análisis
-        """
-        alertas_encontradas = []
-        
-        # Buscar alertas por fracción
-        alertas_fraccion = self.alertas_df[
-            (self.alertas_df['vigente'] == True) &
-            (self.alertas_df['fraccion_arancelaria'] == fraccion)
-        ]
-        
-        for _, alerta in alertas_fraccion.iterrows():
-            alertas_encontradas.append({
-                **self._formatear_alerta(alerta),
-                "tipo_match": "fraccion"
-            })
-        
-        # Buscar alertas por país
-        alertas_pais = self.alertas_df[
-            (self.alertas_df['vigente'] == True) &
-            (self.alertas_df['pais_origen_afectado'] == pais_origen)
-        ]
-        
-        for _, alerta in alertas_pais.iterrows():
-            if alerta['id_alerta'] not in [a['id_alerta'] for a in alertas_encontradas]:
-                alertas_encontradas.append({
-                    **self._formatear_alerta(alerta),
-                    "tipo_match": "pais"
-                })
-        
-        # Buscar alertas por proveedor
-        if proveedor_id:
-            alertas_proveedor = self.alertas_df[
-                (self.alertas_df['vigente'] == True) &
-                (self.alertas_df['proveedor_extranjero_afectado'] == proveedor_id)
-            ]
-            
-            for _, alerta in alertas_proveedor.iterrows():
-                if alerta['id_alerta'] not in [a['id_alerta'] for a in alertas_encontradas]:
-                    alertas_encontradas.append({
-                        **self._formatear_alerta(alerta),
-                        "tipo_match": "proveedor"
-                    })
-        
-        # Verificar proveedor en lista de observación
-        info_proveedor = None
-        if proveedor_id:
-            info_proveedor = self._verificar_proveedor(proveedor_id)
-        
-        # Calcular nivel de riesgo global
-        nivel_riesgo = self._calcular_riesgo_global(alertas_encontradas, info_proveedor)
-        
-        return {
-            "total_alertas": len(alertas_encontradas),
-            "alertas": alertas_encontradas,
-            "info_proveedor": info_proveedor,
-            "nivel_riesgo_global": nivel_riesgo,
-            "recomendacion": self._generar_recomendacion_alertas(alertas_encontradas, nivel_riesgo)
-        }
-    
-    def _formatear_alerta(self, alerta) -> Dict:
-        """Formatea una alerta para respuesta"""
-        return {
-            "id_alerta": alerta['id_alerta'],
-            "tipo": alerta['codigo_tipo'],
-            "titulo": alerta['titulo_corto'],
-            "descripcion": alerta['descripcion_detallada'],
-            "nivel_criticidad": alerta['nivel_criticidad'],
-            "fraccion": alerta['fraccion_arancelaria'] if pd.notna(alerta['fraccion_arancelaria']) else None,
-            "pais_afectado": alerta['pais_origen_afectado'] if pd.notna(alerta['pais_origen_afectado']) else None,
-            "fecha_emision": alerta['fecha_emision'].strftime('%Y-%m-%d'),
-            "modus_operandi": alerta['modus_operandi'],
-            "senales": alerta['senales_de_alerta'],
-            "accion_recomendada": alerta['accion_recomendada'],
-            "casos_detectados": int(alerta['num_casos_detectados'])
-        }
-    
-    def _verificar_proveedor(self, proveedor_id: str) -> Optional[Dict]:
-        """Verifica el estatus de un proveedor"""
-        proveedor = self.proveedores_df[
-            self.proveedores_df['id_proveedor'] == proveedor_id
-        ]
-        
-        if proveedor.empty:
-            return None
-        
-        prov = proveedor.iloc[0]
-        
-        return {
-            "id": proveedor_id,
-            "nombre": prov['nombre_empresa'],
-            "pais": prov['pais'],
-            "nivel_confianza": prov['nivel_confianza'],
-            "anios_operacion": int(prov['anios_operacion']),
-            "exportaciones_mx": int(prov['historial_exportaciones_mx']),
-            "motivo_observacion": prov['motivo_observacion'] if pd.notna(prov['motivo_observacion']) else None,
-            "relacionado_sancionado": bool(prov['relacionado_con_empresa_sancionada']),
-            "alerta_asociada": prov['asociado_a_alerta_id'] if pd.notna(prov['asociado_a_alerta_id']) else None
-        }
-    
-    def _calcular_riesgo_global(self, alertas: List[Dict], 
-                               info_proveedor: Optional[Dict]) -> str:
-        """Calcula el nivel de riesgo global basado en alertas y proveedor"""
-        # Contar alertas por criticidad
-        criticas = sum(1 for a in alertas if a['nivel_criticidad'] == 'CRITICO')
-        altas = sum(1 for a in alertas if a['nivel_criticidad'] == 'ALTO')
-        
-        # Verificar proveedor
-        proveedor_riesgo = False
-        if info_proveedor:
-            if info_proveedor['nivel_confianza'] == 'LISTA_NEGRA':
-                proveedor_riesgo = True
-            elif info_proveedor['relacionado_sancionado']:
-                proveedor_riesgo = True
-        
-        # Determinar riesgo
-        if criticas > 0 or proveedor_riesgo:
-            return "ROJO"
-        elif altas > 0 or len(alertas) >= 3:
-            return "AMARILLO"
-        elif len(alertas) > 0:
-            return "AMARILLO"
-        else:
-            return "VERDE"
-    
-    def _generar_recomendacion_alertas(self, alertas: List[Dict], 
-                                      nivel_riesgo: str) -> str:
-        """Genera recomendación basada en alertas"""
-        if nivel_riesgo == "ROJO":
-            return "ACCIÓN CRÍTICA: Revisar exhaustivamente. Considerar canal rojo automático."
-        elif nivel_riesgo == "AMARILLO":
-            return "Verificación adicional requerida. Revisar documentación contra señales de alerta."
-        else:
-            return "Sin alertas críticas. Proceder con verificación estándar."
-    
-    def obtener_estadisticas_alertas(self) -> Dict:
-        """Obtiene estadísticas generales de alertas"""
-        alertas_vigentes = self.alertas_df[self.alertas_df['vigente'] == True]
-        
-        return {
-            "total_alertas": len(self.alertas_df),
-            "alertas_vigentes": len(alertas_vigentes),
-            "alertas_vencidas": len(self.alertas_df) - len(alertas_vigentes),
-            "por_tipo": alertas_vigentes['codigo_tipo'].value_counts().to_dict(),
-            "por_criticidad": alertas_vigentes['nivel_criticidad'].value_counts().to_dict(),
-            "casos_totales_detectados": int(alertas_vigentes['num_casos_detectados'].sum())
-        }
-    
-    def obtener_modus_operandi_frecuentes(self, tipo_alerta: Optional[str] = None) -> List[Dict]:
-        """Obtiene los modus operandi más frecuentes"""
-        alertas = self.alertas_df[self.alertas_df['vigente'] == True]
-        
-        if tipo_alerta:
-            alertas = alertas[alertas['codigo_tipo'] == tipo_alerta]
-        
-        resultado = []
-        for _, alerta in alertas.head(10).iterrows():
-            resultado.append({
-                "tipo": alerta['codigo_tipo'],
-                "titulo": alerta['titulo_corto'],
-                "modus_operandi": alerta['modus_operandi'],
-                "casos": int(alerta['num_casos_detectados'])
-            })
-        
-        return resultado
-
-# Made with Bob
+"""
+MÓDULO 3 — Alertas Activas de Inteligencia
+Gestiona y consulta alertas de inteligencia aduanera
+"""
+import pandas as pd
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+
+from .indice_fracciones import IndiceFracciones
+from .red_proveedores import RedProveedores
+from .reglas import RIESGO_ALERTAS
+from .triangulacion import GrafoTriangulacion
+from core import SnapshotDatos, cargar_snapshot, cronometro
+
+
+class GestorAlertas:
+    """Gestiona alertas de inteligencia aduanera"""
+    
+    TABLAS = ("alertas_inteligencia", "proveedores_extranjeros", "pedimentos_historicos")
+    
+    def __init__(self, data_path: str = "data", snapshot: Optional[SnapshotDatos] = None,
+                 red_proveedores: Optional[RedProveedores] = None):
+        snapshot = snapshot or cargar_snapshot(data_path, self.TABLAS)
+        self.data_path = snapshot.data_path
+        self.alertas_df = snapshot['alertas_inteligencia']
+        self.proveedores_df = snapshot['proveedores_extranjeros']
+        
+        # Una alerta sobre una fracción aplica también a sus códigos más específicos
+        self.indice_fracciones = IndiceFracciones(
+            self.alertas_df['fraccion_arancelaria'].dropna().unique()
+        )
+        
+        # Flujos origen → procedencia → importador → proveedor del historial
+        self.grafo_triangulacion = GrafoTriangulacion(snapshot['pedimentos_historicos'])
+        
+        # Red importador–proveedor para rastrear el contagio desde proveedores de riesgo (compartida con el Módulo 1)
+        self.red_proveedores = red_proveedores or RedProveedores(snapshot['pedimentos_historicos'], self.proveedores_df)
+        
+        # Versión del snapshot de datos
+        self.version_datos = snapshot.version
+    
+    def obtener_alertas_vigentes(self, filtro: Optional[Dict] = None) -> List[Dict]:
+        """
+        Obtiene todas las alertas vigentes, opcionalmente filtradas
+        
+        Args:
+            filtro: Diccionario con criterios de filtrado
+                   - fraccion: Fracción arancelaria
+                   - pais_origen: País de origen
+                   - tipo: Tipo de alerta (TRI, SUB, etc.)
+                   - criticidad: Nivel de criticidad
+        
+        Returns:
+            Lista de alertas vigentes
+        """
+        return list(self.iterar_alertas_vigentes(filtro))
+    
+    def iterar_alertas_vigentes(self, filtro: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Genera las alertas vigentes una por una, con los mismos filtros que
+        obtener_alertas_vigentes, sin armar la lista completa en memoria
+        """
+        alertas = self.alertas_df[self.alertas_df['vigente'] == True]
+        
+        # Aplicar filtros si existen
+        if filtro:
+            if 'fraccion' in filtro and filtro['fraccion']:
+                fracciones = self.indice_fracciones.ancestros(filtro['fraccion'])
+                alertas = alertas[alertas['fraccion_arancelaria'].isin(fracciones)]
+            
+            if 'pais_origen' in filtro and filtro['pais_origen']:
+                alertas = alertas[alertas['pais_origen_afectado'] == filtro['pais_origen']]
+            
+            if 'tipo' in filtro and filtro['tipo']:
+                alertas = alertas[alertas['codigo_tipo'] == filtro['tipo']]
+            
+            if 'criticidad' in filtro and filtro['criticidad']:
+                alertas = alertas[alertas['nivel_criticidad'] == filtro['criticidad']]
+        
+        for _, alerta in alertas.iterrows():
+            yield self._formatear_alerta(alerta)
+    
+    def buscar_alertas_para_operacion(self, fraccion: str, pais_origen: str,
+                                     proveedor_id: Optional[str] = None) -> Dict:
+        """
+        Busca alertas relevantes para una operación específica
+        
+        Args:
+            fraccion: Fracción arancelaria
+            pais_origen: País de origen
+            proveedor_id: ID del proveedor (opcional)
+        
+        Returns:
+            Diccionario con alertas encontradas y análisis
+        """
+        etapas = cronometro("alertas")
+        alertas_encontradas = []
+        
+        # Buscar alertas por fracción (o por una fracción más general que la contiene)
+        fracciones = self.indice_fracciones.ancestros(fraccion)
+        alertas_fraccion = self.alertas_df[
+            (self.alertas_df['vigente'] == True) &
+            (self.alertas_df['fraccion_arancelaria'].isin(fracciones))
+        ]
+        
+        for _, alerta in alertas_fraccion.iterrows():
+            alertas_encontradas.append({
+                **self._formatear_alerta(alerta),
+                "tipo_match": "fraccion"
+            })
+        
+        # Buscar alertas por país
+        alertas_pais = self.alertas_df[
+            (self.alertas_df['vigente'] == True) &
+            (self.alertas_df['pais_origen_afectado'] == pais_origen)
+        ]
+        
+        for _, alerta in alertas_pais.iterrows():
+            if alerta['id_alerta'] not in [a['id_alerta'] for a in alertas_encontradas]:
+                alertas_encontradas.append({
+                    **self._formatear_alerta(alerta),
+                    "tipo_match": "pais"
+                })
+        
+        # Buscar alertas por proveedor
+        if proveedor_id:
+            alertas_proveedor = self.alertas_df[
+                (self.alertas_df['vigente'] == True) &
+                (self.alertas_df['proveedor_extranjero_afectado'] == proveedor_id)
+            ]
+            
+            for _, alerta in alertas_proveedor.iterrows():
+                if alerta['id_alerta'] not in [a['id_alerta'] for a in alertas_encontradas]:
+                    alertas_encontradas.append({
+                        **self._formatear_alerta(alerta),
+                        "tipo_match": "proveedor"
+                    })
+        
+        etapas.marcar("busqueda")
+        
+        # Verificar proveedor en lista de observación
+        info_proveedor = None
+        red_proveedor = None
+        if proveedor_id:
+            info_proveedor = self._verificar_proveedor(proveedor_id)
+            red_proveedor = self.red_proveedores.vecindad(proveedor_id)
+        etapas.marcar("proveedor")
+        
+        # Calcular nivel de riesgo global
+        nivel_riesgo = self._calcular_riesgo_global(alertas_encontradas, info_proveedor)
+        triangulacion = self._evaluar_triangulacion(pais_origen, proveedor_id, alertas_encontradas)
+        etapas.marcar("agregacion")
+        
+        resultado = {
+            "total_alertas": len(alertas_encontradas),
+            "alertas": alertas_encontradas,
+            "info_proveedor": info_proveedor,
+            "nivel_riesgo_global": nivel_riesgo,
+            "triangulacion": triangulacion,
+            "red_proveedor": red_proveedor,
+            "recomendacion": self._generar_recomendacion_alertas(alertas_encontradas, nivel_riesgo)
+        }
+        etapas.marcar("formateo")
+        
+        return resultado
+    
+    def _formatear_alerta(self, alerta) -> Dict:
+        """Formatea una alerta para respuesta"""
+        return {
+            "id_alerta": alerta['id_alerta'],
+            "tipo": alerta['codigo_tipo'],
+            "titulo": alerta['titulo_corto'],
+            "descripcion": alerta['descripcion_detallada'],
+            "nivel_criticidad": alerta['nivel_criticidad'],
+            "fraccion": alerta['fraccion_arancelaria'] if pd.notna(alerta['fraccion_arancelaria']) else None,
+            "pais_afectado": alerta['pais_origen_afectado'] if pd.notna(alerta['pais_origen_afectado']) else None,
+            "fecha_emision": alerta['fecha_emision'].strftime('%Y-%m-%d'),
+            "modus_operandi": alerta['modus_operandi'],
+            "senales": alerta['senales_de_alerta'],
+            "accion_recomendada": alerta['accion_recomendada'],
+            "casos_detectados": int(alerta['num_casos_detectados'])
+        }
+    
+    def _verificar_proveedor(self, proveedor_id: str) -> Optional[Dict]:
+        """Verifica el estatus de un proveedor"""
+        proveedor = self.proveedores_df[
+            self.proveedores_df['id_proveedor'] == proveedor_id
+        ]
+        
+        if proveedor.empty:
+            return None
+        
+        prov = proveedor.iloc[0]
+        
+        return {
+            "id": proveedor_id,
+            "nombre": prov['nombre_empresa'],
+            "pais": prov['pais'],
+            "nivel_confianza": prov['nivel_confianza'],
+            "anios_operacion": int(prov['anios_operacion']),
+            "exportaciones_mx": int(prov['historial_exportaciones_mx']),
+            "motivo_observacion": prov['motivo_observacion'] if pd.notna(prov['motivo_observacion']) else None,
+            "relacionado_sancionado": bool(prov['relacionado_con_empresa_sancionada']),
+            "alerta_asociada": prov['asociado_a_alerta_id'] if pd.notna(prov['asociado_a_alerta_id']) else None
+        }
+    
+    def _evaluar_triangulacion(self, pais_origen: str, proveedor_id: Optional[str],
+                               alertas: List[Dict]) -> Dict:
+        """
+        Riesgo de triangulación de la operación según el grafo de flujos
+        
+        ALTO si hay alertas de triangulación (TRI) para la operación y el
+        proveedor ya ha enviado mercancía de ese origen desde terceros
+        países; MEDIO si sólo ocurre una de las dos; BAJO en otro caso.
+        """
+        alertas_tri = [a['id_alerta'] for a in alertas if a['tipo'] == 'TRI']
+        rutas = self.grafo_triangulacion.rutas(pais_origen)
+        total = sum(r['pedimentos'] for r in rutas)
+        via_terceros = [r for r in rutas if r['triangulada']]
+        rutas_proveedor = (
+            self.grafo_triangulacion.por_proveedor(proveedor_id, pais_origen) if proveedor_id else []
+        )
+        
+        senales = bool(alertas_tri) + bool(rutas_proveedor)
+        return {
+            "nivel_riesgo": ("BAJO", "MEDIO", "ALTO")[senales],
+            "alertas_triangulacion": alertas_tri,
+            "pct_origen_via_terceros": round(
+                sum(r['pedimentos'] for r in via_terceros) / total * 100, 1
+            ) if total else 0.0,
+            "paises_procedencia": [r['pais_procedencia'] for r in via_terceros[:5]],
+            "pedimentos_proveedor_via_terceros": sum(r['pedimentos'] for r in rutas_proveedor),
+            "procedencias_proveedor": sorted({r['pais_procedencia'] for r in rutas_proveedor})
+        }
+    
+    def _calcular_riesgo_global(self, alertas: List[Dict], 
+                               info_proveedor: Optional[Dict]) -> str:
+        """Calcula el nivel de riesgo global basado en alertas y proveedor (reglas.RIESGO_ALERTAS)"""
+        # Contar alertas por criticidad
+        criticas = sum(1 for a in alertas if a['nivel_criticidad'] == 'CRITICO')
+        altas = sum(1 for a in alertas if a['nivel_criticidad'] == 'ALTO')
+        
+        # Verificar proveedor
+        proveedor_riesgo = bool(info_proveedor) and (
+            info_proveedor['nivel_confianza'] == 'LISTA_NEGRA' or info_proveedor['relacionado_sancionado']
+        )
+        
+        return RIESGO_ALERTAS.evaluar({
+            "alertas_criticas": criticas,
+            "alertas_altas": altas,
+            "total_alertas": len(alertas),
+            "proveedor_riesgo": proveedor_riesgo
+        })
+    
+    def _generar_recomendacion_alertas(self, alertas: List[Dict], 
+                                      nivel_riesgo: str) -> str:
+        """Genera recomendación basada en alertas"""
+        if nivel_riesgo == "ROJO":
+            return "ACCIÓN CRÍTICA: Revisar exhaustivamente. Considerar canal rojo automático."
+        elif nivel_riesgo == "AMARILLO":
+            return "Verificación adicional requerida. Revisar documentación contra señales de alerta."
+        else:
+            return "Sin alertas críticas. Proceder con verificación estándar."
+    
+    def obtener_estadisticas_alertas(self) -> Dict:
+        """Obtiene estadísticas generales de alertas"""
+        alertas_vigentes = self.alertas_df[self.alertas_df['vigente'] == True]
+        
+        return {
+            "total_alertas": len(self.alertas_df),
+            "alertas_vigentes": len(alertas_vigentes),
+            "alertas_vencidas": len(self.alertas_df) - len(alertas_vigentes),
+            "por_tipo": alertas_vigentes['codigo_tipo'].value_counts().to_dict(),
+            "por_criticidad": alertas_vigentes['nivel_criticidad'].value_counts().to_dict(),
+            "casos_totales_detectados": int(alertas_vigentes['num_casos_detectados'].sum())
+        }
+    
+    def obtener_modus_operandi_frecuentes(self, tipo_alerta: Optional[str] = None) -> List[Dict]:
+        """Obtiene los modus operandi más frecuentes"""
+        alertas = self.alertas_df[self.alertas_df['vigente'] == True]
+        
+        if tipo_alerta:
+            alertas = alertas[alertas['codigo_tipo'] == tipo_alerta]
+        
+        resultado = []
+        for _, alerta in alertas.head(10).iterrows():
+            resultado.append({
+                "tipo": alerta['codigo_tipo'],
+                "titulo": alerta['titulo_corto'],
+                "modus_operandi": alerta['modus_operandi'],
+                "casos": int(alerta['num_casos_detectados'])
+            })
+        
+        return resultado
+
+# Made with Bob
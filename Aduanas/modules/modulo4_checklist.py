@@ -1,342 +1,499 @@
-"""
-MÓDULO 4 — Checklist Regulatorio Personalizado
-Genera checklist dinámico de documentos y regulaciones
-"""
-import pandas as pd
-import json
-from typing import Dict, List, Optional
-
-
-class GeneradorChecklist:
-    """Genera checklist regulatorio personalizado"""
-    
-    def __init__(self, data_path: str = "data"):
-        self.data_path = data_path
-        self.regulaciones_df = pd.read_csv(f"{data_path}/regulaciones_por_fraccion.csv")
-        
-        # Convertir fechas
-        self.regulaciones_df['fecha_ultima_actualizacion'] = pd.to_datetime(
-            self.regulaciones_df['fecha_ultima_actualizacion']
-        )
-        
-        # Parsear JSON
-        self.regulaciones_df['noms_aplicables'] = self.regulaciones_df['noms_aplicables'].apply(
-            lambda x: json.loads(x) if pd.notna(x) else []
-        )
-        self.regulaciones_df['permisos_previos'] = self.regulaciones_df['permisos_previos'].apply(
-            lambda x: json.loads(x) if pd.notna(x) else []
-        )
-        self.regulaciones_df['tratados_aplicables'] = self.regulaciones_df['tratados_aplicables'].apply(
-            lambda x: json.loads(x) if pd.notna(x) else []
-        )
-    
-    def generar_checklist(self, fraccion: str, pais_origen: str,
-                         tipo_importador: str = "regular",
-                         primera_importacion: bool = False) -> Dict:
-        """
-        Genera checklist personalizado para una operación
-        
-        Args:
-            fraccion: Fracción arancelaria
-            pais_origen: País de origen
-            tipo_importador: Tipo de importador (regular, nuevo, certificado)
-            primera_importacion: Si es primera vez que importa esta fracción
-        
-        Returns:
-            Diccionario con checklist completo
-        """
-        # Buscar regulación
-        regulacion = self.regulaciones_df[
-            self.regulaciones_df['fraccion_arancelaria'] == fraccion
-        ]
-        
-        if regulacion.empty:
-            return {
-                "encontrado": False,
-                "mensaje": f"No se encontró regulación para fracción {fraccion}",
-                "fraccion": fraccion,
-                "documentos_basicos": self._documentos_basicos()
-            }
-        
-        reg = regulacion.iloc[0]
-        
-        # Generar documentos obligatorios
-        documentos = self._generar_documentos_obligatorios(reg, pais_origen)
-        
-        # Generar permisos previos
-        permisos = self._generar_permisos_previos(reg)
-        
-        # Generar regulaciones activas
-        regulaciones_activas = self._generar_regulaciones_activas(reg)
-        
-        # Determinar canal sugerido
-        canal_sugerido = self._determinar_canal_sugerido(
-            reg, tipo_importador, primera_importacion
-        )
-        
-        # Contar documentos faltantes (simulado)
-        docs_faltantes = sum(1 for d in documentos if not d['presente'])
-        permisos_faltantes = sum(1 for p in permisos if not p['presente'])
-        
-        return {
-            "encontrado": True,
-            "fraccion": fraccion,
-            "descripcion": reg['descripcion_producto'],
-            "pais_origen": pais_origen,
-            "documentos_obligatorios": documentos,
-            "permisos_previos": permisos,
-            "regulaciones_activas": regulaciones_activas,
-            "noms_aplicables": reg['noms_aplicables'],
-            "tratados_comerciales": reg['tratados_aplicables'],
-            "requiere_certificado_origen": bool(reg['requiere_certificado_origen']),
-            "notas_especiales": reg['notas_especiales'],
-            "fecha_actualizacion": reg['fecha_ultima_actualizacion'].strftime('%Y-%m-%d'),
-            "canal_sugerido": canal_sugerido['canal'],
-            "razon_canal": canal_sugerido['razon'],
-            "documentos_faltantes": docs_faltantes,
-            "permisos_faltantes": permisos_faltantes,
-            "total_requisitos": len(documentos) + len(permisos),
-            "cumplimiento_pct": round(
-                ((len(documentos) + len(permisos) - docs_faltantes - permisos_faltantes) / 
-                 (len(documentos) + len(permisos)) * 100) if (len(documentos) + len(permisos)) > 0 else 100,
-                1
-            )
-        }
-    
-    def _documentos_basicos(self) -> List[Dict]:
-        """Retorna documentos básicos siempre requeridos"""
-        return [
-            {
-                "nombre": "Factura comercial",
-                "obligatorio": True,
-                "critico": True,
-                "presente": True,
-                "notas": "Debe incluir valor unitario desglosado"
-            },
-            {
-                "nombre": "Lista de empaque (packing list)",
-                "obligatorio": True,
-                "critico": False,
-                "presente": True,
-                "notas": None
-            },
-            {
-                "nombre": "Conocimiento de embarque",
-                "obligatorio": True,
-                "critico": True,
-                "presente": True,
-                "notas": "Bill of lading o guía aérea"
-            }
-        ]
-    
-    def _generar_documentos_obligatorios(self, reg, pais_origen: str) -> List[Dict]:
-        """Genera lista de documentos obligatorios"""
-        documentos = self._documentos_basicos()
-        
-        # Certificado de origen
-        if reg['requiere_certificado_origen']:
-            tratados = reg['tratados_aplicables']
-            if tratados and len(tratados) > 0:
-                notas = f"Certificado de origen {tratados[0]} o declaración en factura"
-            else:
-                notas = "Certificado de origen requerido"
-            
-            documentos.append({
-                "nombre": "Certificado de origen",
-                "obligatorio": True,
-                "critico": True,
-                "presente": False,  # Simulado como faltante
-                "notas": notas
-            })
-        
-        # Documentos específicos por regulación
-        if reg['requiere_cofepris']:
-            documentos.append({
-                "nombre": "Registro sanitario COFEPRIS vigente",
-                "obligatorio": True,
-                "critico": True,
-                "presente": False,
-                "notas": "Debe tener menos de 5 años de antigüedad"
-            })
-            
-            documentos.append({
-                "nombre": "Certificado de análisis del lote",
-                "obligatorio": True,
-                "critico": False,
-                "presente": False,
-                "notas": "Análisis microbiológico y fisicoquímico"
-            })
-        
-        if reg['requiere_senasica']:
-            documentos.append({
-                "nombre": "Certificado zoosanitario/fitosanitario",
-                "obligatorio": True,
-                "critico": True,
-                "presente": False,
-                "notas": "Emitido por autoridad del país de origen"
-            })
-        
-        if reg['requiere_semarnat']:
-            documentos.append({
-                "nombre": "Certificado CITES (si aplica)",
-                "obligatorio": False,
-                "critico": True,
-                "presente": False,
-                "notas": "Solo si el producto está en lista CITES"
-            })
-        
-        if reg['requiere_sedena']:
-            documentos.append({
-                "nombre": "Permiso SEDENA",
-                "obligatorio": True,
-                "critico": True,
-                "presente": False,
-                "notas": "CRÍTICO: Autorización previa obligatoria"
-            })
-        
-        # Etiquetado
-        if reg['requiere_cofepris'] or 'NOM-051' in str(reg['noms_aplicables']):
-            documentos.append({
-                "nombre": "Etiquetado en español verificado",
-                "obligatorio": True,
-                "critico": False,
-                "presente": False,
-                "notas": "Debe cumplir NOM vigente"
-            })
-        
-        return documentos
-    
-    def _generar_permisos_previos(self, reg) -> List[Dict]:
-        """Genera lista de permisos previos requeridos"""
-        permisos = []
-        
-        for permiso in reg['permisos_previos']:
-            permisos.append({
-                "nombre": permiso,
-                "obligatorio": True,
-                "critico": True,
-                "presente": False,
-                "notas": "Debe obtenerse ANTES de la importación"
-            })
-        
-        return permisos
-    
-    def _generar_regulaciones_activas(self, reg) -> List[str]:
-        """Genera lista de regulaciones activas"""
-        regulaciones = []
-        
-        # NOMs
-        for nom in reg['noms_aplicables']:
-            regulaciones.append(f"NOM aplicable: {nom}")
-        
-        # Permisos
-        if reg['requiere_cofepris']:
-            regulaciones.append("Regulación COFEPRIS activa")
-        
-        if reg['requiere_senasica']:
-            regulaciones.append("Regulación SENASICA activa")
-        
-        if reg['requiere_semarnat']:
-            regulaciones.append("Regulación SEMARNAT activa")
-        
-        if reg['requiere_sedena']:
-            regulaciones.append("Regulación SEDENA activa - CRÍTICO")
-        
-        # Notas especiales
-        if reg['notas_especiales'] and reg['notas_especiales'] != "Sin notas especiales":
-            regulaciones.append(f"Nota especial: {reg['notas_especiales']}")
-        
-        return regulaciones
-    
-    def _determinar_canal_sugerido(self, reg, tipo_importador: str,
-                                   primera_importacion: bool) -> Dict:
-        """Determina el canal de desaduanamiento sugerido"""
-        # Canal por defecto de la regulación
-        canal_base = reg['canal_sugerido_default']
-        
-        # Ajustar según contexto
-        razones = []
-        
-        if reg['requiere_sedena']:
-            return {
-                "canal": "ROJO",
-                "razon": "Producto requiere permiso SEDENA - Reconocimiento obligatorio"
-            }
-        
-        if primera_importacion:
-            razones.append("Primera importación de esta fracción")
-            if canal_base == "VERDE":
-                canal_base = "AMARILLO"
-        
-        if tipo_importador == "nuevo":
-            razones.append("Importador nuevo en el sistema")
-            if canal_base == "VERDE":
-                canal_base = "AMARILLO"
-        
-        if reg['requiere_cofepris'] or reg['requiere_senasica']:
-            razones.append("Producto regulado sanitariamente")
-        
-        if len(reg['noms_aplicables']) > 2:
-            razones.append(f"Múltiples NOMs aplicables ({len(reg['noms_aplicables'])})")
-        
-        if not razones:
-            if canal_base == "VERDE":
-                razones.append("Producto sin regulaciones especiales, importador confiable")
-            elif canal_base == "AMARILLO":
-                razones.append("Verificación documental recomendada")
-            else:
-                razones.append("Producto de alto riesgo o regulación estricta")
-        
-        return {
-            "canal": canal_base,
-            "razon": " | ".join(razones)
-        }
-    
-    def verificar_cumplimiento_noms(self, fraccion: str) -> Dict:
-        """Verifica las NOMs aplicables a una fracción"""
-        regulacion = self.regulaciones_df[
-            self.regulaciones_df['fraccion_arancelaria'] == fraccion
-        ]
-        
-        if regulacion.empty:
-            return {"encontrado": False, "fraccion": fraccion}
-        
-        reg = regulacion.iloc[0]
-        
-        return {
-            "encontrado": True,
-            "fraccion": fraccion,
-            "descripcion": reg['descripcion_producto'],
-            "noms_aplicables": reg['noms_aplicables'],
-            "total_noms": len(reg['noms_aplicables']),
-            "fecha_actualizacion": reg['fecha_ultima_actualizacion'].strftime('%Y-%m-%d'),
-            "requiere_certificacion": len(reg['noms_aplicables']) > 0
-        }
-    
-    def obtener_tratados_comerciales(self, pais_origen: str) -> Dict:
-        """Obtiene información sobre tratados comerciales aplicables"""
-        # Mapeo simplificado de países a tratados
-        tratados_por_pais = {
-            "Estados Unidos": ["T-MEC"],
-            "Canadá": ["T-MEC"],
-            "Alemania": ["TLCUE"],
-            "España": ["TLCUE"],
-            "Italia": ["TLCUE"],
-            "Francia": ["TLCUE"],
-            "Japón": ["AAE México-Japón"],
-            "Corea del Sur": ["TLC México-Corea"],
-            "Chile": ["TLC México-Chile"],
-            "Colombia": ["Alianza del Pacífico"],
-            "Perú": ["Alianza del Pacífico"]
-        }
-        
-        tratados = tratados_por_pais.get(pais_origen, [])
-        
-        return {
-            "pais": pais_origen,
-            "tratados_aplicables": tratados,
-            "tiene_tratado": len(tratados) > 0,
-            "beneficios": "Arancel preferencial disponible" if len(tratados) > 0 else "Sin tratado comercial"
-        }
-
-# Made with Bob
+"""
+MÓDULO 4 — Checklist Regulatorio Personalizado
+Genera checklist dinámico de documentos y regulaciones
+"""
+import pandas as pd
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from .indice_fracciones import IndiceFracciones
+from .consulta_regulatoria import IndiceRegulatorio
+from .matriz_tratados import MatrizTratados
+from core import SnapshotDatos, cargar_snapshot, cronometro
+
+
+@dataclass(frozen=True)
+class PlantillaChecklist:
+    """Checklist base inmutable de una fracción, compilado al cargar las regulaciones"""
+    fraccion: str
+    descripcion: str
+    documentos: Tuple[MappingProxyType, ...]
+    permisos: Tuple[MappingProxyType, ...]
+    regulaciones_activas: Tuple[str, ...]
+    noms_aplicables: Tuple[str, ...]
+    tratados_comerciales: Tuple[str, ...]
+    requiere_certificado_origen: bool
+    notas_especiales: str
+    fecha_actualizacion: str
+    canal_base: str
+    requiere_sedena: bool
+    razones_regulatorias: Tuple[str, ...]
+    documentos_faltantes: int
+    permisos_faltantes: int
+    cumplimiento_pct: float
+    banderas: frozenset
+
+
+class GeneradorChecklist:
+    """Genera checklist regulatorio personalizado"""
+    
+    # Bandera regulatoria -> columna booleana de regulaciones_por_fraccion
+    BANDERAS_REGULATORIAS = {
+        "COFEPRIS": 'requiere_cofepris',
+        "SENASICA": 'requiere_senasica',
+        "SEMARNAT": 'requiere_semarnat',
+        "SEDENA": 'requiere_sedena',
+        "CERTIFICADO_ORIGEN": 'requiere_certificado_origen'
+    }
+    
+    TABLAS = ("regulaciones_por_fraccion", "tratados_comerciales")
+    
+    def __init__(self, data_path: str = "data", snapshot: Optional[SnapshotDatos] = None):
+        snapshot = snapshot or cargar_snapshot(data_path, self.TABLAS)
+        self.data_path = snapshot.data_path
+        self.regulaciones_df = snapshot['regulaciones_por_fraccion']
+        
+        # Compilar una plantilla por fracción (primera regulación registrada)
+        self.plantillas = self._compilar_plantillas()
+        self.indice_fracciones = IndiceFracciones(self.plantillas)
+        self.indice_regulatorio = IndiceRegulatorio(
+            {fraccion: plantilla.banderas for fraccion, plantilla in self.plantillas.items()},
+            vocabulario=self.BANDERAS_REGULATORIAS
+        )
+        
+        # Matriz país × fracción de tratados aplicables
+        self.tratados_df = snapshot['tratados_comerciales']
+        self.matriz_tratados = MatrizTratados(
+            self.tratados_df.groupby('tratado', sort=False)['pais'].agg(list).to_dict(),
+            {fraccion: plantilla.tratados_comerciales for fraccion, plantilla in self.plantillas.items()}
+        )
+        
+        # Versión del snapshot de datos
+        self.version_datos = snapshot.version
+    
+    def _compilar_plantillas(self) -> Dict[str, PlantillaChecklist]:
+        """Precompila documentos, permisos y regulaciones de cada fracción"""
+        plantillas = {}
+        regulaciones = self.regulaciones_df.drop_duplicates('fraccion_arancelaria', keep='first')
+        
+        for _, reg in regulaciones.iterrows():
+            documentos = self._generar_documentos_obligatorios(reg)
+            permisos = self._generar_permisos_previos(reg)
+            
+            # Contar documentos faltantes (simulado)
+            docs_faltantes = sum(1 for d in documentos if not d['presente'])
+            permisos_faltantes = sum(1 for p in permisos if not p['presente'])
+            total_requisitos = len(documentos) + len(permisos)
+            
+            plantillas[reg['fraccion_arancelaria']] = PlantillaChecklist(
+                fraccion=reg['fraccion_arancelaria'],
+                descripcion=reg['descripcion_producto'],
+                documentos=tuple(MappingProxyType(d) for d in documentos),
+                permisos=tuple(MappingProxyType(p) for p in permisos),
+                regulaciones_activas=tuple(self._generar_regulaciones_activas(reg)),
+                noms_aplicables=tuple(reg['noms_aplicables']),
+                tratados_comerciales=tuple(reg['tratados_aplicables']),
+                requiere_certificado_origen=bool(reg['requiere_certificado_origen']),
+                notas_especiales=reg['notas_especiales'],
+                fecha_actualizacion=reg['fecha_ultima_actualizacion'].strftime('%Y-%m-%d'),
+                canal_base=reg['canal_sugerido_default'],
+                requiere_sedena=bool(reg['requiere_sedena']),
+                razones_regulatorias=tuple(self._generar_razones_regulatorias(reg)),
+                documentos_faltantes=docs_faltantes,
+                permisos_faltantes=permisos_faltantes,
+                cumplimiento_pct=round(
+                    ((total_requisitos - docs_faltantes - permisos_faltantes) / 
+                     total_requisitos * 100) if total_requisitos > 0 else 100,
+                    1
+                ),
+                banderas=self._generar_banderas(reg)
+            )
+        
+        return plantillas
+    
+    def _generar_banderas(self, reg) -> frozenset:
+        """Banderas regulatorias de una fracción: dependencias, certificado de origen y NOMs"""
+        banderas = {
+            bandera for bandera, columna in self.BANDERAS_REGULATORIAS.items()
+            if reg[columna]
+        }
+        banderas.update(nom.upper() for nom in reg['noms_aplicables'])
+        return frozenset(banderas)
+    
+    def generar_checklist(self, fraccion: str, pais_origen: str,
+                         tipo_importador: str = "regular",
+                         primera_importacion: bool = False) -> Dict:
+        """
+        Genera checklist personalizado para una operación
+        
+        Args:
+            fraccion: Fracción arancelaria
+            pais_origen: País de origen
+            tipo_importador: Tipo de importador (regular, nuevo, certificado)
+            primera_importacion: Si es primera vez que importa esta fracción
+        
+        Returns:
+            Diccionario con checklist completo
+        """
+        etapas = cronometro("checklist")
+        
+        # Resolver la fracción (o su ancestro más cercano) y tomar su plantilla
+        resolucion = self.indice_fracciones.resolver(fraccion)
+        
+        if resolucion is None:
+            return {
+                "encontrado": False,
+                "mensaje": f"No se encontró regulación para fracción {fraccion}",
+                "fraccion": fraccion,
+                "documentos_basicos": self._documentos_basicos()
+            }
+        
+        plantilla = self.plantillas[resolucion.fraccion]
+        etapas.marcar("busqueda")
+        
+        # Determinar canal sugerido y tratado aplicable (ajustes dependientes de la operación)
+        canal_sugerido = self._determinar_canal_sugerido(
+            plantilla, tipo_importador, primera_importacion
+        )
+        tratado = self.matriz_tratados.consultar(pais_origen, resolucion.fraccion)
+        etapas.marcar("agregacion")
+        
+        resultado = {
+            "encontrado": True,
+            "fraccion": fraccion,
+            "fraccion_resuelta": resolucion.fraccion,
+            "coincidencia_fraccion": resolucion.coincidencia,
+            "descripcion": plantilla.descripcion,
+            "pais_origen": pais_origen,
+            "documentos_obligatorios": [dict(d) for d in plantilla.documentos],
+            "permisos_previos": [dict(p) for p in plantilla.permisos],
+            "regulaciones_activas": list(plantilla.regulaciones_activas),
+            "noms_aplicables": list(plantilla.noms_aplicables),
+            "tratados_comerciales": list(plantilla.tratados_comerciales),
+            "trato_preferencial": {
+                "elegible": tratado is not None,
+                "tratado": tratado
+            },
+            "requiere_certificado_origen": plantilla.requiere_certificado_origen,
+            "notas_especiales": plantilla.notas_especiales,
+            "fecha_actualizacion": plantilla.fecha_actualizacion,
+            "canal_sugerido": canal_sugerido['canal'],
+            "razon_canal": canal_sugerido['razon'],
+            "documentos_faltantes": plantilla.documentos_faltantes,
+            "permisos_faltantes": plantilla.permisos_faltantes,
+            "total_requisitos": len(plantilla.documentos) + len(plantilla.permisos),
+            "cumplimiento_pct": plantilla.cumplimiento_pct
+        }
+        etapas.marcar("formateo")
+        
+        return resultado
+    
+    def _documentos_basicos(self) -> List[Dict]:
+        """Retorna documentos básicos siempre requeridos"""
+        return [
+            {
+                "nombre": "Factura comercial",
+                "obligatorio": True,
+                "critico": True,
+                "presente": True,
+                "notas": "Debe incluir valor unitario desglosado"
+            },
+            {
+                "nombre": "Lista de empaque (packing list)",
+                "obligatorio": True,
+                "critico": False,
+                "presente": True,
+                "notas": None
+            },
+            {
+                "nombre": "Conocimiento de embarque",
+                "obligatorio": True,
+                "critico": True,
+                "presente": True,
+                "notas": "Bill of lading o guía aérea"
+            }
+        ]
+    
+    def _generar_documentos_obligatorios(self, reg) -> List[Dict]:
+        """Genera lista de documentos obligatorios"""
+        documentos = self._documentos_basicos()
+        
+        # Certificado de origen
+        if reg['requiere_certificado_origen']:
+            tratados = reg['tratados_aplicables']
+            if tratados and len(tratados) > 0:
+                notas = f"Certificado de origen {tratados[0]} o declaración en factura"
+            else:
+                notas = "Certificado de origen requerido"
+            
+            documentos.append({
+                "nombre": "Certificado de origen",
+                "obligatorio": True,
+                "critico": True,
+                "presente": False,  # Simulado como faltante
+                "notas": notas
+            })
+        
+        # Documentos específicos por regulación
+        if reg['requiere_cofepris']:
+            documentos.append({
+                "nombre": "Registro sanitario COFEPRIS vigente",
+                "obligatorio": True,
+                "critico": True,
+                "presente": False,
+                "notas": "Debe tener menos de 5 años de antigüedad"
+            })
+            
+            documentos.append({
+                "nombre": "Certificado de análisis del lote",
+                "obligatorio": True,
+                "critico": False,
+                "presente": False,
+                "notas": "Análisis microbiológico y fisicoquímico"
+            })
+        
+        if reg['requiere_senasica']:
+            documentos.append({
+                "nombre": "Certificado zoosanitario/fitosanitario",
+                "obligatorio": True,
+                "critico": True,
+                "presente": False,
+                "notas": "Emitido por autoridad del país de origen"
+            })
+        
+        if reg['requiere_semarnat']:
+            documentos.append({
+                "nombre": "Certificado CITES (si aplica)",
+                "obligatorio": False,
+                "critico": True,
+                "presente": False,
+                "notas": "Solo si el producto está en lista CITES"
+            })
+        
+        if reg['requiere_sedena']:
+            documentos.append({
+                "nombre": "Permiso SEDENA",
+                "obligatorio": True,
+                "critico": True,
+                "presente": False,
+                "notas": "CRÍTICO: Autorización previa obligatoria"
+            })
+        
+        # Etiquetado
+        if reg['requiere_cofepris'] or 'NOM-051' in str(reg['noms_aplicables']):
+            documentos.append({
+                "nombre": "Etiquetado en español verificado",
+                "obligatorio": True,
+                "critico": False,
+                "presente": False,
+                "notas": "Debe cumplir NOM vigente"
+            })
+        
+        return documentos
+    
+    def _generar_permisos_previos(self, reg) -> List[Dict]:
+        """Genera lista de permisos previos requeridos"""
+        permisos = []
+        
+        for permiso in reg['permisos_previos']:
+            permisos.append({
+                "nombre": permiso,
+                "obligatorio": True,
+                "critico": True,
+                "presente": False,
+                "notas": "Debe obtenerse ANTES de la importación"
+            })
+        
+        return permisos
+    
+    def _generar_regulaciones_activas(self, reg) -> List[str]:
+        """Genera lista de regulaciones activas"""
+        regulaciones = []
+        
+        # NOMs
+        for nom in reg['noms_aplicables']:
+            regulaciones.append(f"NOM aplicable: {nom}")
+        
+        # Permisos
+        if reg['requiere_cofepris']:
+            regulaciones.append("Regulación COFEPRIS activa")
+        
+        if reg['requiere_senasica']:
+            regulaciones.append("Regulación SENASICA activa")
+        
+        if reg['requiere_semarnat']:
+            regulaciones.append("Regulación SEMARNAT activa")
+        
+        if reg['requiere_sedena']:
+            regulaciones.append("Regulación SEDENA activa - CRÍTICO")
+        
+        # Notas especiales
+        if reg['notas_especiales'] and reg['notas_especiales'] != "Sin notas especiales":
+            regulaciones.append(f"Nota especial: {reg['notas_especiales']}")
+        
+        return regulaciones
+    
+    def _generar_razones_regulatorias(self, reg) -> List[str]:
+        """Genera las razones de canal que dependen solo de la regulación"""
+        razones = []
+        
+        if reg['requiere_cofepris'] or reg['requiere_senasica']:
+            razones.append("Producto regulado sanitariamente")
+        
+        if len(reg['noms_aplicables']) > 2:
+            razones.append(f"Múltiples NOMs aplicables ({len(reg['noms_aplicables'])})")
+        
+        return razones
+    
+    def _determinar_canal_sugerido(self, plantilla: PlantillaChecklist, tipo_importador: str,
+                                   primera_importacion: bool) -> Dict:
+        """Determina el canal de desaduanamiento sugerido"""
+        # Canal por defecto de la regulación
+        canal_base = plantilla.canal_base
+        
+        # Ajustar según contexto
+        razones = []
+        
+        if plantilla.requiere_sedena:
+            return {
+                "canal": "ROJO",
+                "razon": "Producto requiere permiso SEDENA - Reconocimiento obligatorio"
+            }
+        
+        if primera_importacion:
+            razones.append("Primera importación de esta fracción")
+            if canal_base == "VERDE":
+                canal_base = "AMARILLO"
+        
+        if tipo_importador == "nuevo":
+            razones.append("Importador nuevo en el sistema")
+            if canal_base == "VERDE":
+                canal_base = "AMARILLO"
+        
+        razones.extend(plantilla.razones_regulatorias)
+        
+        if not razones:
+            if canal_base == "VERDE":
+                razones.append("Producto sin regulaciones especiales, importador confiable")
+            elif canal_base == "AMARILLO":
+                razones.append("Verificación documental recomendada")
+            else:
+                razones.append("Producto de alto riesgo o regulación estricta")
+        
+        return {
+            "canal": canal_base,
+            "razon": " | ".join(razones)
+        }
+    
+    def verificar_cumplimiento_noms(self, fraccion: str) -> Dict:
+        """Verifica las NOMs aplicables a una fracción"""
+        resolucion = self.indice_fracciones.resolver(fraccion)
+        
+        if resolucion is None:
+            return {"encontrado": False, "fraccion": fraccion}
+        
+        plantilla = self.plantillas[resolucion.fraccion]
+        
+        return {
+            "encontrado": True,
+            "fraccion": fraccion,
+            "fraccion_resuelta": resolucion.fraccion,
+            "coincidencia_fraccion": resolucion.coincidencia,
+            "descripcion": plantilla.descripcion,
+            "noms_aplicables": list(plantilla.noms_aplicables),
+            "total_noms": len(plantilla.noms_aplicables),
+            "fecha_actualizacion": plantilla.fecha_actualizacion,
+            "requiere_certificacion": len(plantilla.noms_aplicables) > 0
+        }
+    
+    def consultar_regulaciones(self, expresion: str) -> Dict:
+        """
+        Filtra fracciones con una expresión booleana sobre banderas regulatorias
+        
+        Args:
+            expresion: Ej. "COFEPRIS AND SENASICA AND NOT SEDENA"
+        
+        Returns:
+            Diccionario con las fracciones que cumplen la expresión
+        """
+        try:
+            bits = self.indice_regulatorio.evaluar(expresion)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "banderas_disponibles": self.indice_regulatorio.banderas_disponibles()
+            }
+        
+        fracciones = self.indice_regulatorio.fracciones_de(bits)
+        
+        return {
+            "expresion": expresion,
+            "total": len(fracciones),
+            "fracciones": [
+                {
+                    "fraccion": fraccion,
+                    "descripcion": self.plantillas[fraccion].descripcion,
+                    "banderas": self.indice_regulatorio.banderas_de(fraccion)
+                }
+                for fraccion in fracciones
+            ]
+        }
+    
+    def obtener_tratados_comerciales(self, pais_origen: str) -> Dict:
+        """Obtiene información sobre tratados comerciales aplicables"""
+        tratados = self.matriz_tratados.tratados_de_pais(pais_origen)
+        fracciones = self.matriz_tratados.fracciones_elegibles(pais_origen)
+        
+        return {
+            "pais": pais_origen,
+            "tratados_aplicables": tratados,
+            "tiene_tratado": len(tratados) > 0,
+            "beneficios": "Arancel preferencial disponible" if len(tratados) > 0 else "Sin tratado comercial",
+            "total_fracciones_elegibles": len(fracciones),
+            "fracciones_elegibles": fracciones
+        }
+    
+    def evaluar_tratados_factura(self, partidas: List[Dict]) -> Dict:
+        """
+        Evalúa la elegibilidad a trato preferencial de todas las partidas de una factura
+        
+        Args:
+            partidas: Lista de partidas con fraccion, pais_origen y valor_usd
+        
+        Returns:
+            Diccionario con la elegibilidad por partida y el resumen de la factura
+        """
+        resoluciones = [self.indice_fracciones.resolver(p['fraccion']) for p in partidas]
+        tratados = self.matriz_tratados.consultar_lote(
+            [p['pais_origen'] for p in partidas],
+            [r.fraccion if r else None for r in resoluciones]
+        )
+        
+        resultado = []
+        for partida, resolucion, tratado in zip(partidas, resoluciones, tratados):
+            elegible = tratado != MatrizTratados.SIN_TRATADO
+            resultado.append({
+                "fraccion": partida['fraccion'],
+                "fraccion_resuelta": resolucion.fraccion if resolucion else None,
+                "pais_origen": partida['pais_origen'],
+                "valor_usd": partida.get('valor_usd', 0),
+                "elegible": bool(elegible),
+                "tratado": self.matriz_tratados.tratados[tratado] if elegible else None
+            })
+        
+        elegibles = [p for p in resultado if p['elegible']]
+        tratados_usados = {}
+        for partida in elegibles:
+            tratados_usados[partida['tratado']] = tratados_usados.get(partida['tratado'], 0) + 1
+        
+        return {
+            "total_partidas": len(resultado),
+            "partidas_elegibles": len(elegibles),
+            "valor_total_usd": round(sum(p['valor_usd'] for p in resultado), 2),
+            "valor_elegible_usd": round(sum(p['valor_usd'] for p in elegibles), 2),
+            "tratados_utilizados": tratados_usados,
+            "partidas": resultado
+        }
+
+# Made with Bob
@@ -0,0 +1,236 @@
+"""
+Peso por Unidad
+Mediana y MAD del peso bruto por unidad de cada fracción, para detectar mercancía mal clasificada
+"""
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core import SnapshotDatos
+
+COLUMNAS = ["num_pedimento", "rfc_importador", "fecha_pago", "fraccion_arancelaria", "peso_bruto_kg", "cantidad"]
+
+# Puntaje z robusto (Iglewicz y Hoaglin): 0.6745 · (x - mediana) / MAD
+FACTOR_MAD = 0.6745
+
+
+def _estadisticas(fracciones: pd.Series, pesos: pd.Series) -> pd.DataFrame:
+    """Mediana, MAD y número de pedimentos del peso por unidad de cada fracción"""
+    agrupado = pesos.groupby(fracciones)
+    mediana = agrupado.transform('median')
+    return pd.DataFrame({
+        "mediana": agrupado.median(),
+        "mad": (pesos - mediana).abs().groupby(fracciones).median(),
+        "pedimentos": agrupado.size()
+    })
+
+
+def _peso_por_unidad(pedimentos: pd.DataFrame) -> pd.Series:
+    """Peso bruto por unidad (NaN si la cantidad no es positiva)"""
+    cantidad = pedimentos['cantidad'].to_numpy(dtype=float)
+    pesos = np.full(len(cantidad), np.nan)
+    np.divide(pedimentos['peso_bruto_kg'].to_numpy(dtype=float), cantidad, out=pesos, where=cantidad > 0)
+    return pd.Series(pesos, index=pedimentos.index)
+
+
+class EstadisticasPeso:
+    """
+    Peso bruto por unidad de cada fracción (mediana y MAD)
+    
+    Un pedimento es atípico cuando su puntaje z robusto supera UMBRAL_PUNTAJE
+    en valor absoluto; las fracciones con menos de MINIMO_PEDIMENTOS no se
+    evalúan. Los pedimentos que llegan después (ingerir) sólo recalculan las
+    fracciones que tocan y se conservan en memoria hasta la siguiente
+    recarga de datos.
+    """
+    
+    UMBRAL_PUNTAJE = 3.5
+    MINIMO_PEDIMENTOS = 10
+    
+    def __init__(self, pedimentos_df: pd.DataFrame, umbral_puntaje: float = UMBRAL_PUNTAJE,
+                 minimo_pedimentos: int = MINIMO_PEDIMENTOS):
+        self.umbral_puntaje = umbral_puntaje
+        self.minimo_pedimentos = minimo_pedimentos
+        
+        pesos = _peso_por_unidad(pedimentos_df)
+        validos = pesos.notna()
+        fracciones = pedimentos_df.loc[validos, 'fraccion_arancelaria']
+        self.tabla = _estadisticas(fracciones, pesos[validos])
+        
+        # Pesos por fracción, para recalcular sólo las fracciones que se ingieren
+        self._pesos: Dict[str, np.ndarray] = {
+            fraccion: valores.to_numpy() for fraccion, valores in pesos[validos].groupby(fracciones)
+        }
+        self._numeros = set(pedimentos_df['num_pedimento'])
+        self._ingestados: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def desde_snapshot(cls, snapshot: SnapshotDatos) -> "EstadisticasPeso":
+        """Estadísticas del historial de pedimentos de un snapshot"""
+        return cls(snapshot['pedimentos_historicos'])
+    
+    def _puntajes(self, pedimentos: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Columnas de puntajes() como arreglos"""
+        tabla = self.tabla
+        posicion = tabla.index.get_indexer(pedimentos['fraccion_arancelaria'])
+        encontrada = posicion >= 0
+        
+        def referencia(columna: str) -> np.ndarray:
+            return np.where(encontrada, tabla[columna].to_numpy()[posicion], np.nan)
+        
+        mediana, mad, conteo = referencia('mediana'), referencia('mad'), referencia('pedimentos')
+        pesos = _peso_por_unidad(pedimentos).to_numpy()
+        
+        desviacion = pesos - mediana
+        evaluable = (conteo >= self.minimo_pedimentos) & ~np.isnan(pesos)
+        # Con MAD = 0 cualquier diferencia con la mediana es atípica
+        with np.errstate(divide='ignore', invalid='ignore'):
+            puntaje = np.where(evaluable & (mad > 0), FACTOR_MAD * desviacion / mad, np.nan)
+        anomalo = evaluable & ((np.abs(puntaje) > self.umbral_puntaje) | ((mad == 0) & (desviacion != 0)))
+        return {
+            "peso_por_unidad": pesos,
+            "mediana_fraccion": mediana,
+            "mad_fraccion": mad,
+            "puntaje": puntaje,
+            "anomalo": anomalo
+        }
+    
+    def puntajes(self, pedimentos: pd.DataFrame) -> pd.DataFrame:
+        """
+        Peso por unidad, referencia de su fracción y puntaje de cada pedimento
+        
+        Returns:
+            Mismo índice que pedimentos; el puntaje es NaN si la fracción no
+            tiene suficientes pedimentos, y la columna anomalo sólo es True
+            para pedimentos evaluados
+        """
+        return pd.DataFrame(self._puntajes(pedimentos), index=pedimentos.index)
+    
+    def anomalias(self, pedimentos: pd.DataFrame) -> List[Dict]:
+        """Pedimentos con peso por unidad atípico para su fracción, del puntaje más alto al más bajo"""
+        columnas = self._puntajes(pedimentos)
+        posiciones = np.flatnonzero(columnas["anomalo"])
+        if not len(posiciones):
+            return []
+        posiciones = posiciones[np.argsort(-np.nan_to_num(np.abs(columnas["puntaje"][posiciones]), nan=np.inf), kind='stable')]
+        atipicos = pd.DataFrame({nombre: valores[posiciones] for nombre, valores in columnas.items()})
+        filas = pedimentos.iloc[posiciones]
+        return [
+            {
+                "num_pedimento": numero,
+                "fecha_pago": pd.Timestamp(fecha).strftime('%Y-%m-%d'),
+                "fraccion": fraccion,
+                **self._formatear(fila)
+            }
+            for numero, fecha, fraccion, (_, fila) in zip(
+                filas['num_pedimento'], filas['fecha_pago'], filas['fraccion_arancelaria'], atipicos.iterrows()
+            )
+        ]
+    
+    def evaluar(self, fraccion: str, peso_bruto_kg: Optional[float], cantidad: int) -> Dict:
+        """
+        Peso por unidad de una operación contra la referencia de su fracción
+        
+        Sin peso, devuelve sólo la referencia de la fracción (anomalo = None)
+        """
+        referencia = self.tabla.loc[fraccion] if fraccion in self.tabla.index else None
+        if referencia is None or referencia['pedimentos'] < self.minimo_pedimentos:
+            return {
+                "evaluado": False,
+                "mensaje": f"Sin suficientes pedimentos de la fracción {fraccion} para el peso por unidad",
+                "anomalo": None
+            }
+        if peso_bruto_kg is None:
+            return {
+                "evaluado": False,
+                "mediana_fraccion": round(float(referencia['mediana']), 4),
+                "mad_fraccion": round(float(referencia['mad']), 4),
+                "pedimentos_referencia": int(referencia['pedimentos']),
+                "anomalo": None
+            }
+        
+        operacion = pd.DataFrame({
+            "fraccion_arancelaria": [fraccion],
+            "peso_bruto_kg": [peso_bruto_kg],
+            "cantidad": [cantidad]
+        })
+        return {
+            "evaluado": True,
+            **self._formatear(self.puntajes(operacion).iloc[0]),
+            "pedimentos_referencia": int(referencia['pedimentos'])
+        }
+    
+    @staticmethod
+    def _formatear(fila: pd.Series) -> Dict:
+        """Peso, referencia y puntaje de un pedimento para la respuesta"""
+        return {
+            "peso_por_unidad": round(float(fila['peso_por_unidad']), 4),
+            "mediana_fraccion": round(float(fila['mediana_fraccion']), 4),
+            "mad_fraccion": round(float(fila['mad_fraccion']), 4),
+            "puntaje": round(float(fila['puntaje']), 2) if pd.notna(fila['puntaje']) else None,
+            "anomalo": bool(fila['anomalo'])
+        }
+    
+    def ingerir(self, pedimentos: pd.DataFrame) -> Dict:
+        """
+        Agrega pedimentos nuevos y recalcula sólo las fracciones que tocan
+        
+        Los pedimentos se evalúan contra la referencia ya actualizada; los
+        números de pedimento ya registrados se ignoran.
+        
+        Returns:
+            Fracciones actualizadas y pedimentos nuevos con peso atípico
+        """
+        with self._lock:
+            nuevos = pedimentos[COLUMNAS].drop_duplicates('num_pedimento')
+            nuevos = nuevos[~nuevos['num_pedimento'].isin(self._numeros)]
+            nuevos = nuevos.assign(fecha_pago=pd.to_datetime(nuevos['fecha_pago']))
+            self._numeros.update(nuevos['num_pedimento'])
+            for rfc, filas in nuevos.groupby('rfc_importador', sort=False):
+                previos = self._ingestados.get(rfc)
+                self._ingestados[rfc] = filas if previos is None else pd.concat([previos, filas])
+            
+            pesos = _peso_por_unidad(nuevos)
+            validos = pesos.notna()
+            fracciones = nuevos.loc[validos, 'fraccion_arancelaria']
+            for fraccion, valores in pesos[validos].groupby(fracciones):
+                previos = self._pesos.get(fraccion)
+                self._pesos[fraccion] = valores.to_numpy() if previos is None else np.concatenate([previos, valores.to_numpy()])
+            
+            actualizadas = sorted(fracciones.unique())
+            if actualizadas:
+                pesos_tocados = np.concatenate([self._pesos[f] for f in actualizadas])
+                fracciones_tocadas = np.repeat(actualizadas, [len(self._pesos[f]) for f in actualizadas])
+                recalculadas = _estadisticas(pd.Series(fracciones_tocadas), pd.Series(pesos_tocados))
+                # La tabla se reemplaza completa: las lecturas concurrentes ven la anterior o la nueva
+                self.tabla = pd.concat([self.tabla.drop(recalculadas.index, errors='ignore'), recalculadas]).sort_index()
+        
+        return {
+            "fracciones_actualizadas": actualizadas,
+            "pesos_atipicos": self.anomalias(nuevos)
+        }
+    
+    def ingestados(self, rfc: str) -> Optional[pd.DataFrame]:
+        """Pedimentos ingeridos del RFC (None si no hay)"""
+        return self._ingestados.get(rfc)
+    
+    def resumen(self) -> Dict:
+        """Parámetros y referencia de cada fracción"""
+        tabla = self.tabla
+        return {
+            "umbral_puntaje": self.umbral_puntaje,
+            "minimo_pedimentos": self.minimo_pedimentos,
+            "fracciones": {
+                fraccion: {
+                    "mediana": round(float(fila.mediana), 4),
+                    "mad": round(float(fila.mad), 4),
+                    "pedimentos": int(fila.pedimentos)
+                }
+                for fraccion, fila in zip(tabla.index, tabla.itertuples(index=False))
+            }
+        }
+
+# Made with Bob
@@ -0,0 +1,209 @@
+"""
+Red Importador–Proveedor
+Grafo bipartito RFC ↔ proveedor extranjero del historial, para rastrear el contagio
+desde proveedores en lista negra o relacionados con empresas sancionadas
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core import SnapshotDatos
+
+# Distancia máxima que se precalcula desde los proveedores de riesgo
+MAX_SALTOS = 3
+
+
+def _vecinos(indptr: np.ndarray, indices: np.ndarray, nodos: np.ndarray) -> np.ndarray:
+    """Vecinos distintos de un conjunto de nodos en una estructura CSR"""
+    inicio = indptr[nodos]
+    largo = indptr[nodos + 1] - inicio
+    total = int(largo.sum())
+    if not total:
+        return np.array([], dtype=indices.dtype)
+    posiciones = np.repeat(inicio - (np.cumsum(largo) - largo), largo) + np.arange(total)
+    return np.unique(indices[posiciones])
+
+
+class RedProveedores:
+    """
+    Red bipartita importador ↔ proveedor en formato CSR
+    
+    Cada par (RFC, proveedor) con al menos un pedimento es una arista. Las
+    aristas se guardan ordenadas por RFC (_rfc_indptr / _rfc_proveedores) y
+    por proveedor (_proveedor_indptr / _proveedor_rfcs), de modo que los
+    vecinos de un conjunto de nodos se obtienen con cortes de arreglos.
+    
+    Un importador está a distancia 1 de un proveedor si le compró
+    directamente, a distancia 2 si le compró a un proveedor que comparte un
+    cliente con él, y así sucesivamente. Las distancias a los proveedores de
+    riesgo (lista negra o relacionados con empresas sancionadas) se
+    precalculan hasta MAX_SALTOS.
+    """
+    
+    def __init__(self, pedimentos_df: pd.DataFrame, proveedores_df: pd.DataFrame):
+        self.rfcs = pd.Index(pd.unique(pedimentos_df['rfc_importador'])).sort_values()
+        self.proveedores = pd.Index(
+            pd.unique(np.concatenate([
+                pedimentos_df['proveedor_extranjero'].to_numpy(),
+                proveedores_df['id_proveedor'].to_numpy()
+            ]))
+        ).sort_values()
+        total_rfcs, total_proveedores = len(self.rfcs), len(self.proveedores)
+        
+        # Aristas distintas, ordenadas por RFC y proveedor
+        rfc = self.rfcs.get_indexer(pedimentos_df['rfc_importador'])
+        proveedor = self.proveedores.get_indexer(pedimentos_df['proveedor_extranjero'])
+        aristas, pedimentos = np.unique(rfc.astype(np.int64) * total_proveedores + proveedor, return_counts=True)
+        arista_rfc = aristas // total_proveedores
+        self._rfc_proveedores = aristas % total_proveedores
+        self._rfc_pedimentos = pedimentos
+        self._rfc_indptr = np.searchsorted(arista_rfc, np.arange(total_rfcs + 1))
+        
+        orden = np.argsort(self._rfc_proveedores, kind='stable')
+        self._proveedor_rfcs = arista_rfc[orden]
+        self._proveedor_indptr = np.searchsorted(self._rfc_proveedores[orden], np.arange(total_proveedores + 1))
+        
+        # Proveedores de riesgo: mismo criterio que GestorAlertas._calcular_riesgo_global
+        catalogo = proveedores_df.drop_duplicates('id_proveedor').set_index('id_proveedor')
+        catalogo = catalogo.reindex(self.proveedores)
+        self._riesgoso = (
+            (catalogo['nivel_confianza'] == 'LISTA_NEGRA') |
+            catalogo['relacionado_con_empresa_sancionada'].fillna(False).astype(bool)
+        ).to_numpy()
+        self._nivel_confianza = catalogo['nivel_confianza'].to_numpy()
+        self._relacionado_sancionado = catalogo['relacionado_con_empresa_sancionada'].fillna(False).astype(bool).to_numpy()
+        
+        self._distancia_riesgo = self._distancias(np.flatnonzero(self._riesgoso), MAX_SALTOS)
+    
+    @classmethod
+    def desde_snapshot(cls, snapshot: SnapshotDatos) -> "RedProveedores":
+        """Red del historial y el catálogo de proveedores de un snapshot"""
+        return cls(snapshot['pedimentos_historicos'], snapshot['proveedores_extranjeros'])
+    
+    def _distancias(self, semillas: np.ndarray, saltos: int) -> np.ndarray:
+        """
+        Distancia de cada RFC a los proveedores semilla (-1 si está a más de saltos)
+        
+        Recorrido en anchura por frentes: cada salto toma los clientes del
+        frente de proveedores y luego los proveedores de esos clientes.
+        """
+        distancia = np.full(len(self.rfcs), -1, dtype=np.int8)
+        visitados = np.zeros(len(self.proveedores), dtype=bool)
+        visitados[semillas] = True
+        frente = semillas
+        for salto in range(1, saltos + 1):
+            rfcs = _vecinos(self._proveedor_indptr, self._proveedor_rfcs, frente)
+            rfcs = rfcs[distancia[rfcs] < 0]
+            if not len(rfcs):
+                break
+            distancia[rfcs] = salto
+            frente = _vecinos(self._rfc_indptr, self._rfc_proveedores, rfcs)
+            frente = frente[~visitados[frente]]
+            visitados[frente] = True
+        return distancia
+    
+    def proveedores_riesgosos(self) -> List[str]:
+        """Proveedores en lista negra o relacionados con empresas sancionadas"""
+        return list(self.proveedores[self._riesgoso])
+    
+    def contagio(self, proveedores: Optional[Iterable[str]] = None, saltos: int = 1) -> Dict:
+        """
+        Importadores a saltos o menos de los proveedores indicados
+        
+        Args:
+            proveedores: IDs de proveedor (default: todos los proveedores de riesgo)
+            saltos: Distancia máxima (1 = clientes directos)
+        
+        Returns:
+            Importadores con su distancia, conteo por distancia y los IDs que
+            no aparecen en el catálogo ni en el historial
+        """
+        if proveedores is None:
+            semillas = self.proveedores_riesgosos()
+            distancia = self._distancia_riesgo if saltos <= MAX_SALTOS else None
+        else:
+            semillas = list(dict.fromkeys(proveedores))
+            distancia = None
+        
+        codigos = self.proveedores.get_indexer(semillas)
+        desconocidos = [p for p, c in zip(semillas, codigos) if c < 0]
+        if distancia is None:
+            distancia = self._distancias(codigos[codigos >= 0], saltos)
+        
+        alcanzados = np.flatnonzero((distancia > 0) & (distancia <= saltos))
+        alcanzados = alcanzados[np.lexsort((alcanzados, distancia[alcanzados]))]
+        return {
+            "proveedores": [p for p, c in zip(semillas, codigos) if c >= 0],
+            "desconocidos": desconocidos,
+            "saltos": saltos,
+            "total_importadores": len(alcanzados),
+            "por_salto": {
+                int(s): int(n) for s, n in zip(*np.unique(distancia[alcanzados], return_counts=True))
+            },
+            "importadores": [
+                {"rfc": self.rfcs[i], "saltos": int(distancia[i])} for i in alcanzados
+            ]
+        }
+    
+    def exposicion(self, rfc: str) -> Dict:
+        """
+        Proveedores de riesgo con los que ha operado un importador
+        
+        Returns:
+            Proveedores de riesgo directos (con sus pedimentos), pedimentos con
+            ellos y distancia a la red de riesgo (None si está a más de MAX_SALTOS
+            o no tiene pedimentos)
+        """
+        codigo = self.rfcs.get_indexer([rfc])[0]
+        if codigo < 0:
+            return {"distancia": None, "pedimentos_con_riesgosos": 0, "proveedores_riesgosos": []}
+        
+        inicio, fin = self._rfc_indptr[codigo], self._rfc_indptr[codigo + 1]
+        proveedores = self._rfc_proveedores[inicio:fin]
+        pedimentos = self._rfc_pedimentos[inicio:fin]
+        riesgosos = self._riesgoso[proveedores]
+        orden = np.argsort(-pedimentos[riesgosos], kind='stable')
+        distancia = int(self._distancia_riesgo[codigo])
+        return {
+            "distancia": distancia if distancia > 0 else None,
+            "pedimentos_con_riesgosos": int(pedimentos[riesgosos].sum()),
+            "proveedores_riesgosos": [
+                {
+                    "id": self.proveedores[p],
+                    "nivel_confianza": self._nivel_confianza[p],
+                    "relacionado_sancionado": bool(self._relacionado_sancionado[p]),
+                    "pedimentos": int(n)
+                }
+                for p, n in zip(proveedores[riesgosos][orden], pedimentos[riesgosos][orden])
+            ]
+        }
+    
+    def vecindad(self, proveedor: str) -> Optional[Dict]:
+        """Clientes de un proveedor y proveedores de riesgo con los que comparte clientes"""
+        codigo = self.proveedores.get_indexer([proveedor])[0]
+        if codigo < 0:
+            return None
+        clientes = self._proveedor_rfcs[self._proveedor_indptr[codigo]:self._proveedor_indptr[codigo + 1]]
+        relacionados = _vecinos(self._rfc_indptr, self._rfc_proveedores, clientes)
+        relacionados = relacionados[self._riesgoso[relacionados] & (relacionados != codigo)]
+        return {
+            "riesgoso": bool(self._riesgoso[codigo]),
+            "importadores": len(clientes),
+            "proveedores_riesgosos_relacionados": len(relacionados)
+        }
+    
+    def resumen(self) -> Dict:
+        """Tamaño de la red e importadores por distancia a los proveedores de riesgo"""
+        valores, conteos = np.unique(self._distancia_riesgo, return_counts=True)
+        return {
+            "importadores": len(self.rfcs),
+            "proveedores": len(self.proveedores),
+            "aristas": len(self._rfc_proveedores),
+            "proveedores_riesgosos": int(self._riesgoso.sum()),
+            "importadores_por_distancia": {
+                (str(int(v)) if v > 0 else f"mas_de_{MAX_SALTOS}"): int(n) for v, n in zip(valores, conteos)
+            }
+        }
+
+# Made with Bob
@@ -0,0 +1,336 @@
+"""
+Reglas de Riesgo
+Criterios y umbrales de riesgo declarados una sola vez y evaluados por registro o por columnas
+"""
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Valores de umbral que sustituyen a los declarados (p. ej. para simulaciones)
+Parametros = Optional[Mapping[str, float]]
+
+Compilada = Callable[[Mapping[str, Any]], Any]
+
+
+class Expresion:
+    """
+    Nodo de una condición declarativa
+    
+    Las condiciones se arman con operadores (<, ==, &, |, ~) sobre campos y
+    umbrales y se compilan a una función que recibe un registro (valores
+    escalares) o un conjunto de columnas (arreglos): los mismos operadores
+    de Python y NumPy dan la misma semántica en ambos casos.
+    """
+    
+    __hash__ = object.__hash__
+    
+    # Función compilada con los umbrales declarados (se compila en la primera evaluación)
+    _compilada_por_defecto: Optional[Compilada] = None
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        raise NotImplementedError
+    
+    def _compilada(self, parametros: Parametros) -> Compilada:
+        if parametros and any(nombre in parametros for nombre in self.umbrales()):
+            return self.compilar(parametros)
+        if self._compilada_por_defecto is None:
+            self._compilada_por_defecto = self.compilar(None)
+        return self._compilada_por_defecto
+    
+    def umbrales(self) -> Dict[str, float]:
+        """Umbrales que usa la expresión, con su valor declarado"""
+        return {}
+    
+    def evaluar(self, valores: Mapping[str, Any], parametros: Parametros = None) -> bool:
+        """Evalúa la condición sobre un registro"""
+        return bool(self._compilada(parametros)(valores))
+    
+    def evaluar_columnas(self, columnas: Mapping[str, Any], parametros: Parametros = None) -> np.ndarray:
+        """Evalúa la condición sobre cada registro de un conjunto de columnas del mismo largo"""
+        return _mascara(self._compilada(parametros)(columnas), len(next(iter(columnas.values()))))
+    
+    def __lt__(self, otro): return Operacion(operator.lt, "<", self, _expresion(otro))
+    def __le__(self, otro): return Operacion(operator.le, "<=", self, _expresion(otro))
+    def __gt__(self, otro): return Operacion(operator.gt, ">", self, _expresion(otro))
+    def __ge__(self, otro): return Operacion(operator.ge, ">=", self, _expresion(otro))
+    def __eq__(self, otro): return Operacion(operator.eq, "==", self, _expresion(otro))
+    def __ne__(self, otro): return Operacion(operator.ne, "!=", self, _expresion(otro))
+    def __and__(self, otro): return Operacion(operator.and_, "y", self, _expresion(otro))
+    def __or__(self, otro): return Operacion(operator.or_, "o", self, _expresion(otro))
+    def __invert__(self): return Negacion(self)
+
+
+class Campo(Expresion):
+    """Valor de un campo del registro (o columna)"""
+    
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        nombre = self.nombre
+        return lambda valores: valores[nombre]
+    
+    def __str__(self):
+        return self.nombre
+
+
+class Constante(Expresion):
+    """Valor fijo"""
+    
+    def __init__(self, valor: Any):
+        self.valor = valor
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        valor = self.valor
+        return lambda valores: valor
+    
+    def __str__(self):
+        return repr(self.valor)
+
+
+class Umbral(Expresion):
+    """Valor fijo con nombre, sustituible por parámetro"""
+    
+    def __init__(self, nombre: str, valor: float):
+        self.nombre = nombre
+        self.valor = valor
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        valor = (parametros or {}).get(self.nombre, self.valor)
+        return lambda valores: valor
+    
+    def umbrales(self) -> Dict[str, float]:
+        return {self.nombre: self.valor}
+    
+    def __str__(self):
+        return f"{self.nombre}({self.valor})"
+
+
+class Operacion(Expresion):
+    """Operador binario (comparación o lógico) entre dos expresiones"""
+    
+    def __init__(self, funcion: Callable, simbolo: str, izquierda: Expresion, derecha: Expresion):
+        self.funcion = funcion
+        self.simbolo = simbolo
+        self.izquierda = izquierda
+        self.derecha = derecha
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        funcion = self.funcion
+        izquierda = self.izquierda.compilar(parametros)
+        derecha = self.derecha.compilar(parametros)
+        return lambda valores: funcion(izquierda(valores), derecha(valores))
+    
+    def umbrales(self) -> Dict[str, float]:
+        return {**self.izquierda.umbrales(), **self.derecha.umbrales()}
+    
+    def __str__(self):
+        return f"({self.izquierda} {self.simbolo} {self.derecha})"
+
+
+class Negacion(Expresion):
+    """Negación lógica (np.logical_not: igual para escalares y arreglos)"""
+    
+    def __init__(self, expresion: Expresion):
+        self.expresion = expresion
+    
+    def compilar(self, parametros: Parametros = None) -> Compilada:
+        interna = self.expresion.compilar(parametros)
+        return lambda valores: np.logical_not(interna(valores))
+    
+    def umbrales(self) -> Dict[str, float]:
+        return self.expresion.umbrales()
+    
+    def __str__(self):
+        return f"no {self.expresion}"
+
+
+def _mascara(valor: Any, largo: int) -> np.ndarray:
+    """Arreglo booleano del largo indicado; los nulos (pd.NA) cuentan como no cumplidos"""
+    if hasattr(valor, "fillna"):
+        valor = valor.fillna(False)
+    return np.broadcast_to(np.asarray(valor, dtype=bool), (largo,))
+
+
+def _expresion(valor: Any) -> Expresion:
+    return valor if isinstance(valor, Expresion) else Constante(valor)
+
+
+def alguna(condiciones: Iterable[Expresion]) -> Expresion:
+    """Se cumple si se cumple cualquiera de las condiciones"""
+    condiciones = list(condiciones)
+    resultado = condiciones[0]
+    for condicion in condiciones[1:]:
+        resultado = resultado | condicion
+    return resultado
+
+
+def todas(condiciones: Iterable[Expresion]) -> Expresion:
+    """Se cumple si se cumplen todas las condiciones"""
+    condiciones = list(condiciones)
+    resultado = condiciones[0]
+    for condicion in condiciones[1:]:
+        resultado = resultado & condicion
+    return resultado
+
+
+class TablaDecision:
+    """
+    Lista ordenada de reglas (resultado, condición): gana la primera que se cumple
+    
+    evaluar() decide un registro y evaluar_columnas() decide todos los
+    registros de un conjunto de columnas con np.select; ambos usan las mismas
+    condiciones compiladas.
+    """
+    
+    def __init__(self, nombre: str, reglas: Sequence[Tuple[str, Expresion]], por_defecto: str):
+        self.nombre = nombre
+        self.reglas = list(reglas)
+        self.por_defecto = por_defecto
+        self._compiladas_por_defecto = self._compilar(None)
+    
+    def _compilar(self, parametros: Parametros) -> List[Tuple[str, Compilada]]:
+        return [(resultado, condicion.compilar(parametros)) for resultado, condicion in self.reglas]
+    
+    def _compiladas(self, parametros: Parametros) -> List[Tuple[str, Compilada]]:
+        if not parametros or not any(nombre in parametros for nombre in self.umbrales()):
+            return self._compiladas_por_defecto
+        return self._compilar(parametros)
+    
+    def evaluar(self, valores: Mapping[str, Any], parametros: Parametros = None) -> str:
+        """Resultado para un registro"""
+        for resultado, condicion in self._compiladas(parametros):
+            if condicion(valores):
+                return resultado
+        return self.por_defecto
+    
+    def evaluar_columnas(self, columnas: Mapping[str, Any], parametros: Parametros = None) -> np.ndarray:
+        """Resultado para cada registro de un conjunto de columnas del mismo largo"""
+        compiladas = self._compiladas(parametros)
+        largo = len(next(iter(columnas.values())))
+        condiciones = [_mascara(condicion(columnas), largo) for _, condicion in compiladas]
+        resultados = [resultado for resultado, _ in compiladas]
+        return np.select(condiciones, resultados, default=self.por_defecto).astype(object)
+    
+    def umbrales(self) -> Dict[str, float]:
+        """Umbrales de todas las reglas, con su valor declarado"""
+        umbrales = {}
+        for _, condicion in self.reglas:
+            umbrales.update(condicion.umbrales())
+        return umbrales
+    
+    def describir(self) -> Dict:
+        """Reglas en texto, para consulta"""
+        return {
+            "reglas": [{"resultado": resultado, "condicion": str(condicion)} for resultado, condicion in self.reglas],
+            "por_defecto": self.por_defecto
+        }
+
+
+# ============================================================================
+# MÓDULO 1: PERFIL DEL IMPORTADOR
+# ============================================================================
+
+_ANIOS = Campo("anios_activo")
+_OPS = Campo("total_ops_24m")
+_TASA = Campo("tasa_irregularidades")
+_OPINION = Campo("opinion_cumplimiento_sat")
+_VOLUMEN_ANORMAL = Campo("flag_volumen_anormal")
+
+INDICADORES_IMPORTADOR: Dict[str, Expresion] = {
+    "importador_confiable": todas([
+        _OPS > Umbral("importador.ops_minimas_confiable", 50),
+        _TASA < Umbral("importador.tasa_maxima_confiable", 2),
+        _ANIOS > Umbral("importador.anios_minimos_confiable", 3)
+    ]),
+    "importador_en_revision": _VOLUMEN_ANORMAL | ((_ANIOS >= 1) & (_ANIOS <= 3)),
+    "importador_alto_riesgo": alguna([
+        _ANIOS < Umbral("importador.anios_alto_riesgo", 0.5),
+        _TASA > Umbral("importador.tasa_alto_riesgo", 10),
+        _OPINION == "NEGATIVA"
+    ]),
+    "empresa_nueva": _ANIOS < 1,
+    "opinion_sat_positiva": _OPINION == "POSITIVA",
+    "volumen_estable": ~_VOLUMEN_ANORMAL
+}
+
+PERFIL_IMPORTADOR = TablaDecision("perfil_importador", [
+    ("VERDE", INDICADORES_IMPORTADOR["importador_confiable"] & (_OPINION == "POSITIVA")),
+    ("ROJO", INDICADORES_IMPORTADOR["importador_alto_riesgo"] | Campo("flag_empresa_nueva")),
+], por_defecto="AMARILLO")
+
+
+# ============================================================================
+# MÓDULO 2: RIESGO DEL VALOR DECLARADO
+# ============================================================================
+
+_DESVIACION = Campo("desviacion_pct")
+_PERCENTIL = Campo("percentil")
+
+RIESGO_VALOR = TablaDecision("riesgo_valor", [
+    # Subfacturación severa
+    ("ROJO", (_DESVIACION < Umbral("valor.subfacturacion_severa_pct", -40)) |
+             (_PERCENTIL < Umbral("valor.percentil_severo", 10))),
+    # Subfacturación moderada
+    ("AMARILLO", (_DESVIACION < Umbral("valor.subfacturacion_moderada_pct", -20)) |
+                 (_PERCENTIL < Umbral("valor.percentil_bajo", 25))),
+    # Sobrefacturación (también sospechoso)
+    ("AMARILLO", (_DESVIACION > Umbral("valor.sobrefacturacion_pct", 50)) |
+                 (_PERCENTIL > Umbral("valor.percentil_alto", 90))),
+], por_defecto="VERDE")
+
+
+# ============================================================================
+# MÓDULO 3: RIESGO POR ALERTAS
+# ============================================================================
+
+RIESGO_ALERTAS = TablaDecision("riesgo_alertas", [
+    ("ROJO", (Campo("alertas_criticas") > 0) | Campo("proveedor_riesgo")),
+    ("AMARILLO", (Campo("alertas_altas") > 0) |
+                 (Campo("total_alertas") >= Umbral("alertas.acumuladas_amarillo", 3))),
+    ("AMARILLO", Campo("total_alertas") > 0),
+], por_defecto="VERDE")
+
+
+# ============================================================================
+# ANÁLISIS COMPLETO: RIESGO GLOBAL Y CANAL
+# ============================================================================
+
+NIVELES_RIESGO = ("perfil_riesgo", "nivel_riesgo_valor", "nivel_riesgo_alertas")
+
+RIESGO_GLOBAL = TablaDecision("riesgo_global", [
+    ("ROJO", alguna(Campo(nivel) == "ROJO" for nivel in NIVELES_RIESGO)),
+    ("AMARILLO", alguna(Campo(nivel) == "AMARILLO" for nivel in NIVELES_RIESGO)),
+], por_defecto="VERDE")
+
+CANAL_RECOMENDADO = TablaDecision("canal_recomendado", [
+    ("ROJO", Campo("riesgo_global") == "ROJO"),
+    # Alertas críticas
+    ("ROJO", Campo("alertas_criticas") > 0),
+    # Documentos faltantes críticos
+    ("AMARILLO", Campo("documentos_faltantes") > Umbral("canal.documentos_faltantes_max", 2)),
+    ("AMARILLO", Campo("riesgo_global") == "AMARILLO"),
+    # Canal verde solo si todo está en orden
+    ("VERDE", (Campo("perfil_riesgo") == "VERDE") &
+              (Campo("nivel_riesgo_valor") == "VERDE") &
+              (Campo("total_alertas") == 0)),
+], por_defecto="AMARILLO")
+
+
+TABLAS_DECISION: Dict[str, TablaDecision] = {
+    tabla.nombre: tabla
+    for tabla in (PERFIL_IMPORTADOR, RIESGO_VALOR, RIESGO_ALERTAS, RIESGO_GLOBAL, CANAL_RECOMENDADO)
+}
+
+
+def umbrales() -> Dict[str, float]:
+    """Todos los umbrales declarados, con su valor por defecto"""
+    todos = {}
+    for tabla in TABLAS_DECISION.values():
+        todos.update(tabla.umbrales())
+    for expresion in INDICADORES_IMPORTADOR.values():
+        todos.update(expresion.umbrales())
+    return dict(sorted(todos.items()))
+
+# Made with Bob
@@ -0,0 +1,160 @@
+"""
+Tabla de Riesgo de Importadores
+Calcula en bloque el perfil de riesgo, los indicadores y las alertas de todo el padrón
+"""
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from .reglas import INDICADORES_IMPORTADOR, PERFIL_IMPORTADOR, Parametros
+
+PERFILES = ("VERDE", "AMARILLO", "ROJO")
+
+INDICADORES = tuple(INDICADORES_IMPORTADOR)
+
+
+class TablaRiesgoImportadores:
+    """
+    Perfil de riesgo materializado de todos los importadores
+    
+    Aplica con operaciones por columna los mismos criterios que
+    AnalizadorHistorial evalúa por RFC. Los años de actividad y la ventana de
+    pedimentos dependen de la fecha, por lo que la tabla es válida para el
+    día en que se calculó (las fechas de los datos no tienen hora).
+    """
+    
+    def __init__(self, importadores_df: pd.DataFrame, pedimentos_df: pd.DataFrame,
+                 fecha_referencia: Optional[datetime] = None, meses_historial: int = 24):
+        fecha_referencia = fecha_referencia or datetime.now()
+        self.fecha: date = fecha_referencia.date()
+        self.meses_historial = meses_historial
+        self.calculado_en = datetime.now()
+        
+        imp = importadores_df.set_index('rfc', drop=False)
+        anios_activo = (fecha_referencia - imp['fecha_alta_sat']).dt.days / 365.25
+        
+        # Pedimentos dentro de la ventana, agregados por RFC
+        fecha_limite = fecha_referencia - timedelta(days=meses_historial * 30)
+        ventana = pedimentos_df.loc[
+            pedimentos_df['fecha_pago'] >= fecha_limite,
+            ['rfc_importador', 'agente_aduanal', 'fraccion_arancelaria']
+        ]
+        agentes_unicos = (
+            ventana.groupby('rfc_importador')['agente_aduanal'].nunique()
+            .reindex(imp.index, fill_value=0)
+        )
+        operaciones_por_fraccion = ventana.groupby(['rfc_importador', 'fraccion_arancelaria']).size()
+        fracciones_pocas_ops = (
+            (operaciones_por_fraccion <= 2).groupby(level=0).sum()
+            .reindex(imp.index, fill_value=0)
+        )
+        
+        # Indicadores y perfil con las mismas reglas que AnalizadorHistorial (modules.reglas)
+        columnas = {
+            "total_ops_24m": imp['total_ops_24m'],
+            "tasa_irregularidades": imp['tasa_irregularidades'],
+            "opinion_cumplimiento_sat": imp['opinion_cumplimiento_sat'],
+            "flag_volumen_anormal": imp['flag_volumen_anormal'].astype(bool),
+            "flag_empresa_nueva": imp['flag_empresa_nueva'].astype(bool),
+            "anios_activo": anios_activo
+        }
+        indicadores = pd.DataFrame({
+            nombre: expresion.evaluar_columnas(columnas)
+            for nombre, expresion in INDICADORES_IMPORTADOR.items()
+        }, index=imp.index)
+        perfil = PERFIL_IMPORTADOR.evaluar_columnas(columnas)
+        self._columnas_reglas = columnas
+        
+        self.tabla = indicadores.assign(
+            razon_social=imp['razon_social'],
+            anios_activo=anios_activo,
+            perfil_riesgo=perfil,
+            alertas=self._alertas(imp, anios_activo, agentes_unicos, fracciones_pocas_ops)
+        )
+        self.tabla.index.name = 'rfc'
+        
+        # RFCs por perfil, precalculados para consultar sin recorrer la tabla
+        self._por_perfil: Dict[str, List[str]] = {
+            p: sorted(self.tabla.index[self.tabla['perfil_riesgo'] == p]) for p in PERFILES
+        }
+    
+    @staticmethod
+    def _alertas(imp: pd.DataFrame, anios_activo: pd.Series, agentes_unicos: pd.Series,
+                 fracciones_pocas_ops: pd.Series) -> List[List[str]]:
+        """Alertas de cada importador (mismos textos que AnalizadorHistorial._generar_alertas)"""
+        reglas = [
+            (anios_activo < 1,
+             lambda i: f"⚠️ Empresa de reciente creación ({round(anios_activo.iat[i] * 12)} meses)"),
+            (imp['opinion_cumplimiento_sat'] == 'NEGATIVA',
+             lambda i: "🔴 Opinión de cumplimiento SAT: NEGATIVA"),
+            (imp['tasa_irregularidades'] > 5,
+             lambda i: f"⚠️ Tasa de irregularidades elevada: {imp['tasa_irregularidades'].iat[i]}%"),
+            (imp['flag_volumen_anormal'].astype(bool),
+             lambda i: "⚠️ Cambio súbito en volumen de operaciones detectado"),
+            (imp['canal_historico_rojo'] > 30,
+             lambda i: f"⚠️ Alto porcentaje de canal rojo histórico: {imp['canal_historico_rojo'].iat[i]}%"),
+            (agentes_unicos > 1,
+             lambda i: f"⚠️ Ha trabajado con {agentes_unicos.iat[i]} agentes aduanales diferentes"),
+            (fracciones_pocas_ops > 0,
+             lambda i: f"ℹ️ Importando {fracciones_pocas_ops.iat[i]} fracciones por primera vez o con muy pocas operaciones"),
+        ]
+        
+        alertas: List[List[str]] = [[] for _ in range(len(imp))]
+        for mascara, mensaje in reglas:
+            for i in np.flatnonzero(mascara.to_numpy()):
+                alertas[i].append(mensaje(i))
+        return alertas
+    
+    def perfiles(self, parametros: Parametros = None) -> pd.Series:
+        """Perfil de cada importador (índice rfc), opcionalmente con umbrales alternos"""
+        if not parametros:
+            return self.tabla['perfil_riesgo']
+        return pd.Series(
+            PERFIL_IMPORTADOR.evaluar_columnas(self._columnas_reglas, parametros),
+            index=self.tabla.index, name='perfil_riesgo'
+        )
+    
+    def vigente(self, fecha: Optional[date] = None, meses_historial: int = 24) -> bool:
+        """Indica si la tabla corresponde al día y la ventana de historial indicados"""
+        return self.fecha == (fecha or date.today()) and self.meses_historial == meses_historial
+    
+    def obtener(self, rfc: str) -> Optional[Dict]:
+        """Perfil, alertas e indicadores de un RFC (None si no está en el padrón)"""
+        if rfc not in self.tabla.index:
+            return None
+        fila = self.tabla.loc[rfc]
+        return {
+            "perfil_riesgo": fila['perfil_riesgo'],
+            "alertas": list(fila['alertas']),
+            "indicadores": {nombre: bool(fila[nombre]) for nombre in INDICADORES}
+        }
+    
+    def listar(self, perfil: str, limite: Optional[int] = None) -> List[Dict]:
+        """Importadores con el perfil indicado, ordenados por RFC"""
+        rfcs = self._por_perfil.get(perfil, [])
+        if limite is not None:
+            rfcs = rfcs[:limite]
+        filas = self.tabla.loc[rfcs]
+        return [
+            {
+                "rfc": rfc,
+                "razon_social": fila.razon_social,
+                "perfil_riesgo": fila.perfil_riesgo,
+                "anios_activo": round(float(fila.anios_activo), 1),
+                "alertas": list(fila.alertas)
+            }
+            for rfc, fila in zip(rfcs, filas.itertuples(index=False))
+        ]
+    
+    def resumen(self) -> Dict:
+        """Importadores por perfil y fecha de cálculo"""
+        return {
+            "fecha": self.fecha.isoformat(),
+            "calculado_en": self.calculado_en.isoformat(),
+            "meses_historial": self.meses_historial,
+            "total_importadores": len(self.tabla),
+            "por_perfil": {p: len(rfcs) for p, rfcs in self._por_perfil.items()}
+        }
+
+# Made with Bob
@@ -0,0 +1,220 @@
+"""
+Grafo de Triangulación
+Flujos país de origen → país de procedencia → importador → proveedor del historial de pedimentos
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+NIVELES = ["pais_origen", "pais_procedencia", "rfc_importador", "proveedor_extranjero"]
+
+
+def _indptr(codigos: np.ndarray, total: int) -> np.ndarray:
+    """Posiciones [inicio, fin) de cada código en un arreglo ordenado de códigos"""
+    return np.searchsorted(codigos, np.arange(total + 1))
+
+
+class GrafoTriangulacion:
+    """
+    Grafo de flujos origen → procedencia → importador → proveedor
+    
+    Cada combinación distinta de los cuatro niveles es una hoja, y las hojas
+    se guardan como arreglos de códigos enteros ordenados por origen,
+    procedencia, RFC y proveedor (con el número de pedimentos y el valor
+    de cada una). Sobre ese orden:
+    
+    - _origen_indptr: rutas (origen, procedencia) de cada país de origen
+    - _ruta_inicio: hojas de cada ruta
+    - _rfc_indptr / _rfc_hojas y _proveedor_indptr / _proveedor_hojas:
+      índices inversos para consultar por importador o por proveedor
+    
+    Una ruta está triangulada cuando la procedencia es distinta del origen.
+    El grafo se construye con el historial del snapshot.
+    """
+    
+    def __init__(self, pedimentos_df: pd.DataFrame):
+        self.paises = pd.Index(
+            pd.unique(pedimentos_df[['pais_origen', 'pais_procedencia']].to_numpy().ravel())
+        ).sort_values()
+        origen = self.paises.get_indexer(pedimentos_df['pais_origen'])
+        procedencia = self.paises.get_indexer(pedimentos_df['pais_procedencia'])
+        rfc, self.rfcs = pd.factorize(pedimentos_df['rfc_importador'], sort=True)
+        proveedor, self.proveedores = pd.factorize(pedimentos_df['proveedor_extranjero'], sort=True)
+        
+        # Hojas: combinaciones distintas, en orden lexicográfico
+        hojas = pd.DataFrame({
+            "pais_origen": origen,
+            "pais_procedencia": procedencia,
+            "rfc_importador": rfc,
+            "proveedor_extranjero": proveedor,
+            "valor": pedimentos_df['valor_declarado_usd'].to_numpy()
+        }).groupby(NIVELES, sort=True)['valor'].agg(['size', 'sum'])
+        self._hoja_origen = hojas.index.get_level_values(0).to_numpy()
+        self._hoja_procedencia = hojas.index.get_level_values(1).to_numpy()
+        self._hoja_rfc = hojas.index.get_level_values(2).to_numpy()
+        self._hoja_proveedor = hojas.index.get_level_values(3).to_numpy()
+        self._hoja_pedimentos = hojas['size'].to_numpy()
+        self._hoja_valor = hojas['sum'].to_numpy()
+        
+        # Rutas (origen, procedencia) y las hojas que les corresponden
+        total_paises = len(self.paises)
+        ruta = self._hoja_origen * total_paises + self._hoja_procedencia
+        inicios = np.flatnonzero(np.r_[True, ruta[1:] != ruta[:-1]]) if len(ruta) else np.array([], dtype=np.int64)
+        self._ruta_inicio = np.append(inicios, len(ruta))
+        self._ruta_origen = self._hoja_origen[inicios]
+        self._ruta_procedencia = self._hoja_procedencia[inicios]
+        self._origen_indptr = _indptr(self._ruta_origen, total_paises)
+        nuevo_rfc = np.r_[True, (ruta[1:] != ruta[:-1]) | (self._hoja_rfc[1:] != self._hoja_rfc[:-1])]
+        self._ruta_pedimentos = np.add.reduceat(self._hoja_pedimentos, inicios) if len(inicios) else self._hoja_pedimentos
+        self._ruta_valor = np.add.reduceat(self._hoja_valor, inicios) if len(inicios) else self._hoja_valor
+        self._ruta_importadores = np.add.reduceat(nuevo_rfc, inicios) if len(inicios) else self._hoja_rfc
+        
+        # Índices inversos por importador y por proveedor
+        self._rfc_hojas = np.argsort(self._hoja_rfc, kind='stable')
+        self._rfc_indptr = _indptr(self._hoja_rfc[self._rfc_hojas], len(self.rfcs))
+        self._proveedor_hojas = np.argsort(self._hoja_proveedor, kind='stable')
+        self._proveedor_indptr = _indptr(self._hoja_proveedor[self._proveedor_hojas], len(self.proveedores))
+        
+        self.total_pedimentos = len(pedimentos_df)
+    
+    @staticmethod
+    def _codigo(indice: pd.Index, valor: Optional[str]) -> Optional[int]:
+        """Código entero de un valor (None si no aparece en el historial)"""
+        if valor is None:
+            return None
+        codigo = indice.get_indexer([valor])[0]
+        return int(codigo) if codigo >= 0 else None
+    
+    def _hojas_origen(self, origen: int) -> np.ndarray:
+        """Hojas de todas las rutas del país de origen"""
+        rutas = self._origen_indptr[origen], self._origen_indptr[origen + 1]
+        return np.arange(self._ruta_inicio[rutas[0]], self._ruta_inicio[rutas[1]])
+    
+    def _tabla(self, hojas: np.ndarray) -> pd.DataFrame:
+        """Hojas indicadas con sus valores decodificados"""
+        return pd.DataFrame({
+            "pais_origen": self.paises.take(self._hoja_origen[hojas]),
+            "pais_procedencia": self.paises.take(self._hoja_procedencia[hojas]),
+            "rfc": self.rfcs.take(self._hoja_rfc[hojas]),
+            "proveedor": self.proveedores.take(self._hoja_proveedor[hojas]),
+            "pedimentos": self._hoja_pedimentos[hojas],
+            "valor_usd": self._hoja_valor[hojas]
+        })
+    
+    def rutas(self, pais_origen: str) -> List[Dict]:
+        """Países de procedencia de la mercancía de un origen, de mayor a menor número de pedimentos"""
+        origen = self._codigo(self.paises, pais_origen)
+        if origen is None:
+            return []
+        rutas = np.arange(self._origen_indptr[origen], self._origen_indptr[origen + 1])
+        resultado = [
+            {
+                "pais_procedencia": self.paises[self._ruta_procedencia[r]],
+                "triangulada": bool(self._ruta_procedencia[r] != origen),
+                "pedimentos": int(self._ruta_pedimentos[r]),
+                "valor_usd": round(float(self._ruta_valor[r]), 2),
+                "importadores": int(self._ruta_importadores[r])
+            }
+            for r in rutas
+        ]
+        return sorted(resultado, key=lambda r: -r["pedimentos"])
+    
+    def importadores(self, pais_origen: str, pais_procedencia: Optional[str] = None,
+                     limite: Optional[int] = None) -> Dict:
+        """
+        Importadores que reciben mercancía de un origen a través de terceros países
+        
+        Args:
+            pais_origen: País de origen declarado
+            pais_procedencia: Sólo esta procedencia (default: cualquiera distinta del origen)
+            limite: Máximo de importadores, de mayor a menor número de pedimentos
+        
+        Returns:
+            Total de importadores antes del límite y los importadores mostrados
+        """
+        origen = self._codigo(self.paises, pais_origen)
+        if origen is None:
+            return {"total": 0, "importadores": []}
+        hojas = self._hojas_origen(origen)
+        if pais_procedencia is None:
+            hojas = hojas[self._hoja_procedencia[hojas] != origen]
+        else:
+            hojas = hojas[self._hoja_procedencia[hojas] == self._codigo(self.paises, pais_procedencia)]
+        if not len(hojas):
+            return {"total": 0, "importadores": []}
+        
+        # Hojas agrupadas por importador; se ordenan por pedimentos y valor
+        hojas = hojas[np.argsort(self._hoja_rfc[hojas], kind='stable')]
+        rfc = self._hoja_rfc[hojas]
+        inicios = np.flatnonzero(np.r_[True, rfc[1:] != rfc[:-1]])
+        limites = np.append(inicios, len(hojas))
+        pedimentos = np.add.reduceat(self._hoja_pedimentos[hojas], inicios)
+        valor = np.add.reduceat(self._hoja_valor[hojas], inicios)
+        grupos = np.lexsort((-valor, -pedimentos))[:limite]
+        
+        resultado = []
+        for g in grupos:
+            grupo = hojas[limites[g]:limites[g + 1]]
+            resultado.append({
+                "rfc": self.rfcs[rfc[inicios[g]]],
+                "pedimentos": int(pedimentos[g]),
+                "valor_usd": round(float(valor[g]), 2),
+                "paises_procedencia": sorted({self.paises[c] for c in self._hoja_procedencia[grupo]}),
+                "proveedores": sorted({self.proveedores[c] for c in self._hoja_proveedor[grupo]})
+            })
+        return {"total": len(inicios), "importadores": resultado}
+    
+    def _rutas_trianguladas(self, hojas: np.ndarray, pais_origen: Optional[str]) -> List[Dict]:
+        """Hojas trianguladas (opcionalmente de un origen), de mayor a menor número de pedimentos"""
+        hojas = hojas[self._hoja_procedencia[hojas] != self._hoja_origen[hojas]]
+        if pais_origen is not None:
+            hojas = hojas[self._hoja_origen[hojas] == self._codigo(self.paises, pais_origen)]
+        tabla = self._tabla(hojas).sort_values('pedimentos', ascending=False, kind='stable')
+        return [
+            {**fila, "pedimentos": int(fila["pedimentos"]), "valor_usd": round(float(fila["valor_usd"]), 2)}
+            for fila in tabla.to_dict('records')
+        ]
+    
+    def por_rfc(self, rfc: str, pais_origen: Optional[str] = None) -> List[Dict]:
+        """Rutas trianguladas de un importador"""
+        codigo = self._codigo(self.rfcs, rfc)
+        if codigo is None:
+            return []
+        hojas = self._rfc_hojas[self._rfc_indptr[codigo]:self._rfc_indptr[codigo + 1]]
+        return self._rutas_trianguladas(hojas, pais_origen)
+    
+    def por_proveedor(self, proveedor: str, pais_origen: Optional[str] = None) -> List[Dict]:
+        """Rutas trianguladas de un proveedor extranjero"""
+        codigo = self._codigo(self.proveedores, proveedor)
+        if codigo is None:
+            return []
+        hojas = self._proveedor_hojas[self._proveedor_indptr[codigo]:self._proveedor_indptr[codigo + 1]]
+        return self._rutas_trianguladas(hojas, pais_origen)
+    
+    def resumen(self, limite: int = 10) -> Dict:
+        """Tamaño del grafo y rutas trianguladas con más pedimentos"""
+        trianguladas = self._ruta_procedencia != self._ruta_origen
+        pedimentos = self._ruta_pedimentos
+        principales = np.flatnonzero(trianguladas)
+        principales = principales[np.argsort(-pedimentos[principales], kind='stable')][:limite]
+        return {
+            "total_pedimentos": self.total_pedimentos,
+            "paises": len(self.paises),
+            "importadores": len(self.rfcs),
+            "proveedores": len(self.proveedores),
+            "rutas": len(self._ruta_origen),
+            "rutas_trianguladas": int(trianguladas.sum()),
+            "hojas": len(self._hoja_rfc),
+            "pedimentos_triangulados": int(pedimentos[trianguladas].sum()),
+            "principales_rutas": [
+                {
+                    "pais_origen": self.paises[self._ruta_origen[r]],
+                    "pais_procedencia": self.paises[self._ruta_procedencia[r]],
+                    "pedimentos": int(pedimentos[r])
+                }
+                for r in principales
+            ]
+        }
+
+# Made with Bob
@@ -4,6 +4,7 @@ Ejecuta ejemplos de consultas a la API
 """
 import requests
 import json
+from datetime import date, datetime, timedelta
 from time import sleep
 
 BASE_URL = "http://localhost:8000"
@@ -194,6 +195,144 @@ def test_estadisticas():
         print(f"  Vencidas: {data['alertas_vencidas']}")
         print(f"  Casos detectados: {data['casos_totales_detectados']}")
 
+def test_cruce_retroactivo():
+    """Prueba el cruce retroactivo de una alerta contra el historial"""
+    print_section("8. CRUCE RETROACTIVO DE ALERTAS")
+    
+    id_alerta = "A-2024-0002"
+    response = requests.get(f"{BASE_URL}/api/alertas/{id_alerta}/pedimentos-afectados")
+    
+    if response.status_code == 200:
+        data = response.json()
+        print(f"Alerta: {data['id_alerta']} - {data['titulo']}")
+        print(f"Llaves: {data['llaves']}")
+        print(f"Pedimentos afectados: {data['total_pedimentos']}")
+        print(f"RFCs afectados: {data['total_rfcs']}")
+        print(f"Tiempo de cruce: {data['tiempo_ms']} ms")
+    else:
+        print(f"Error: {response.status_code}")
+
+def test_analisis_lote():
+    """Prueba el análisis por lotes en NDJSON"""
+    print_section("9. ANALISIS POR LOTES")
+    
+    operaciones = [
+        {"referencia": "OP-1", "rfc": "ABC700101ABC", "fraccion": "8471.30", "pais_origen": "China", "valor_unitario": 450, "cantidad": 100},
+        {"referencia": "OP-2", "rfc": "ABC700101ABC", "fraccion": "8517.12", "pais_origen": "China", "valor_unitario": 80, "cantidad": 500}
+    ]
+    cuerpo = "\n".join(json.dumps(op) for op in operaciones)
+    response = requests.post(
+        f"{BASE_URL}/api/analisis/lote",
+        data=cuerpo,
+        headers={"Content-Type": "application/x-ndjson"},
+        stream=True
+    )
+    
+    if response.status_code == 200:
+        for linea in response.iter_lines():
+            data = json.loads(linea)
+            if "resumen" in data:
+                resumen = data["resumen"]
+                print(f"Operaciones: {resumen['total_operaciones']} (correctas: {resumen['correctas']}, con error: {resumen['con_error']})")
+                print(f"Tiempo: {resumen['tiempo_procesamiento_ms']} ms con {resumen['procesos']} procesos")
+            elif data["estado"] == "ok":
+                print(f"  [{data['referencia']}] Riesgo: {data['resultado']['resumen_ejecutivo']['nivel_riesgo_global']}")
+            else:
+                print(f"  [{data['referencia']}] Error {data['codigo']}: {data['error']}")
+    else:
+        print(f"Error: {response.status_code}")
+
+def test_simulacion_umbrales():
+    """Prueba la simulación de umbrales alternos sobre el historial"""
+    print_section("10. SIMULACION DE UMBRALES")
+    
+    response = requests.post(
+        f"{BASE_URL}/api/simulacion/umbrales",
+        json={"umbrales": {"valor.subfacturacion_severa_pct": -30}}
+    )
+    
+    if response.status_code == 200:
+        data = response.json()
+        print(f"Pedimentos simulados: {data['total_pedimentos']} (con cambio de canal: {data['pedimentos_con_cambio']})")
+        for canal, conteo in data["distribucion_canal"].items():
+            print(f"  {canal}: {conteo['vigente']} -> {conteo['simulado']} ({conteo['cambio']:+d})")
+        print(f"Tiempo: {data['tiempo_ms']} ms")
+    else:
+        print(f"Error: {response.status_code}")
+
+def test_ingesta_pedimentos():
+    """Prueba la ingesta de una ráfaga de pedimentos y su detección como fraccionamiento"""
+    print_section("11. INGESTA DE PEDIMENTOS")
+    
+    response = requests.get(f"{BASE_URL}/api/importadores/riesgo", params={"perfil": "VERDE", "limite": 1})
+    if response.status_code != 200 or not response.json()["importadores"]:
+        print(f"Error: {response.status_code}")
+        return
+    rfc = response.json()["importadores"][0]["rfc"]
+    
+    # Tres pedimentos del mismo RFC, fracción y proveedor en días consecutivos
+    hoy = date.today()
+    sufijo = datetime.now().strftime("%H%M%S")
+    pedimentos = [
+        {
+            "num_pedimento": f"99-999-{sufijo}{i}",
+            "rfc_importador": rfc,
+            "fecha_pago": (hoy - timedelta(days=3 - i)).isoformat(),
+            "aduana_entrada": "470-AICM",
+            "fraccion_arancelaria": "8471.30.01",
+            "descripcion_mercancia": "Laptops",
+            "pais_origen": "China",
+            "pais_procedencia": "China",
+            "proveedor_extranjero": "PROV-PRUEBA",
+            "valor_declarado_usd": 950.0,
+            "cantidad": 2,
+            "unidad_medida": "PZA",
+            "peso_bruto_kg": 5.0,
+            "tipo_cambio_dia": 17.2,
+            "igi_pagado": 0.0,
+            "iva_pagado": 2614.4,
+            "canal_asignado": "VERDE",
+            "resultado_reconocimiento": "SIN_OBSERVACIONES",
+            "agente_aduanal": "AA0001"
+        }
+        for i in range(3)
+    ]
+    response = requests.post(
+        f"{BASE_URL}/api/pedimentos/ingesta",
+        data="\n".join(json.dumps(p) for p in pedimentos),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    
+    if response.status_code == 200:
+        data = response.json()
+        print(f"RFC: {rfc}")
+        print(f"Recibidos: {data['recibidos']} (agregados: {data['agregados']}, duplicados: {data['duplicados']})")
+        rafagas = [r for r in data["rafagas"] if r["rfc"] == rfc and r["proveedor"] == "PROV-PRUEBA"]
+        print(f"Ráfagas detectadas en la ingesta: {len(rafagas)}")
+        for rafaga in rafagas:
+            print(f"  {rafaga['fecha_inicio']} a {rafaga['fecha_fin']}: {rafaga['pedimentos']} pedimentos")
+    else:
+        print(f"Error: {response.status_code}")
+        return
+    
+    response = requests.get(f"{BASE_URL}/api/importador/{rfc}")
+    if response.status_code == 200:
+        data = response.json()
+        numeros = {p["num_pedimento"] for p in pedimentos}
+        propias = [r for r in data["fraccionamientos"] if numeros <= set(r["num_pedimentos"])]
+        print(f"\nFraccionamientos del importador: {len(data['fraccionamientos'])} (incluye la ráfaga ingerida: {bool(propias)})")
+    else:
+        print(f"Error: {response.status_code}")
+    
+    response = requests.get(f"{BASE_URL}/api/pedimentos/fraccionamiento", params={"limite": 3})
+    if response.status_code == 200:
+        data = response.json()
+        print(f"Ráfagas totales: {data['resumen']['total_rafagas']}")
+        for rafaga in data["rafagas"]:
+            print(f"  {rafaga['rfc']} {rafaga['fraccion']}: {rafaga['pedimentos']} pedimentos")
+    else:
+        print(f"Error: {response.status_code}")
+
 def main():
     """Ejecuta todas las pruebas"""
     print("\n" + "="*80)
@@ -229,6 +368,18 @@ def main():
         sleep(1)
         
         test_estadisticas()
+        sleep(1)
+        
+        test_cruce_retroactivo()
+        sleep(1)
+        
+        test_analisis_lote()
+        sleep(1)
+        
+        test_simulacion_umbrales()
+        sleep(1)
+        
+        test_ingesta_pedimentos()
         
         print("\n" + "="*80)
         print("  PRUEBAS COMPLETADAS")